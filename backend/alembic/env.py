@@ -13,9 +13,11 @@ from app.core.config import settings
 from app.db.session import Base
 # Alembic이 모델의 변경사항을 감지할 수 있도록 모든 모델을 명시적으로 임포트합니다.
 from app.models.user import User
-from app.models.run import Run
+from app.models.run import Run, RunPointChunk
 from app.models.album import Album
-from app.models.course import Course, CourseAttempt
+from app.models.media import MediaBlob
+from app.models.course import Course, CourseAttempt, CourseLeaderboardEntry
+from app.models.stats import UserStatsBucket
 from app.models.post import Post, Comment, Reaction, PostImage, Report
 
 
@@ -0,0 +1,28 @@
+"""add moving_time to runs
+
+Revision ID: 1b7f4e2a9c83
+Revises: 8e3d1c6b0f57
+Create Date: 2026-10-18 21:35:47.260183
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '1b7f4e2a9c83'
+down_revision: Union[str, Sequence[str], None] = '8e3d1c6b0f57'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column("runs", sa.Column("moving_time", sa.Float(), nullable=True))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column("runs", "moving_time")
@@ -0,0 +1,71 @@
+"""add route geometry columns
+
+Revision ID: 3f8d6b1c9a25
+Revises: e7b2c5a18f04
+Create Date: 2026-10-18 16:20:05.392871
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from geoalchemy2 import Geography, Geometry
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3f8d6b1c9a25'
+down_revision: Union[str, Sequence[str], None] = 'e7b2c5a18f04'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+TABLES = ("runs", "courses")
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # postgis 이미지에는 기본으로 설치되어 있지만, 다른 환경을 위해 확인합니다.
+    op.execute("CREATE EXTENSION IF NOT EXISTS postgis")
+
+    for table in TABLES:
+        op.add_column(table, sa.Column(
+            "path", Geography("LINESTRING", srid=4326, spatial_index=False), nullable=True,
+        ))
+        op.add_column(table, sa.Column(
+            "start_point", Geography("POINT", srid=4326, spatial_index=False), nullable=True,
+        ))
+        op.add_column(table, sa.Column(
+            "bbox", Geometry("POLYGON", srid=4326, spatial_index=False), nullable=True,
+        ))
+
+        # 저장된 polyline(정밀도 6)에서 선/시작점/경계 상자를 만듭니다. (점이 1개면 path는 NULL)
+        op.execute(
+            f"""
+            UPDATE {table} AS t
+            SET path = CASE WHEN ST_NPoints(g.line) >= 2 THEN g.line::geography END,
+                start_point = ST_StartPoint(g.line)::geography,
+                bbox = ST_MakeEnvelope(
+                    ST_XMin(g.line), ST_YMin(g.line), ST_XMax(g.line), ST_YMax(g.line), 4326
+                )
+            FROM (
+                SELECT id, ST_LineFromEncodedPolyline(convert_from(route_polyline, 'UTF8'), 6) AS line
+                FROM {table}
+                WHERE route_polyline IS NOT NULL AND length(route_polyline) > 0
+            ) AS g
+            WHERE t.id = g.id
+            """
+        )
+
+        op.create_index(f"ix_{table}_path", table, ["path"], postgresql_using="gist")
+        op.create_index(f"ix_{table}_start_point", table, ["start_point"], postgresql_using="gist")
+        op.create_index(f"ix_{table}_bbox", table, ["bbox"], postgresql_using="gist")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for table in TABLES:
+        op.drop_index(f"ix_{table}_bbox", table_name=table)
+        op.drop_index(f"ix_{table}_start_point", table_name=table)
+        op.drop_index(f"ix_{table}_path", table_name=table)
+        op.drop_column(table, "bbox")
+        op.drop_column(table, "start_point")
+        op.drop_column(table, "path")
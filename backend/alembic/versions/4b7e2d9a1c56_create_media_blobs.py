@@ -0,0 +1,52 @@
+"""create media_blobs (content-addressed album media)
+
+Revision ID: 4b7e2d9a1c56
+Revises: c8f1a2d4e6b9
+Create Date: 2026-10-19 00:12:05.214873
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '4b7e2d9a1c56'
+down_revision: Union[str, Sequence[str], None] = 'c8f1a2d4e6b9'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "media_blobs",
+        sa.Column("sha256", sa.String(length=64), nullable=False),
+        sa.Column("storage_key", sa.Text(), nullable=False),
+        sa.Column("content_type", sa.String(length=100), nullable=True),
+        sa.Column("size", sa.BigInteger(), nullable=False),
+        sa.Column("ref_count", sa.Integer(), server_default="0", nullable=False),
+        sa.Column("created_at", sa.DateTime(), server_default=sa.text("now()"), nullable=False),
+        sa.PrimaryKeyConstraint("sha256"),
+    )
+    op.create_index(
+        "ix_media_blobs_unreferenced", "media_blobs", ["created_at"],
+        unique=False, postgresql_where=sa.text("ref_count = 0"),
+    )
+
+    # 기존 앨범(albums/<user>/<name>_<random>.png)은 참조 수 관리 대상이 아니므로 NULL로 둡니다.
+    for column in ("original_blob", "composed_blob"):
+        op.add_column("albums", sa.Column(column, sa.String(length=64), nullable=True))
+        op.create_foreign_key(f"fk_albums_{column}", "albums", "media_blobs", [column], ["sha256"])
+        op.create_index(f"ix_albums_{column}", "albums", [column], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for column in ("composed_blob", "original_blob"):
+        op.drop_index(f"ix_albums_{column}", table_name="albums")
+        op.drop_constraint(f"fk_albums_{column}", "albums", type_="foreignkey")
+        op.drop_column("albums", column)
+    op.drop_index("ix_media_blobs_unreferenced", table_name="media_blobs", postgresql_where=sa.text("ref_count = 0"))
+    op.drop_table("media_blobs")
@@ -0,0 +1,33 @@
+"""add runs user_id created_at index
+
+Revision ID: 5c1e9b7d2a40
+Revises: 8a27eec21f3b
+Create Date: 2026-10-18 14:05:32.118204
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5c1e9b7d2a40'
+down_revision: Union[str, Sequence[str], None] = '8a27eec21f3b'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # 사용자별 러닝 목록의 keyset 페이지네이션(created_at DESC, id DESC)용 인덱스
+    op.create_index(
+        "ix_runs_user_id_created_at",
+        "runs",
+        ["user_id", sa.text("created_at DESC"), sa.text("id DESC")],
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_runs_user_id_created_at", table_name="runs")
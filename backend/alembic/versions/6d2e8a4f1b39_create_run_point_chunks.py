@@ -0,0 +1,39 @@
+"""create run_point_chunks
+
+Revision ID: 6d2e8a4f1b39
+Revises: 1b7f4e2a9c83
+Create Date: 2026-10-18 22:12:05.418276
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '6d2e8a4f1b39'
+down_revision: Union[str, Sequence[str], None] = '1b7f4e2a9c83'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "run_point_chunks",
+        sa.Column("run_id", sa.UUID(), nullable=False),
+        sa.Column("seq", sa.Integer(), nullable=False),
+        sa.Column("point_count", sa.Integer(), nullable=False),
+        sa.Column("points", sa.LargeBinary(), nullable=False),
+        sa.Column("created_at", sa.DateTime(), server_default=sa.text("now()"), nullable=False),
+        sa.ForeignKeyConstraint(["run_id"], ["runs.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("run_id", "seq"),
+    )
+    # 샘플 묶음은 이미 압축할 여지가 적은 float 배열이고 한 번만 읽으므로 TOAST 압축을 끕니다.
+    op.execute("ALTER TABLE run_point_chunks ALTER COLUMN points SET STORAGE EXTERNAL")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table("run_point_chunks")
@@ -0,0 +1,40 @@
+"""add status to course_attempts
+
+Revision ID: 8a27eec21f3b
+Revises: 892b299b5547
+Create Date: 2026-10-18 12:40:11.204518
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8a27eec21f3b'
+down_revision: Union[str, Sequence[str], None] = '892b299b5547'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # 기존 기록은 모두 동기 방식으로 채점이 끝난 상태입니다.
+    op.add_column(
+        "course_attempts",
+        sa.Column("status", sa.String(), server_default="scored", nullable=False),
+    )
+    # 대기 중인 작업을 다시 큐에 넣을 때 사용하는 부분 인덱스
+    op.create_index(
+        "ix_course_attempts_pending",
+        "course_attempts",
+        ["attempted_at"],
+        postgresql_where=sa.text("status = 'pending'"),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_course_attempts_pending", table_name="course_attempts")
+    op.drop_column("course_attempts", "status")
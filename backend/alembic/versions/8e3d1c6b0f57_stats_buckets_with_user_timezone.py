@@ -0,0 +1,90 @@
+"""stats buckets with user timezone
+
+Revision ID: 8e3d1c6b0f57
+Revises: f4a91d3b7e20
+Create Date: 2026-10-18 20:41:12.118734
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8e3d1c6b0f57'
+down_revision: Union[str, Sequence[str], None] = 'f4a91d3b7e20'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column(
+        "users", sa.Column("timezone", sa.String(), server_default="Asia/Seoul", nullable=False)
+    )
+
+    op.create_table(
+        "user_stats_buckets",
+        sa.Column("user_id", sa.UUID(), nullable=False),
+        sa.Column("bucket_start", sa.DateTime(), nullable=False),
+        sa.Column("run_count", sa.Integer(), nullable=False),
+        sa.Column("total_distance", sa.Float(), nullable=False),
+        sa.Column("total_duration", sa.Float(), nullable=False),
+        sa.Column("total_elevation_gain", sa.Float(), nullable=False),
+        sa.Column("total_calories", sa.Float(), nullable=False),
+        sa.ForeignKeyConstraint(["user_id"], ["users.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("user_id", "bucket_start"),
+    )
+
+    # UTC 날짜 단위 집계로는 현지 날짜를 복원할 수 없으므로 runs에서 15분 구간으로 다시 채웁니다.
+    op.execute(
+        """
+        INSERT INTO user_stats_buckets
+            (user_id, bucket_start, run_count, total_distance, total_duration, total_elevation_gain, total_calories)
+        SELECT user_id,
+               date_bin('15 minutes', created_at, TIMESTAMP '2000-01-01'),
+               COUNT(*),
+               COALESCE(SUM(distance), 0),
+               COALESCE(SUM(duration), 0),
+               COALESCE(SUM(total_elevation_gain), 0),
+               COALESCE(SUM(calories_burned), 0)
+        FROM runs
+        WHERE status = 'finished' AND created_at IS NOT NULL
+        GROUP BY 1, 2
+        """
+    )
+    op.drop_table("user_daily_stats")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.create_table(
+        "user_daily_stats",
+        sa.Column("user_id", sa.UUID(), nullable=False),
+        sa.Column("day", sa.Date(), nullable=False),
+        sa.Column("run_count", sa.Integer(), nullable=False),
+        sa.Column("total_distance", sa.Float(), nullable=False),
+        sa.Column("total_duration", sa.Float(), nullable=False),
+        sa.Column("total_elevation_gain", sa.Float(), nullable=False),
+        sa.Column("total_calories", sa.Float(), nullable=False),
+        sa.ForeignKeyConstraint(["user_id"], ["users.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("user_id", "day"),
+    )
+    op.execute(
+        """
+        INSERT INTO user_daily_stats
+            (user_id, day, run_count, total_distance, total_duration, total_elevation_gain, total_calories)
+        SELECT user_id,
+               CAST(bucket_start AS date),
+               SUM(run_count),
+               SUM(total_distance),
+               SUM(total_duration),
+               SUM(total_elevation_gain),
+               SUM(total_calories)
+        FROM user_stats_buckets
+        GROUP BY 1, 2
+        """
+    )
+    op.drop_table("user_stats_buckets")
+    op.drop_column("users", "timezone")
@@ -0,0 +1,34 @@
+"""add image derivative columns to media_blobs
+
+Revision ID: 9d3f6b1e8a27
+Revises: 4b7e2d9a1c56
+Create Date: 2026-10-19 03:41:27.508116
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9d3f6b1e8a27'
+down_revision: Union[str, Sequence[str], None] = '4b7e2d9a1c56'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # 기존 객체는 파생본 없이(NULL) 두고 원본 URL을 그대로 씁니다. (같은 이미지를 다시 올리면 채워짐)
+    op.add_column("media_blobs", sa.Column("width", sa.Integer(), nullable=True))
+    op.add_column("media_blobs", sa.Column("height", sa.Integer(), nullable=True))
+    op.add_column("media_blobs", sa.Column("placeholder", sa.Text(), nullable=True))
+    op.add_column("media_blobs", sa.Column("variants", postgresql.JSONB(astext_type=sa.Text()), nullable=True))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for column in ("variants", "placeholder", "height", "width"):
+        op.drop_column("media_blobs", column)
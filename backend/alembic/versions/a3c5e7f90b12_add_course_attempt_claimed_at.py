@@ -0,0 +1,30 @@
+"""add claimed_at to course_attempts (atomic job claim)
+
+Revision ID: a3c5e7f90b12
+Revises: 9d3f6b1e8a27
+Create Date: 2026-10-19 09:12:44.301562
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a3c5e7f90b12'
+down_revision: Union[str, Sequence[str], None] = '9d3f6b1e8a27'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column("course_attempts", sa.Column("claimed_at", sa.DateTime(), nullable=True))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    # 채점 중이던 기록은 다시 대기 상태로 돌려 예전 워커가 처리하게 합니다.
+    op.execute("UPDATE course_attempts SET status = 'pending' WHERE status = 'scoring'")
+    op.drop_column("course_attempts", "claimed_at")
@@ -0,0 +1,29 @@
+"""add raw_route_polyline to courses
+
+Revision ID: a3f0c7d95e21
+Revises: 6d2e8a4f1b39
+Create Date: 2026-10-18 23:04:39.581027
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a3f0c7d95e21'
+down_revision: Union[str, Sequence[str], None] = '6d2e8a4f1b39'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # 기존 코스는 단순화하지 않은 경로 그대로이므로 원본 컬럼은 비워 둡니다. (route_polyline이 곧 원본)
+    op.add_column("courses", sa.Column("raw_route_polyline", sa.LargeBinary(), nullable=True))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column("courses", "raw_route_polyline")
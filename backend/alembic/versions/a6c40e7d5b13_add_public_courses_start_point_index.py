@@ -0,0 +1,35 @@
+"""add public courses start_point index
+
+Revision ID: a6c40e7d5b13
+Revises: 3f8d6b1c9a25
+Create Date: 2026-10-18 16:58:44.107326
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a6c40e7d5b13'
+down_revision: Union[str, Sequence[str], None] = '3f8d6b1c9a25'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # 주변 코스 탐색용: 공개 코스의 시작점만 담는 부분 GiST 인덱스
+    op.create_index(
+        "ix_courses_public_start_point",
+        "courses",
+        ["start_point"],
+        postgresql_using="gist",
+        postgresql_where=sa.text("status = 'published' AND visibility = 'public'"),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_courses_public_start_point", table_name="courses")
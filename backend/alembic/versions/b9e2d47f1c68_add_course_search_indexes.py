@@ -0,0 +1,68 @@
+"""add course search indexes
+
+Revision ID: b9e2d47f1c68
+Revises: a6c40e7d5b13
+Create Date: 2026-10-18 17:41:13.662095
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b9e2d47f1c68'
+down_revision: Union[str, Sequence[str], None] = 'a6c40e7d5b13'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+PUBLIC_COURSES = sa.text("status = 'published' AND visibility = 'public'")
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    # 공백/문장부호로 나눈 단어마다 연속된 2글자 조각을 만듭니다.
+    # 예: '한강공원 러닝' -> {한강, 강공, 공원, 러닝}
+    # 한글은 2음절 검색어가 흔한데, 트라이그램으로는 단어 중간의 2글자를 색인으로 찾을 수 없어 별도로 둡니다.
+    op.execute(
+        """
+        CREATE OR REPLACE FUNCTION r3_bigrams(input text) RETURNS text[]
+        LANGUAGE sql IMMUTABLE PARALLEL SAFE AS $$
+            SELECT coalesce(array_agg(DISTINCT substr(word, i, 2)), '{}')
+            FROM regexp_split_to_table(lower(coalesce(input, '')), '[[:space:][:punct:]]+') AS word,
+                 generate_series(1, char_length(word) - 1) AS i
+        $$
+        """
+    )
+
+    op.add_column("courses", sa.Column(
+        "search_text", sa.Text(),
+        sa.Computed("lower(name || ' ' || coalesce(description, ''))", persisted=True),
+    ))
+    op.add_column("courses", sa.Column(
+        "search_bigrams", postgresql.ARRAY(sa.Text()),
+        sa.Computed("r3_bigrams(name || ' ' || coalesce(description, ''))", persisted=True),
+    ))
+    op.create_index(
+        "ix_courses_public_search_text", "courses", ["search_text"],
+        postgresql_using="gin",
+        postgresql_ops={"search_text": "gin_trgm_ops"},
+        postgresql_where=PUBLIC_COURSES,
+    )
+    op.create_index(
+        "ix_courses_public_search_bigrams", "courses", ["search_bigrams"],
+        postgresql_using="gin",
+        postgresql_where=PUBLIC_COURSES,
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_courses_public_search_bigrams", table_name="courses")
+    op.drop_index("ix_courses_public_search_text", table_name="courses")
+    op.drop_column("courses", "search_bigrams")
+    op.drop_column("courses", "search_text")
+    op.execute("DROP FUNCTION IF EXISTS r3_bigrams(text)")
@@ -0,0 +1,61 @@
+"""create course_leaderboard
+
+Revision ID: c2f58a0e6d97
+Revises: b9e2d47f1c68
+Create Date: 2026-10-18 18:36:52.480193
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c2f58a0e6d97'
+down_revision: Union[str, Sequence[str], None] = 'b9e2d47f1c68'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "course_leaderboard",
+        sa.Column("course_id", sa.UUID(), nullable=False),
+        sa.Column("user_id", sa.UUID(), nullable=False),
+        sa.Column("attempt_id", sa.UUID(), nullable=False),
+        sa.Column("run_id", sa.UUID(), nullable=False),
+        sa.Column("best_duration", sa.Float(), nullable=False),
+        sa.Column("similarity_score", sa.Float(), nullable=True),
+        sa.Column("achieved_at", sa.DateTime(), nullable=False),
+        sa.ForeignKeyConstraint(["course_id"], ["courses.id"], ondelete="CASCADE"),
+        sa.ForeignKeyConstraint(["user_id"], ["users.id"], ondelete="CASCADE"),
+        sa.ForeignKeyConstraint(["attempt_id"], ["course_attempts.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("course_id", "user_id"),
+    )
+    op.create_index(
+        "ix_course_leaderboard_rank",
+        "course_leaderboard",
+        ["course_id", "best_duration", "achieved_at", "user_id"],
+    )
+
+    # 기존 성공 기록 중 코스/사용자별 가장 빠른 기록으로 채웁니다.
+    op.execute(
+        """
+        INSERT INTO course_leaderboard
+            (course_id, user_id, attempt_id, run_id, best_duration, similarity_score, achieved_at)
+        SELECT DISTINCT ON (a.course_id, a.user_id)
+               a.course_id, a.user_id, a.id, a.run_id, r.duration, a.similarity_score, a.attempted_at
+        FROM course_attempts AS a
+        JOIN runs AS r ON r.id = a.run_id
+        WHERE a.is_successful
+        ORDER BY a.course_id, a.user_id, r.duration, a.attempted_at
+        """
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_course_leaderboard_rank", table_name="course_leaderboard")
+    op.drop_table("course_leaderboard")
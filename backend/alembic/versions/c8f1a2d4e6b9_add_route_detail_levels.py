@@ -0,0 +1,71 @@
+"""add route detail levels (route_thumb / route_map)
+
+Revision ID: c8f1a2d4e6b9
+Revises: a3f0c7d95e21
+Create Date: 2026-10-18 23:41:12.307415
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+from app.core import polyline
+from app.core.simplify import simplify_levels
+from app.models.route import ROUTE_MAP_POINTS, ROUTE_THUMB_POINTS
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c8f1a2d4e6b9'
+down_revision: Union[str, Sequence[str], None] = 'a3f0c7d95e21'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+TABLES = ("runs", "courses")
+BATCH_SIZE = 500
+
+
+def _backfill(table: str) -> None:
+    """
+    id 순서로 BATCH_SIZE개씩 읽어 기존 경로의 단계별 polyline을 채웁니다. (app.core.route_levels.build_route_levels와 같은 규칙)
+    """
+    bind = op.get_bind()
+    select_batch = sa.text(
+        f"SELECT id, route_polyline FROM {table} "
+        f"WHERE route_polyline IS NOT NULL AND (CAST(:last_id AS uuid) IS NULL OR id > CAST(:last_id AS uuid)) "
+        f"ORDER BY id LIMIT :limit"
+    )
+    update = sa.text(f"UPDATE {table} SET route_thumb = :thumb, route_map = :map WHERE id = :id").bindparams(
+        sa.bindparam("thumb", type_=sa.LargeBinary()),
+        sa.bindparam("map", type_=sa.LargeBinary()),
+    )
+    last_id = None
+    while True:
+        rows = bind.execute(select_batch, {"last_id": last_id, "limit": BATCH_SIZE}).all()
+        if not rows:
+            break
+        values = []
+        for row_id, encoded in rows:
+            latlng = polyline.decode(bytes(encoded))
+            if len(latlng) == 0:
+                continue
+            thumb, map_level = simplify_levels(latlng, (ROUTE_THUMB_POINTS, ROUTE_MAP_POINTS))
+            values.append({"id": row_id, "thumb": polyline.encode(thumb), "map": polyline.encode(map_level)})
+        if values:
+            bind.execute(update, values)
+        last_id = str(rows[-1][0])
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    for table in TABLES:
+        op.add_column(table, sa.Column("route_thumb", sa.LargeBinary(), nullable=True))
+        op.add_column(table, sa.Column("route_map", sa.LargeBinary(), nullable=True))
+        _backfill(table)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for table in TABLES:
+        op.drop_column(table, "route_map")
+        op.drop_column(table, "route_thumb")
@@ -0,0 +1,52 @@
+"""add run totals to users
+
+Revision ID: d41f7a9c3e62
+Revises: 5c1e9b7d2a40
+Create Date: 2026-10-18 14:48:09.530712
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd41f7a9c3e62'
+down_revision: Union[str, Sequence[str], None] = '5c1e9b7d2a40'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column("users", sa.Column("total_runs", sa.Integer(), server_default="0", nullable=False))
+    op.add_column("users", sa.Column("total_distance", sa.Float(), server_default="0", nullable=False))
+    op.add_column("users", sa.Column("last_run_at", sa.DateTime(), nullable=True))
+
+    # 기존 완료 기록으로 집계를 채웁니다.
+    op.execute(
+        """
+        UPDATE users AS u
+        SET total_runs = agg.total_runs,
+            total_distance = agg.total_distance,
+            last_run_at = agg.last_run_at
+        FROM (
+            SELECT user_id,
+                   COUNT(*) AS total_runs,
+                   COALESCE(SUM(distance), 0) AS total_distance,
+                   MAX(created_at) AS last_run_at
+            FROM runs
+            WHERE status = 'finished'
+            GROUP BY user_id
+        ) AS agg
+        WHERE u.id = agg.user_id
+        """
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column("users", "last_run_at")
+    op.drop_column("users", "total_distance")
+    op.drop_column("users", "total_runs")
@@ -0,0 +1,78 @@
+"""store routes as encoded polyline
+
+Revision ID: e7b2c5a18f04
+Revises: d41f7a9c3e62
+Create Date: 2026-10-18 15:32:47.861350
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+from app.core import polyline
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e7b2c5a18f04'
+down_revision: Union[str, Sequence[str], None] = 'd41f7a9c3e62'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+TABLES = ("runs", "courses")
+BATCH_SIZE = 500
+
+
+def _valid_points(route):
+    # 좌표가 빠졌거나 숫자가 아닌 점은 건너뜁니다.
+    return [
+        p for p in route or []
+        if isinstance(p, dict)
+        and isinstance(p.get("lat"), (int, float))
+        and isinstance(p.get("lng"), (int, float))
+    ]
+
+
+def _convert(table: str, source: str, target: str, transform) -> None:
+    """
+    id 순서로 BATCH_SIZE개씩 읽어 source 컬럼을 변환해 target 컬럼에 씁니다.
+    """
+    bind = op.get_bind()
+    select_batch = sa.text(
+        f"SELECT id, {source} FROM {table} "
+        f"WHERE {source} IS NOT NULL AND (CAST(:last_id AS uuid) IS NULL OR id > CAST(:last_id AS uuid)) "
+        f"ORDER BY id LIMIT :limit"
+    )
+    last_id = None
+    while True:
+        rows = bind.execute(select_batch, {"last_id": last_id, "limit": BATCH_SIZE}).all()
+        if not rows:
+            break
+        values = [{"id": row[0], "value": transform(row[1])} for row in rows]
+        bind.execute(
+            sa.text(f"UPDATE {table} SET {target} = :value WHERE id = :id").bindparams(
+                sa.bindparam("value", type_=sa.LargeBinary() if target == "route_polyline" else postgresql.JSONB())
+            ),
+            values,
+        )
+        last_id = str(rows[-1][0])
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    for table in TABLES:
+        op.add_column(table, sa.Column("route_polyline", sa.LargeBinary(), nullable=True))
+        _convert(
+            table, "route", "route_polyline",
+            lambda route: polyline.encode_points(_valid_points(route)),
+        )
+        op.drop_column(table, "route")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for table in TABLES:
+        op.add_column(table, sa.Column("route", postgresql.JSONB(astext_type=sa.Text()), nullable=True))
+        _convert(table, "route_polyline", "route", polyline.decode_points)
+        op.drop_column(table, "route_polyline")
@@ -0,0 +1,57 @@
+"""create user_daily_stats
+
+Revision ID: f4a91d3b7e20
+Revises: c2f58a0e6d97
+Create Date: 2026-10-18 19:22:31.904416
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f4a91d3b7e20'
+down_revision: Union[str, Sequence[str], None] = 'c2f58a0e6d97'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "user_daily_stats",
+        sa.Column("user_id", sa.UUID(), nullable=False),
+        sa.Column("day", sa.Date(), nullable=False),
+        sa.Column("run_count", sa.Integer(), nullable=False),
+        sa.Column("total_distance", sa.Float(), nullable=False),
+        sa.Column("total_duration", sa.Float(), nullable=False),
+        sa.Column("total_elevation_gain", sa.Float(), nullable=False),
+        sa.Column("total_calories", sa.Float(), nullable=False),
+        sa.ForeignKeyConstraint(["user_id"], ["users.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("user_id", "day"),
+    )
+
+    # 기존 완료 기록으로 일별 집계를 채웁니다. (이후 재구축: python -m app.rebuild_stats)
+    op.execute(
+        """
+        INSERT INTO user_daily_stats
+            (user_id, day, run_count, total_distance, total_duration, total_elevation_gain, total_calories)
+        SELECT user_id,
+               CAST(created_at AS date),
+               COUNT(*),
+               COALESCE(SUM(distance), 0),
+               COALESCE(SUM(duration), 0),
+               COALESCE(SUM(total_elevation_gain), 0),
+               COALESCE(SUM(calories_burned), 0)
+        FROM runs
+        WHERE status = 'finished' AND created_at IS NOT NULL
+        GROUP BY user_id, CAST(created_at AS date)
+        """
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table("user_daily_stats")
@@ -1,50 +1,68 @@
 # backend/app/api/v1/albums.py
-from fastapi import APIRouter, Depends, UploadFile, File, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Request, status
 from typing import List
 from uuid import UUID
-from pathlib import Path
-import os
 
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.api.v1.deps import get_db, get_current_user
-from app.core.config import settings
+from app.core.media import UploadFormError, UploadTooLargeError
+from app.core.storage import get_media_storage
+from app.crud import media as crud_media
 from app.schemas.album import AlbumCreate, AlbumUpdate, AlbumOut
 from app.crud.album import album as crud_album
 from app.models.user import User
 
 router = APIRouter(prefix="/albums", tags=["albums"])
 
-def ensure_media_dir() -> Path:
-    root = Path(settings.MEDIA_ROOT).resolve()
-    (root / "albums").mkdir(parents=True, exist_ok=True)
-    return root
+# 본문은 엔드포인트가 직접 스트리밍으로 읽으므로 문서용 스키마만 둡니다. (File() 파라미터를 쓰면 Starlette가 먼저 전체를 스풀함)
+UPLOAD_REQUEST_BODY = {
+    "required": True,
+    "content": {
+        "multipart/form-data": {
+            "schema": {
+                "type": "object",
+                "required": ["file"],
+                "properties": {"file": {"type": "string", "format": "binary"}},
+            }
+        }
+    },
+}
 
-def build_media_url(rel_path: str) -> str:
-    return f"{settings.MEDIA_URL.rstrip('/')}/{rel_path.lstrip('/')}"
-
-@router.post("/upload", summary="(local) 합성 이미지 파일 업로드", response_model=dict)
+@router.post(
+    "/upload",
+    summary="합성 이미지 파일 업로드 (콘텐츠 주소 저장소)",
+    response_model=dict,
+    openapi_extra={"requestBody": UPLOAD_REQUEST_BODY},
+)
 async def upload_composed_image(
-    file: UploadFile = File(...),
+    request: Request,
+    db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_user),
 ):
-    if settings.STORAGE_BACKEND != "local":
-        raise HTTPException(status_code=501, detail="Use S3 upload on this deployment.")
-
-    media_root = ensure_media_dir()
-    user_dir = media_root / "albums" / str(current_user.id)
-    user_dir.mkdir(parents=True, exist_ok=True)
-
-    fname = f"{os.path.splitext(file.filename or 'image')[0]}_{os.urandom(4).hex()}.png"
-    fpath = user_dir / fname
-
-    data = await file.read()
-    with open(fpath, "wb") as f:
-        f.write(data)
+    """
+    이미지를 저장하고 URL을 반환합니다. 이 URL을 앨범 생성(composed_url/original_url)에 그대로 씁니다.
+    - URL은 내용의 SHA-256으로 정해지므로, 같은 이미지를 다시 올려도(재시도/재공유) 한 번만 저장됩니다.
+    - 하루(crud.media.UNREFERENCED_GRACE)가 지나도록 어떤 앨범도 참조하지 않은 업로드는 주기 작업이 지웁니다. (app.worker.run_media_gc)
+    - 크기 상한(MAX_UPLOAD_BYTES)은 Content-Length로 먼저 확인하고, 받는 동안에도 넘으면 바로 413입니다.
+    """
+    try:
+        blob, created = await crud_media.store_upload(db, request)
+    except UploadTooLargeError as e:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=f"File too large (max {e.max_bytes} bytes)",
+        )
+    except UploadFormError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
 
-    rel = f"albums/{current_user.id}/{fname}"
-    url = build_media_url(rel)
-    return {"url": url, "relative_path": rel}
+    return {
+        "url": get_media_storage().url(blob.storage_key),
+        "relative_path": blob.storage_key,
+        "size": blob.size,
+        "sha256": blob.sha256,
+        "deduplicated": not created,
+    }
 
 @router.post("/", response_model=AlbumOut, status_code=status.HTTP_201_CREATED)
 async def create_album(
@@ -52,7 +70,10 @@ async def create_album(
     db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_user),
 ):
-    created = await crud_album.create_with_owner(db, obj_in=payload, user_id=current_user.id)
+    try:
+        created = await crud_album.create_with_owner(db, obj_in=payload, user_id=current_user.id)
+    except crud_media.UnknownMediaError:
+        raise HTTPException(status_code=400, detail="Uploaded media not found. Please upload again.")
     return created
 
 @router.get("/", response_model=List[AlbumOut])
@@ -1,23 +1,35 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 import uuid
 
 from app import crud, models, schemas
 from app.api.v1 import deps
-from app.core.similarity import calculate_similarity_score
+from app.core.config import settings
+from app.core.jobs import get_job_queue
+from app.core.scoring import score_attempt
+from app.worker import COURSE_ATTEMPT_QUEUE
 
 router = APIRouter()
 
-@router.post("/courses/{course_id}/runs/{run_id}", response_model=schemas.CourseAttempt)
+@router.post(
+    "/courses/{course_id}/runs/{run_id}",
+    response_model=schemas.CourseAttempt,
+    responses={status.HTTP_202_ACCEPTED: {"model": schemas.CourseAttemptJob}},
+)
 async def create_course_attempt(
     *,
     db: AsyncSession = Depends(deps.get_db),
     course_id: uuid.UUID,
     run_id: uuid.UUID,
+    async_mode: bool = Query(False, alias="async", description="true면 채점을 기다리지 않고 202와 job_id를 반환"),
     current_user: models.User = Depends(deps.get_current_user)
 ):
     """
     자신의 러닝 기록(Run)을 특정 코스(Course)에 대한 도전 결과로 제출합니다.
+    - 기본: 채점이 끝날 때까지 기다렸다가 도전 기록을 반환합니다.
+    - ?async=true: pending 상태로 저장하고 202를 반환합니다. 결과는 GET /course-attempts/{job_id}로 확인합니다.
     """
     course = await crud.course.get_course_by_id_for_attempt(db=db, id=course_id)
     if not course:
@@ -30,10 +42,39 @@ async def create_course_attempt(
     existing_attempt = await crud.course_attempt.get_attempt_by_run_id(db=db, run_id=run.id)
     if existing_attempt:
         raise HTTPException(status_code=400, detail="This run has already been submitted.")
-        
-    score = calculate_similarity_score(original_route=course.route, user_route=run.route)
+
+    if async_mode:
+        attempt = await crud.course_attempt.create_pending_attempt(
+            db=db, run_id=run.id, course_id=course.id, user_id=current_user.id
+        )
+        await get_job_queue(COURSE_ATTEMPT_QUEUE).enqueue(str(attempt.id))
+        status_url = f"{settings.API_V1_STR}/course-attempts/{attempt.id}"
+        job = schemas.CourseAttemptJob(job_id=attempt.id, status=attempt.status, status_url=status_url)
+        return JSONResponse(
+            status_code=status.HTTP_202_ACCEPTED,
+            content=jsonable_encoder(job),
+            headers={"Location": status_url},
+        )
+
+    # 유사도 계산은 CPU 작업이므로 이벤트 루프를 막지 않도록 별도 풀에서 실행합니다.
+    score = await score_attempt(course, run)
 
     attempt = await crud.course_attempt.create_course_attempt(
         db=db, run_id=run.id, course_id=course.id, user_id=current_user.id, score=score
     )
-    return attempt
\ No newline at end of file
+    return attempt
+
+@router.get("/course-attempts/{attempt_id}", response_model=schemas.CourseAttempt)
+async def read_course_attempt(
+    attempt_id: uuid.UUID,
+    db: AsyncSession = Depends(deps.get_db),
+    current_user: models.User = Depends(deps.get_current_user),
+):
+    """
+    도전 기록(비동기 제출의 job_id)의 채점 상태와 결과를 조회합니다.
+    - status: pending(채점 대기) / scoring(채점 중) / scored(완료) / failed(실패)
+    """
+    attempt = await crud.course_attempt.get_attempt(db=db, id=attempt_id, user_id=current_user.id)
+    if not attempt:
+        raise HTTPException(status_code=404, detail="Course attempt not found")
+    return attempt
@@ -1,10 +1,25 @@
-from typing import List
-from fastapi import APIRouter, Depends, HTTPException
+from typing import List, Optional
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Response
 from sqlalchemy.ext.asyncio import AsyncSession
 import uuid
 
 from app import crud, models, schemas
 from app.api.v1 import deps
+from app.schemas.route import ListRouteDetail, RouteDetail, RouteFormat, RouteFormatView
+from app.core.thumbnails import ThumbnailFormat, remove_route_thumbnails, route_thumbnail_response
+from app.core.pagination import (
+    DEFAULT_PAGE_SIZE,
+    MAX_PAGE_SIZE,
+    NEXT_CURSOR_HEADER,
+    InvalidCursorError,
+    decode_cursor,
+    encode_cursor,
+)
+
+ROUTE_FORMAT_QUERY = Query("json", description="polyline이면 route 대신 route_polyline 문자열을 반환")
+ROUTE_DETAIL_QUERY = Query("full", description="경로 단계: thumb(약 32점) / map(약 256점) / full(전체)")
+LIST_ROUTE_DETAIL_QUERY = Query(None, description="thumb(약 32점)/map(약 256점)이면 해당 단계의 경로를 포함")
+MAX_NEARBY_RADIUS_M = 50_000
 
 router = APIRouter()
 
@@ -23,36 +38,96 @@ async def create_course(
     if not run:
         raise HTTPException(status_code=404, detail="Run not found")
 
+    # 긴 경로는 목록/지도용 단계를 만드는 동안 route_executor를 씁니다. (풀이 가득 차면 429, 시간 초과면 503)
     course = await crud.course.create_course_from_run(
         db=db, course_in=course_in, run=run, user_id=current_user.id
     )
     return course
 
-@router.get("/search/", response_model=List[schemas.Course])
+@router.get("/search/", response_model=List[schemas.CourseSummary])
 async def search_for_courses(
-    query: str,
+    response: Response,
+    query: str = Query(..., min_length=2, max_length=100),
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = Query(None, description="이전 응답의 X-Next-Cursor 헤더 값"),
+    detail: Optional[ListRouteDetail] = LIST_ROUTE_DETAIL_QUERY,
+    route_format: RouteFormat = ROUTE_FORMAT_QUERY,
     db: AsyncSession = Depends(deps.get_db),
 ):
     """
-    쿼리로 코스를 검색합니다.
+    공개 코스를 이름/설명으로 검색해 관련도 순으로 반환합니다. (경로는 detail=thumb|map일 때만, 상세는 GET /courses/{course_id})
+    - 다음 페이지가 있으면 X-Next-Cursor 헤더가 포함되며, 그 값을 cursor로 넘기면 이어서 조회합니다.
     """
-    courses = await crud.course.search_courses(db=db, query=query)
-    return courses
+    after = None
+    if cursor:
+        try:
+            score, course_id = decode_cursor(cursor, parts=2)
+            after = (float(score), uuid.UUID(course_id))
+        except (InvalidCursorError, ValueError):
+            raise HTTPException(status_code=400, detail="Invalid cursor")
+
+    rows = await crud.course.search_courses(db=db, query=query, limit=limit + 1, after=after, route_detail=detail)
+    if len(rows) > limit:
+        rows = rows[:limit]
+        last = rows[-1]
+        response.headers[NEXT_CURSOR_HEADER] = encode_cursor(repr(last.score), last.id)
+    if detail is not None:
+        return [RouteFormatView(row, route_format, detail) for row in rows]
+    return rows
+
+@router.get("/nearby", response_model=List[schemas.CourseSummary])
+async def read_nearby_courses(
+    response: Response,
+    lat: float = Query(..., ge=-90, le=90),
+    lng: float = Query(..., ge=-180, le=180),
+    radius_m: float = Query(5_000, gt=0, le=MAX_NEARBY_RADIUS_M),
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = Query(None, description="이전 응답의 X-Next-Cursor 헤더 값"),
+    detail: Optional[ListRouteDetail] = LIST_ROUTE_DETAIL_QUERY,
+    route_format: RouteFormat = ROUTE_FORMAT_QUERY,
+    db: AsyncSession = Depends(deps.get_db),
+):
+    """
+    현재 위치(lat, lng)에서 radius_m 안에서 시작하는 공개 코스를 가까운 순으로 반환합니다. (경로는 detail=thumb|map일 때만)
+    - 다음 페이지가 있으면 X-Next-Cursor 헤더가 포함되며, 그 값을 cursor로 넘기면 이어서 조회합니다.
+    """
+    after = None
+    if cursor:
+        try:
+            distance_m, course_id = decode_cursor(cursor, parts=2)
+            after = (float(distance_m), uuid.UUID(course_id))
+        except (InvalidCursorError, ValueError):
+            raise HTTPException(status_code=400, detail="Invalid cursor")
+
+    rows = await crud.course.get_nearby_courses(
+        db=db, lat=lat, lng=lng, radius_m=radius_m, limit=limit + 1, after=after, route_detail=detail
+    )
+    if len(rows) > limit:
+        rows = rows[:limit]
+        last = rows[-1]
+        response.headers[NEXT_CURSOR_HEADER] = encode_cursor(repr(last.distance_m), last.id)
+    if detail is not None:
+        return [RouteFormatView(row, route_format, detail) for row in rows]
+    return rows
 
 @router.get("/", response_model=List[schemas.Course])
 async def read_courses(
+    route_format: RouteFormat = ROUTE_FORMAT_QUERY,
+    detail: RouteDetail = ROUTE_DETAIL_QUERY,
     db: AsyncSession = Depends(deps.get_db),
     current_user: models.User = Depends(deps.get_current_user),
 ):
     """
-    현재 로그인된 사용자가 생성한 모든 코스 목록을 반환합니다.
+    현재 로그인된 사용자가 생성한 모든 코스 목록을 반환합니다. (목록 화면은 detail=thumb 권장)
     """
     courses = await crud.course.get_courses_by_user(db=db, user_id=current_user.id)
-    return courses
+    return [RouteFormatView(course, route_format, detail) for course in courses]
 
 @router.get("/{course_id}", response_model=schemas.Course)
 async def read_course(
     course_id: uuid.UUID,
+    route_format: RouteFormat = ROUTE_FORMAT_QUERY,
+    detail: RouteDetail = ROUTE_DETAIL_QUERY,
     db: AsyncSession = Depends(deps.get_db),
     current_user: models.User = Depends(deps.get_current_user),
 ):
@@ -62,7 +137,26 @@ async def read_course(
     course = await crud.course.get_course(db=db, id=course_id, user_id=current_user.id)
     if not course:
         raise HTTPException(status_code=404, detail="Course not found")
-    return course
+    return RouteFormatView(course, route_format, detail)
+
+@router.get("/{course_id}/thumbnail.{fmt}", response_class=Response)
+async def read_course_thumbnail(
+    course_id: uuid.UUID,
+    fmt: ThumbnailFormat,
+    if_none_match: Optional[str] = Header(None),
+    db: AsyncSession = Depends(deps.get_db),
+    current_user: models.User = Depends(deps.get_current_user),
+):
+    """
+    코스 경로 썸네일 이미지(png/webp)를 반환합니다. 내 코스 또는 공개(published, private 아님) 코스만 볼 수 있습니다.
+    """
+    row = await crud.course.get_course_route_level(db=db, id=course_id)
+    visible = row is not None and (
+        row.user_id == current_user.id or (row.status == "published" and row.visibility != "private")
+    )
+    if not visible or row.route is None:
+        raise HTTPException(status_code=404, detail="Course not found")
+    return await route_thumbnail_response("courses", course_id, row.route, fmt=fmt, if_none_match=if_none_match)
 
 @router.patch("/{course_id}", response_model=schemas.Course)
 async def update_course(
@@ -77,7 +171,8 @@ async def update_course(
     course = await crud.course.get_course(db=db, id=course_id, user_id=current_user.id)
     if not course:
         raise HTTPException(status_code=404, detail="Course not found")
-    
+
+    # 긴 경로는 목록/지도용 단계를 만드는 동안 route_executor를 씁니다. (풀이 가득 차면 429, 시간 초과면 503)
     course = await crud.course.update_course(db=db, db_course=course, course_in=course_in)
     return course
 
@@ -95,15 +190,32 @@ async def delete_course(
         raise HTTPException(status_code=404, detail="Course not found")
     
     await crud.course.delete_course(db=db, db_course=course)
+    remove_route_thumbnails("courses", course_id)
     return course
 
-@router.get("/{course_id}/ranking", response_model=List[schemas.CourseAttempt])
+@router.get("/{course_id}/ranking", response_model=List[schemas.LeaderboardEntry])
 async def read_course_ranking(
     course_id: uuid.UUID,
+    offset: int = Query(0, ge=0),
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    around_me: bool = Query(False, description="true면 내 순위를 가운데 둔 limit개 구간을 반환 (로그인 필요)"),
     db: AsyncSession = Depends(deps.get_db),
+    current_user: Optional[models.User] = Depends(deps.get_optional_current_user),
 ):
     """
-    특정 코스의 랭킹을 조회합니다.
+    특정 코스의 랭킹(사용자별 최고 기록, 성공한 도전 중 소요 시간이 짧은 순)을 조회합니다.
+    - around_me=true: offset 대신 내 순위 주변을 반환합니다. 내 기록이 없으면 빈 목록입니다.
     """
-    ranking = await crud.course_attempt.get_course_ranking(db=db, course_id=course_id)
-    return ranking
\ No newline at end of file
+    if around_me:
+        if current_user is None:
+            raise HTTPException(status_code=401, detail="Not authenticated")
+        my_rank = await crud.leaderboard.get_user_rank(db=db, course_id=course_id, user_id=current_user.id)
+        if my_rank is None:
+            return []
+        offset = max(0, my_rank - 1 - limit // 2)
+
+    rows = await crud.leaderboard.get_ranking_page(db=db, course_id=course_id, offset=offset, limit=limit)
+    return [
+        schemas.LeaderboardEntry(rank=offset + i + 1, **row._mapping)
+        for i, row in enumerate(rows)
+    ]
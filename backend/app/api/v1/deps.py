@@ -18,6 +18,10 @@ async def get_db() -> AsyncSession:
 oauth2_scheme = OAuth2PasswordBearer(
     tokenUrl=f"{settings.API_V1_STR}/login/access-token"
 )
+# 토큰이 없어도 401을 내지 않는 스킴 (get_optional_current_user용)
+optional_oauth2_scheme = OAuth2PasswordBearer(
+    tokenUrl=f"{settings.API_V1_STR}/login/access-token", auto_error=False
+)
 
 async def get_current_user(
     db: AsyncSession = Depends(get_db), token: str = Depends(oauth2_scheme)
@@ -50,12 +54,10 @@ async def get_current_user(
     return user
 
 
-async def get_optional_current_user(
-    db: AsyncSession = Depends(get_db), token: Optional[str] = Depends(oauth2_scheme)
-) -> Optional[models.User]:
+async def get_user_from_token(db: AsyncSession, token: Optional[str]) -> Optional[models.User]:
     """
-    (선택) 토큰이 없거나 유효하지 않아도 오류를 발생시키지 않고 None을 반환합니다.
-    비로그인 상태에서도 API를 호출할 수 있도록 허용할 때 사용합니다.
+    토큰을 검증해 사용자를 반환합니다. 토큰이 없거나 유효하지 않으면 None을 반환합니다.
+    (헤더를 쓸 수 없는 WebSocket 연결처럼 토큰을 직접 받는 곳에서도 사용)
     """
     if not token:
         return None
@@ -71,4 +73,14 @@ async def get_optional_current_user(
         return None # 토큰이 유효하지 않으면 조용히 None 반환
 
     user = await crud.user.get_user_by_id(db, user_id=uuid.UUID(token_data.sub))
-    return user
\ No newline at end of file
+    return user
+
+
+async def get_optional_current_user(
+    db: AsyncSession = Depends(get_db), token: Optional[str] = Depends(optional_oauth2_scheme)
+) -> Optional[models.User]:
+    """
+    (선택) 토큰이 없거나 유효하지 않아도 오류를 발생시키지 않고 None을 반환합니다.
+    비로그인 상태에서도 API를 호출할 수 있도록 허용할 때 사용합니다.
+    """
+    return await get_user_from_token(db, token)
@@ -0,0 +1,171 @@
+# app/api/v1/live.py
+import asyncio
+import uuid
+from typing import Optional
+
+from fastapi import APIRouter, Depends, Query, WebSocket, WebSocketDisconnect, status
+from pydantic import ValidationError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app import crud, models, schemas
+from app.api.v1 import deps
+from app.core.live import (
+    MESSAGE_FINISHED,
+    MESSAGE_STATUS,
+    MESSAGE_TOTALS,
+    Subscription,
+    get_live_broker,
+    run_channel,
+)
+from app.core.run_metrics import LiveRunAccumulator, samples_to_array
+
+router = APIRouter()
+
+def _bearer_token(websocket: WebSocket, token: Optional[str]) -> Optional[str]:
+    # 브라우저 WebSocket은 헤더를 붙일 수 없으므로 ?token=도 허용합니다.
+    if token:
+        return token
+    authorization = websocket.headers.get("authorization", "")
+    scheme, _, value = authorization.partition(" ")
+    return value if scheme.lower() == "bearer" else None
+
+
+async def _authenticate(db: AsyncSession, websocket: WebSocket, token: Optional[str]) -> Optional[models.User]:
+    user = await deps.get_user_from_token(db, _bearer_token(websocket, token))
+    if user is None:
+        await websocket.close(code=status.WS_1008_POLICY_VIOLATION, reason="Could not validate credentials")
+    return user
+
+
+@router.websocket("/{run_id}/live")
+async def stream_run_points(
+    websocket: WebSocket,
+    run_id: uuid.UUID,
+    token: Optional[str] = Query(None),
+    db: AsyncSession = Depends(deps.get_db),
+):
+    """
+    진행 중인 러닝의 GPS 샘플을 한 연결로 계속 보냅니다. (러너 본인만)
+    - 보내는 메시지: POST /runs/{run_id}/points와 같은 {"seq", "points"} 묶음
+    - 받는 메시지: {"type": "ack", "seq", "duplicate", "totals"} (totals는 서버가 누적 계산한 값)
+    묶음은 run_point_chunks에 저장되므로 연결이 끊겨도 다시 연결해 이어서 보내면 되고,
+    완료(PATCH status=finished) 시 HTTP 업로드와 똑같이 경로/지표로 합쳐집니다.
+    연결 중에 완료되면 다음 묶음을 받을 때 1008로 닫습니다. (완료 뒤 묶음은 저장하지 않음)
+    """
+    user = await _authenticate(db, websocket, token)
+    if user is None:
+        return
+    run = await crud.run.get_run_owner_status(db=db, id=run_id)
+    if run is None or run.user_id != user.id or run.status == crud.run.FINISHED_STATUS:
+        await websocket.close(code=status.WS_1008_POLICY_VIOLATION, reason="Run not found or not in progress")
+        return
+
+    await websocket.accept()
+    broker = get_live_broker()
+    channel = run_channel(run_id)
+
+    # 재연결이면 이미 저장된 샘플로 누적값을 복원합니다.
+    accumulator = LiveRunAccumulator()
+    stored = await crud.run_points.load_samples(db=db, run_id=run_id)
+    if stored is not None:
+        accumulator.add(stored)
+    # 읽기 트랜잭션을 끝내 연결이 유지되는 동안 DB 커넥션을 잡고 있지 않도록 합니다.
+    await db.commit()
+    await broker.publish(channel, {"type": MESSAGE_STATUS, "connected": True, **accumulator.totals()})
+
+    finished = False
+    try:
+        while True:
+            try:
+                batch = schemas.RunPointBatch.model_validate(await websocket.receive_json())
+            except (ValidationError, ValueError, KeyError) as e:
+                # KeyError: 바이너리 프레임 (receive_json은 텍스트 프레임만 읽음)
+                await websocket.send_json({"type": "error", "detail": str(e)})
+                continue
+
+            samples = samples_to_array([p.model_dump() for p in batch.points])
+            try:
+                inserted = await crud.run_points.append_point_chunk(
+                    db=db, run_id=run_id, seq=batch.seq, samples=samples
+                )
+            except crud.run_points.RunNotInProgressError:
+                finished = True
+                await websocket.close(code=status.WS_1008_POLICY_VIOLATION, reason="Run is not in progress")
+                return
+            if inserted:
+                accumulator.add(samples)
+                await broker.publish(channel, {"type": MESSAGE_TOTALS, **accumulator.totals()})
+            await websocket.send_json(
+                {"type": "ack", "seq": batch.seq, "duplicate": not inserted, "totals": accumulator.totals()}
+            )
+    except WebSocketDisconnect:
+        pass
+    finally:
+        if not finished:
+            # 완료 처리(PATCH)가 이미 finished를 보내고 채널 마지막 값을 지웠으면 다시 남기지 않습니다.
+            row = await crud.run.get_run_owner_status(db=db, id=run_id)
+            await db.commit()
+            finished = row is None or row.status == crud.run.FINISHED_STATUS
+        if not finished:
+            await broker.publish(channel, {"type": MESSAGE_STATUS, "connected": False, **accumulator.totals()})
+
+
+async def _forward(websocket: WebSocket, subscription: Subscription) -> None:
+    while True:
+        message = await subscription.get()
+        await websocket.send_json(message)
+        if message.get("type") == MESSAGE_FINISHED:
+            await websocket.close()
+            return
+
+
+async def _wait_disconnect(websocket: WebSocket) -> None:
+    while (await websocket.receive())["type"] != "websocket.disconnect":
+        pass
+
+
+@router.websocket("/{run_id}/live/watch")
+async def watch_run(
+    websocket: WebSocket,
+    run_id: uuid.UUID,
+    token: Optional[str] = Query(None),
+    db: AsyncSession = Depends(deps.get_db),
+):
+    """
+    진행 중인 러닝의 누적값을 실시간으로 받습니다. (크루원 등 관전자)
+    - 연결 직후 마지막 누적값을 한 번 보내고, 이후 러너가 보낼 때마다 전달합니다.
+    - 관전자가 느리면 오래된 메시지부터 버리고 최신 값을 보냅니다. (연결당 LIVE_BUFFER_SIZE개)
+    크루 권한 모델이 아직 없으므로 로그인한 사용자면 기록 ID(UUID)를 아는 경우 관전할 수 있습니다.
+    """
+    user = await _authenticate(db, websocket, token)
+    if user is None:
+        return
+    run = await crud.run.get_run_owner_status(db=db, id=run_id)
+    if run is None:
+        await websocket.close(code=status.WS_1008_POLICY_VIOLATION, reason="Run not found")
+        return
+    # 인증/조회가 끝났으므로 연결이 유지되는 동안 DB 세션을 잡고 있지 않습니다.
+    await db.close()
+
+    await websocket.accept()
+    if run.status == crud.run.FINISHED_STATUS:
+        await websocket.send_json({"type": MESSAGE_FINISHED})
+        await websocket.close()
+        return
+
+    broker = get_live_broker()
+    channel = run_channel(run_id)
+    subscription = await broker.subscribe(channel)
+    last = await broker.last(channel)
+    if last is not None:
+        subscription.deliver(last)
+
+    # 관전자는 보내는 메시지가 없으므로, 전달 태스크가 끝나거나(완료) 연결이 끊길 때까지 기다립니다.
+    forward = asyncio.create_task(_forward(websocket, subscription))
+    disconnect = asyncio.create_task(_wait_disconnect(websocket))
+    try:
+        await asyncio.wait({forward, disconnect}, return_when=asyncio.FIRST_COMPLETED)
+    finally:
+        forward.cancel()
+        disconnect.cancel()
+        await broker.unsubscribe(subscription)
@@ -4,7 +4,7 @@ from fastapi.security import OAuth2PasswordRequestForm
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app import crud, schemas
-from app.core.security import create_access_token, verify_password
+from app.core.security import create_access_token, verify_password_async
 from app.core.config import settings
 from app.api.v1 import deps
 
@@ -17,18 +17,26 @@ async def login_for_access_token(
 ):
     """
     사용자 이메일(username)과 비밀번호로 로그인하여 액세스 토큰을 발급받습니다.
+    - 비밀번호 확인(bcrypt)은 전용 풀에서 실행하며, 대기열이 가득 차면 429, 시간 초과면 503 (Retry-After 포함)
+    - 해시 설정(PASSWORD_BCRYPT_ROUNDS)이 바뀌었으면 로그인 성공 시 새 설정으로 다시 저장합니다.
     """
     user = await crud.user.get_user_by_email(db, email=form_data.username)
-    if not user or not user.hashed_password or not verify_password(form_data.password, user.hashed_password):
+    verified, new_hash = False, None
+    if user:
+        verified, new_hash = await verify_password_async(form_data.password, user.hashed_password)
+    if not verified:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Incorrect email or password",
             headers={"WWW-Authenticate": "Bearer"},
         )
+    user_id = user.id
+    if new_hash:
+        await crud.user.update_password_hash(db, user_id=user_id, hashed_password=new_hash)
     
     access_token_expires = timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
     access_token = create_access_token(
-        data={"sub": str(user.id)}, expires_delta=access_token_expires
+        data={"sub": str(user_id)}, expires_delta=access_token_expires
     )
     
     return {"access_token": access_token, "token_type": "bearer"}
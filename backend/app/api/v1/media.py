@@ -0,0 +1,93 @@
+# app/api/v1/media.py
+import hashlib
+import mimetypes
+from pathlib import Path
+from typing import Optional
+
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Response
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.api.v1 import deps
+from app.core.config import settings
+from app.core.file_responses import file_response, stat_etag, stat_file
+from app.core.images import DERIVED_PREFIX
+from app.core.storage import BLOB_PREFIX, CONTENT_TYPE_EXTENSIONS
+from app.core.thumbnails import THUMBNAIL_DIR
+from app.crud.album import album as crud_album
+
+router = APIRouter()
+
+# 키가 곧 내용인 디렉토리 (콘텐츠 주소 원본/파생본): 1년 캐시 + immutable, 재검증 요청 없음
+IMMUTABLE_DIRS = {BLOB_PREFIX, DERIVED_PREFIX}
+# /media로 직접 내보내지 않는 디렉토리 (경로 썸네일은 권한을 확인하는 API 엔드포인트로만 제공)
+HIDDEN_DIRS = {THUMBNAIL_DIR}
+IMMUTABLE_MAX_AGE = 31536000
+MEDIA_TYPES = {ext: content_type for content_type, ext in CONTENT_TYPE_EXTENSIONS.items()}
+
+
+def _media_type(key: str) -> str:
+    suffix = Path(key).suffix.lower()
+    return MEDIA_TYPES.get(suffix) or mimetypes.guess_type(key)[0] or "application/octet-stream"
+
+
+@router.api_route("/{key:path}", methods=["GET", "HEAD"], response_class=Response, include_in_schema=False)
+async def serve_media(
+    key: str,
+    token: Optional[str] = Query(None),
+    bearer: Optional[str] = Depends(deps.optional_oauth2_scheme),
+    if_none_match: Optional[str] = Header(None),
+    range_header: Optional[str] = Header(None, alias="range"),
+    if_range: Optional[str] = Header(None),
+    db: AsyncSession = Depends(deps.get_db),
+):
+    """
+    MEDIA_ROOT의 업로드 파일을 보냅니다. (StaticFiles 대신)
+    - 콘텐츠 주소 파일(blobs/, derived/)은 Cache-Control immutable로 1년 캐시, 그 밖의 파일은 ETag로 매번 재검증(304)
+    - Range 요청(206), HEAD 지원
+    - MEDIA_PRIVATE_ALBUMS면 공개가 아닌 앨범의 이미지는 소유자에게만 보냅니다. (없는 파일과 같게 404)
+    - MEDIA_ACCEL_REDIRECT_PREFIX가 있으면 권한만 확인하고 바이트는 nginx가 보냅니다. (X-Accel-Redirect)
+    """
+    parts = key.split("/")
+    # 숨김 파일(업로드 임시 파일 .staging 등)과 상위 경로 접근은 막습니다.
+    if not key or parts[0] in HIDDEN_DIRS or any(not part or part.startswith(".") for part in parts):
+        raise HTTPException(status_code=404, detail="Not found")
+
+    scope = "public"
+    if settings.MEDIA_PRIVATE_ALBUMS:
+        user = await deps.get_user_from_token(db, bearer or token)
+        if not await crud_album.is_media_visible(db, key=key, user_id=user.id if user else None):
+            raise HTTPException(status_code=404, detail="Not found")
+        # 권한에 따라 달라지는 응답이므로 공유 캐시(CDN/프록시)에는 남기지 않습니다.
+        scope = "private"
+
+    immutable = parts[0] in IMMUTABLE_DIRS
+    accel_redirect = None
+    if settings.MEDIA_ACCEL_REDIRECT_PREFIX:
+        accel_redirect = f"{settings.MEDIA_ACCEL_REDIRECT_PREFIX.rstrip('/')}/{key}"
+
+    path = str(Path(settings.MEDIA_ROOT) / key)
+    stat_result = None
+    if not (accel_redirect and immutable):  # nginx가 보내는 불변 파일은 앱이 디스크를 볼 필요가 없음
+        stat_result = await stat_file(path)
+        if stat_result is None:
+            raise HTTPException(status_code=404, detail="Not found")
+
+    if immutable:
+        # 키가 같으면 내용도 같으므로 키로 만든 ETag도 strong입니다.
+        etag = hashlib.sha256(key.encode()).hexdigest()[:32]
+        cache_control = f"{scope}, max-age={IMMUTABLE_MAX_AGE}, immutable"
+    else:
+        etag = stat_etag(stat_result)
+        cache_control = f"{scope}, no-cache"
+
+    return file_response(
+        path,
+        stat_result,
+        etag=etag,
+        cache_control=cache_control,
+        media_type=_media_type(key),
+        if_none_match=if_none_match,
+        range_header=range_header,
+        if_range=if_range,
+        accel_redirect=accel_redirect,
+    )
@@ -1,11 +1,24 @@
 # app/api/v1/runs.py
-from typing import List, Any
-from fastapi import APIRouter, Depends, HTTPException
+from typing import List, Any, Optional
+from datetime import datetime
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Response
 from sqlalchemy.ext.asyncio import AsyncSession
 import uuid
 
 from app import crud, models, schemas
 from app.api.v1 import deps
+from app.schemas.route import ListRouteDetail, RouteDetail, RouteFormat, RouteFormatView
+from app.core.live import MESSAGE_FINISHED, get_live_broker, run_channel
+from app.core.run_metrics import samples_to_array
+from app.core.thumbnails import ThumbnailFormat, remove_route_thumbnails, route_thumbnail_response
+from app.core.pagination import (
+    DEFAULT_PAGE_SIZE,
+    MAX_PAGE_SIZE,
+    NEXT_CURSOR_HEADER,
+    InvalidCursorError,
+    decode_cursor,
+    encode_cursor,
+)
 
 router = APIRouter()
 
@@ -20,23 +33,80 @@ async def create_run(
     # ✅ 함수명 맞추기: create_run_with_owner
     return await crud.run.create_run_with_owner(db=db, run_in=run_in, user_id=current_user.id)
 
-@router.get("/", response_model=List[schemas.Run])
+@router.get("/", response_model=List[schemas.RunSummary])
 async def read_runs(
+    response: Response,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = Query(None, description="이전 응답의 X-Next-Cursor 헤더 값"),
+    date_from: Optional[datetime] = Query(None, alias="from"),
+    date_to: Optional[datetime] = Query(None, alias="to"),
+    status: Optional[str] = Query(None, description="running / paused / finished 등"),
+    detail: Optional[ListRouteDetail] = Query(None, description="thumb(약 32점)/map(약 256점)이면 해당 단계의 경로를 포함"),
+    route_format: RouteFormat = Query("json", description="polyline이면 route 대신 route_polyline 문자열을 반환"),
     db: AsyncSession = Depends(deps.get_db),
     current_user: models.User = Depends(deps.get_current_user),
-) -> List[models.Run]:
-    return await crud.run.get_runs_by_user(db=db, user_id=current_user.id)
+) -> Any:
+    """
+    내 러닝 기록 요약 목록을 최신순으로 반환합니다. (splits/chart_data 제외, 상세는 GET /runs/{run_id})
+    - 경로는 기본으로 빠지며, detail=thumb|map을 주면 점 수를 줄인 경로만 함께 반환합니다.
+    - 다음 페이지가 있으면 X-Next-Cursor 헤더가 포함되며, 그 값을 cursor로 넘기면 이어서 조회합니다.
+    """
+    after = None
+    if cursor:
+        try:
+            created_at, run_id = decode_cursor(cursor, parts=2)
+            after = (datetime.fromisoformat(created_at), uuid.UUID(run_id))
+        except (InvalidCursorError, ValueError):
+            raise HTTPException(status_code=400, detail="Invalid cursor")
+
+    # 다음 페이지 존재 여부를 알기 위해 하나 더 읽습니다.
+    rows = await crud.run.get_runs_by_user(
+        db=db,
+        user_id=current_user.id,
+        limit=limit + 1,
+        after=after,
+        date_from=date_from,
+        date_to=date_to,
+        status=status,
+        route_detail=detail,
+    )
+    if len(rows) > limit:
+        rows = rows[:limit]
+        last = rows[-1]
+        response.headers[NEXT_CURSOR_HEADER] = encode_cursor(last.created_at.isoformat(), last.id)
+    if detail is not None:
+        return [RouteFormatView(row, route_format, detail) for row in rows]
+    return rows
 
 @router.get("/{run_id}", response_model=schemas.Run)
 async def read_run(
     run_id: uuid.UUID,
+    route_format: RouteFormat = Query("json", description="polyline이면 route 대신 route_polyline 문자열을 반환"),
+    detail: RouteDetail = Query("full", description="경로 단계: thumb(약 32점) / map(약 256점) / full(전체)"),
     db: AsyncSession = Depends(deps.get_db),
     current_user: models.User = Depends(deps.get_current_user),
 ):
     run = await crud.run.get_run(db=db, id=run_id, user_id=current_user.id)
     if not run:
         raise HTTPException(status_code=404, detail="Run not found")
-    return run
+    return RouteFormatView(run, route_format, detail)
+
+@router.get("/{run_id}/thumbnail.{fmt}", response_class=Response)
+async def read_run_thumbnail(
+    run_id: uuid.UUID,
+    fmt: ThumbnailFormat,
+    if_none_match: Optional[str] = Header(None),
+    db: AsyncSession = Depends(deps.get_db),
+    current_user: models.User = Depends(deps.get_current_user),
+):
+    """
+    경로 썸네일 이미지(png/webp, 지도 단계 경로)를 반환합니다.
+    처음 요청 시 한 번 그려 MEDIA_ROOT/thumbnails에 저장하며, 경로가 수정되면 ETag가 바뀌어 다시 그립니다.
+    """
+    row = await crud.run.get_run_route_level(db=db, id=run_id, user_id=current_user.id)
+    if row is None or row.route is None:
+        raise HTTPException(status_code=404, detail="Run not found")
+    return await route_thumbnail_response("runs", run_id, row.route, fmt=fmt, if_none_match=if_none_match)
 
 @router.patch("/{run_id}", response_model=schemas.Run)
 async def update_run(
@@ -45,10 +115,58 @@ async def update_run(
     db: AsyncSession = Depends(deps.get_db),
     current_user: models.User = Depends(deps.get_current_user),
 ):
+    """
+    러닝 기록을 수정합니다.
+    status=finished와 함께 원시 GPS 샘플(samples)을 보내면 거리/움직인 시간/페이스/splits/chart_data/칼로리를
+    서버에서 계산해 저장합니다. (클라이언트가 보낸 같은 값은 덮어씀)
+    """
     run = await crud.run.get_run(db=db, id=run_id, user_id=current_user.id)
     if not run:
         raise HTTPException(status_code=404, detail="Run not found")
-    return await crud.run.update_run(db=db, db_run=run, run_in=run_in)
+    was_finished = run.status == crud.run.FINISHED_STATUS
+    # 긴 경로는 목록/지도용 단계를 만드는 동안 route_executor를 씁니다. (풀이 가득 차면 429, 시간 초과면 503)
+    run = await crud.run.update_run(db=db, db_run=run, run_in=run_in, weight_kg=current_user.weight)
+    if not was_finished and run.status == crud.run.FINISHED_STATUS:
+        # 실시간 관전자에게 완료를 알리고 채널의 마지막 값을 지웁니다.
+        broker = get_live_broker()
+        await broker.publish(run_channel(run.id), {"type": MESSAGE_FINISHED, "distance": run.distance, "duration": run.duration})
+        await broker.clear(run_channel(run.id))
+    return run
+
+@router.post("/{run_id}/points", response_model=schemas.RunPointBatchResult)
+async def append_run_points(
+    run_id: uuid.UUID,
+    batch: schemas.RunPointBatch,
+    db: AsyncSession = Depends(deps.get_db),
+    current_user: models.User = Depends(deps.get_current_user),
+):
+    """
+    진행 중인 러닝에 GPS 샘플 묶음을 추가합니다.
+    - 묶음은 별도 행으로 쌓이므로 경로 전체를 다시 보내거나 다시 쓰지 않습니다.
+    - 같은 seq를 다시 보내면(재시도) 저장하지 않고 duplicate=true를 반환합니다.
+    - PATCH /runs/{run_id}로 finished가 되면 쌓인 샘플이 경로와 지표로 합쳐집니다.
+    """
+    run = await crud.run.get_run(db=db, id=run_id, user_id=current_user.id)
+    if not run:
+        raise HTTPException(status_code=404, detail="Run not found")
+    if run.status == crud.run.FINISHED_STATUS:
+        raise HTTPException(status_code=409, detail="Run is already finished")
+
+    samples = samples_to_array([p.model_dump() for p in batch.points])
+    try:
+        inserted = await crud.run_points.append_point_chunk(db=db, run_id=run.id, seq=batch.seq, samples=samples)
+    except crud.run_points.RunNotInProgressError:
+        # 위 확인 뒤 완료된 경우
+        raise HTTPException(status_code=409, detail="Run is already finished")
+    # append_point_chunk가 커밋해 run이 만료되었으므로 경로의 run_id를 씁니다. (다시 읽지 않도록)
+    chunk_count, point_count, last_seq = await crud.run_points.get_chunk_totals(db=db, run_id=run_id)
+    return schemas.RunPointBatchResult(
+        seq=batch.seq,
+        duplicate=not inserted,
+        chunk_count=chunk_count,
+        point_count=point_count,
+        last_seq=last_seq,
+    )
 
 @router.delete("/{run_id}", response_model=schemas.Run)
 async def delete_run(
@@ -60,4 +178,5 @@ async def delete_run(
     if not run:
         raise HTTPException(status_code=404, detail="Run not found")
     await crud.run.delete_run(db=db, db_run=run)
+    remove_route_thumbnails("runs", run_id)
     return run
@@ -1,13 +1,20 @@
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy.ext.asyncio import AsyncSession
+from zoneinfo import ZoneInfo
 from app import crud, models, schemas
 from app.api.v1 import deps
-from typing import Literal
+from app.core.tz import InvalidTimezoneError, get_zone
+from app.crud.stats import Granularity
+from datetime import date
+from typing import Literal, Optional
 
 router = APIRouter() # <--- 이 줄이 빠져있었을 겁니다!
 
 @router.get("/me", response_model=schemas.User)
-async def read_users_me(current_user: models.User = Depends(deps.get_current_user)):
+async def read_users_me(
+    current_user: models.User = Depends(deps.get_current_user),
+):
+    # 러닝 기록 목록 대신 users 행의 집계 컬럼만 반환합니다.
     return current_user
 
 @router.post("/", response_model=schemas.User)
@@ -24,18 +31,56 @@ async def update_user_me(
     """
     현재 로그인된 사용자의 프로필을 수정합니다.
     """
-    user = await crud.user.update_user(db=db, db_user=current_user, user_in=user_in)
-    return user
+    return await crud.user.update_user(db=db, db_user=current_user, user_in=user_in)
+
+TZ_QUERY = Query(None, description="IANA 시간대 (예: Asia/Seoul). 없으면 프로필의 timezone")
+
+
+def _resolve_zone(tz: Optional[str], user: models.User) -> ZoneInfo:
+    try:
+        return get_zone(tz or user.timezone)
+    except InvalidTimezoneError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
 
 @router.get("/me/stats", response_model=schemas.StatsResponse)
 async def read_user_stats(
     period: Literal["weekly", "monthly", "yearly", "all"] = "weekly",
+    tz: Optional[str] = TZ_QUERY,
     db: AsyncSession = Depends(deps.get_db),
     current_user: models.User = Depends(deps.get_current_user),
 ):
     """
     현재 로그인된 사용자의 러닝 통계를 기간별로 조회합니다.
+    이번 주/이번 달의 경계는 사용자 시간대의 자정 기준입니다.
     """
-    stats = await crud.stats.get_user_stats(db=db, user_id=current_user.id, period=period)
-    return stats
+    zone = _resolve_zone(tz, current_user)
+    return await crud.stats.get_user_stats(db=db, user_id=current_user.id, period=period, zone=zone)
 
+
+@router.get("/me/stats/series", response_model=schemas.StatsResponse)
+async def read_user_stats_series(
+    date_from: date = Query(..., alias="from", description="시작 날짜(포함, 현지 날짜)"),
+    date_to: date = Query(..., alias="to", description="끝 날짜(포함, 현지 날짜)"),
+    granularity: Granularity = "day",
+    tz: Optional[str] = TZ_QUERY,
+    db: AsyncSession = Depends(deps.get_db),
+    current_user: models.User = Depends(deps.get_current_user),
+):
+    """
+    임의 기간의 러닝 통계를 day/week/month/year 단위 막대로 조회합니다.
+    - 라벨: day/week는 'YYYY-MM-DD'(week는 그 주의 월요일), month는 'YYYY-MM', year는 'YYYY'
+    - 기록이 없는 구간도 0으로 채워집니다.
+    """
+    zone = _resolve_zone(tz, current_user)
+    try:
+        return await crud.stats.get_user_stats_series(
+            db=db,
+            user_id=current_user.id,
+            date_from=date_from,
+            date_to=date_to,
+            granularity=granularity,
+            zone=zone,
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
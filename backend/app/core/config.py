@@ -33,9 +33,78 @@ class Settings(BaseSettings):
             f"@{values.get('POSTGRES_SERVER')}/{values.get('POSTGRES_DB')}"
         )
 
+    # Password hashing (bcrypt, 로그인/가입 시 전용 풀에서 실행)
+    PASSWORD_BCRYPT_ROUNDS: int = 12        # 바꾸면 기존 해시는 다음 로그인 성공 때 새 값으로 다시 저장
+    PASSWORD_HASH_EXECUTOR: str = "thread"  # process / thread (bcrypt는 해싱 중 GIL을 놓음)
+    PASSWORD_HASH_WORKERS: int = 2
+    PASSWORD_HASH_MAX_PENDING: int = 32     # 실행 중 + 대기 작업 상한 (넘치면 429)
+    PASSWORD_HASH_TIMEOUT_SECONDS: float = 10.0
+    PASSWORD_HASH_RETRY_AFTER_SECONDS: int = 1
+
     # Media / Storage
     MEDIA_ROOT: str = "/app/media"
     MEDIA_URL: str = "/media"
+    STORAGE_BACKEND: str = "local"          # local / s3 (S3 호환: AWS S3, 로컬 개발은 MinIO)
+    MAX_UPLOAD_BYTES: int = 20 * 1024 * 1024
+    UPLOAD_IO_CONCURRENCY: int = 4          # 업로드 파일 쓰기에 동시에 쓰는 스레드 수 상한
+    MEDIA_GC_INTERVAL_SECONDS: int = 3600   # 참조되지 않은 미디어 객체 정리 주기 (app.worker.run_media_gc, 0이면 끔)
+    # True면 공개(public)가 아닌 앨범에만 쓰인 이미지는 소유자만 받습니다. (Authorization 헤더 또는 ?token=)
+    MEDIA_PRIVATE_ALBUMS: bool = False
+    # 앞단 nginx의 internal location (예: /_protected_media → MEDIA_ROOT). 설정하면 앱은 권한만 확인하고 바이트는 nginx가 보냄
+    MEDIA_ACCEL_REDIRECT_PREFIX: Optional[str] = None
+    # STORAGE_BACKEND=s3일 때 (boto3 필요: poetry install -E s3)
+    S3_BUCKET: str = "r3-media"
+    S3_ENDPOINT_URL: Optional[str] = None   # MinIO 등 (예: http://minio:9000), None이면 AWS
+    S3_REGION: Optional[str] = None
+    S3_ACCESS_KEY_ID: Optional[str] = None
+    S3_SECRET_ACCESS_KEY: Optional[str] = None
+    S3_PUBLIC_URL: Optional[str] = None     # 객체 URL 접두사 (CDN 등), None이면 endpoint/bucket
+
+    # Course attempt / 경로 유사도
+    SIMILARITY_ENGINE: str = "vectorized"  # vectorized / naive
+    SCORING_EXECUTOR: str = "process"       # process / thread
+    SCORING_WORKERS: int = 2
+    SCORING_MAX_PENDING: int = 16           # 실행 중 + 대기 작업 상한 (넘치면 429)
+    SCORING_TIMEOUT_SECONDS: float = 30.0
+    SCORING_RETRY_AFTER_SECONDS: int = 5
+
+    # Route thumbnails (GET /runs/{id}/thumbnail.png 등, MEDIA_ROOT/thumbnails에 캐시)
+    THUMBNAIL_SIZE: int = 256               # 기본 한 변 픽셀 수
+    THUMBNAIL_EXECUTOR: str = "thread"      # process / thread (그리기/인코딩은 Pillow가 GIL을 놓고 처리)
+    THUMBNAIL_WORKERS: int = 2
+    THUMBNAIL_MAX_PENDING: int = 64
+    THUMBNAIL_TIMEOUT_SECONDS: float = 10.0
+    THUMBNAIL_RETRY_AFTER_SECONDS: int = 2
+
+    # Route levels (러닝 완료 지표 + 목록/지도용 경로 단계, app.core.route_levels)
+    # 썸네일 그리드 요청이 몰려도 완료/경로 수정이 429를 받지 않도록 썸네일과 풀을 나눕니다.
+    ROUTE_EXECUTOR: str = "thread"          # process / thread (대부분 NumPy 연산)
+    ROUTE_WORKERS: int = 1
+    ROUTE_MAX_PENDING: int = 16
+    ROUTE_TIMEOUT_SECONDS: float = 10.0
+    ROUTE_RETRY_AFTER_SECONDS: int = 2
+
+    # Album image derivatives (업로드 시 목록/그리드용 작은 이미지와 자리표시 생성, app.core.images)
+    IMAGE_VARIANT_WIDTHS: List[int] = [320, 640, 1280]
+    IMAGE_VARIANT_FORMATS: List[str] = ["avif", "webp"]  # Pillow가 인코딩하지 못하는 형식은 건너뜀
+    IMAGE_EXECUTOR: str = "thread"          # process / thread (디코딩/리샘플링/인코딩은 Pillow가 GIL을 놓고 처리)
+    IMAGE_WORKERS: int = 2
+    IMAGE_MAX_PENDING: int = 8              # 넘치면 파생본 없이 업로드만 저장 (다시 올리면 채움)
+    IMAGE_TIMEOUT_SECONDS: float = 30.0
+    IMAGE_RETRY_AFTER_SECONDS: int = 5
+
+    # Background jobs (코스 도전 비동기 채점 등)
+    JOB_QUEUE_BACKEND: str = "inprocess"    # inprocess / redis
+    JOB_WORKERS: int = 2                    # 큐 컨슈머 동시 실행 수
+    JOB_CLAIM_TIMEOUT_SECONDS: int = 600    # 채점 중(scoring)으로 이보다 오래 남은 도전은 워커 재시작 시 다시 채점
+    REDIS_URL: str = "redis://redis:6379/0"
+    # 코스 랭킹 순위/구간 조회용 정렬 집합 (원본은 course_leaderboard 테이블, app.core.leaderboard_index)
+    LEADERBOARD_INDEX_BACKEND: str = "inprocess"  # inprocess / redis (API/채점 워커가 여러 프로세스면 redis)
+
+    # Live tracking (WebSocket /runs/{id}/live)
+    LIVE_BROKER_BACKEND: str = "inprocess"  # inprocess / redis (API 워커가 여러 개면 redis)
+    LIVE_BUFFER_SIZE: int = 32              # 연결당 보내지 못한 메시지 상한 (넘치면 오래된 것부터 버림)
+    LIVE_LAST_MAX_CHANNELS: int = 10000     # inprocess: 마지막 메시지를 보관할 채널 수 상한 (넘치면 오래된 채널부터 버림)
 
     class Config:
         case_sensitive = True
@@ -0,0 +1,248 @@
+# app/core/executor.py
+import asyncio
+import logging
+import multiprocessing
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Any, Callable, Optional, Tuple
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+class ExecutorSaturatedError(Exception):
+    """
+    대기열이 가득 차서 새 작업을 받을 수 없을 때 발생합니다. (API에서는 main의 핸들러가 429 + detail로 변환)
+    """
+
+    def __init__(self, executor_name: str, retry_after: int, detail: str) -> None:
+        super().__init__(f"{executor_name} executor is saturated")
+        self.retry_after = retry_after
+        self.detail = detail
+
+
+class ExecutorTimeoutError(Exception):
+    """
+    작업이 제한 시간 안에 끝나지 않았을 때 발생합니다. (API에서는 main의 핸들러가 503 + detail로 변환)
+    """
+
+    def __init__(self, executor_name: str, timeout: float, retry_after: int, detail: str) -> None:
+        super().__init__(f"{executor_name} job timed out after {timeout:.1f}s")
+        self.retry_after = retry_after
+        self.detail = detail
+
+
+@dataclass
+class JobMetrics:
+    """
+    작업 하나가 끝날 때마다 metrics hook에 전달되는 값입니다.
+    """
+    executor: str
+    status: str                      # ok / error / timeout / rejected
+    queue_depth: int                 # 제출 시점의 (실행 중 + 대기) 작업 수
+    total_seconds: float = 0.0       # 제출부터 결과 수신까지 걸린 시간 (대기 포함)
+    run_seconds: Optional[float] = None  # 워커 안에서 실제로 계산한 시간
+
+
+MetricsHook = Callable[[JobMetrics], None]
+
+
+def _log_metrics(metrics: JobMetrics) -> None:
+    logger.debug(
+        "%s job %s: depth=%d total=%.3fs run=%s",
+        metrics.executor, metrics.status, metrics.queue_depth, metrics.total_seconds,
+        f"{metrics.run_seconds:.3f}s" if metrics.run_seconds is not None else "-",
+    )
+
+
+def _timed_call(fn: Callable[..., Any], *args: Any) -> Tuple[Any, float]:
+    # 워커 프로세스/스레드 안에서 실행되어 순수 계산 시간을 함께 돌려줍니다.
+    started = time.perf_counter()
+    result = fn(*args)
+    return result, time.perf_counter() - started
+
+
+class CPUExecutor:
+    """
+    CPU를 많이 쓰는 작업을 이벤트 루프 밖(프로세스/스레드 풀)에서 실행합니다.
+    - max_pending: 실행 중 + 대기 중인 작업 수의 상한. 넘치면 ExecutorSaturatedError (backpressure)
+    - timeout_seconds: 작업 하나를 기다리는 최대 시간. 넘기면 ExecutorTimeoutError
+    - saturated_detail / timeout_detail: 위 예외가 API 응답(429/503)으로 나갈 때의 detail 문구
+    - 풀은 처음 사용할 때 만들어집니다.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        *,
+        kind: str = "process",
+        max_workers: int = 2,
+        max_pending: int = 16,
+        timeout_seconds: float = 30.0,
+        retry_after_seconds: int = 5,
+        saturated_detail: str = "Too many requests. Please retry later.",
+        timeout_detail: str = "Request timed out. Please retry later.",
+    ) -> None:
+        if kind not in ("process", "thread"):
+            raise ValueError(f"Unknown executor kind: {kind!r}")
+        self.name = name
+        self.kind = kind
+        self.max_workers = max_workers
+        self.max_pending = max_pending
+        self.timeout_seconds = timeout_seconds
+        self.retry_after_seconds = retry_after_seconds
+        self.saturated_detail = saturated_detail
+        self.timeout_detail = timeout_detail
+        self._pool: Optional[Executor] = None
+        self._pending = 0
+        self._metrics_hook: MetricsHook = _log_metrics
+
+    @property
+    def queue_depth(self) -> int:
+        """
+        현재 실행 중이거나 대기 중인 작업 수
+        """
+        return self._pending
+
+    def set_metrics_hook(self, hook: Optional[MetricsHook]) -> None:
+        """
+        작업 완료/거절 시 호출될 콜백을 등록합니다. (None이면 기본 로깅으로 되돌림)
+        """
+        self._metrics_hook = hook or _log_metrics
+
+    def _emit(self, metrics: JobMetrics) -> None:
+        try:
+            self._metrics_hook(metrics)
+        except Exception:  # metrics 수집 실패가 요청 처리에 영향을 주지 않도록 합니다.
+            logger.exception("metrics hook failed for %s executor", self.name)
+
+    def _get_pool(self) -> Executor:
+        if self._pool is None:
+            if self.kind == "process":
+                # spawn: 부모의 이벤트 루프/DB 커넥션/스레드를 복제하지 않도록 새 인터프리터에서 시작합니다.
+                self._pool = ProcessPoolExecutor(
+                    max_workers=self.max_workers,
+                    mp_context=multiprocessing.get_context("spawn"),
+                )
+            else:
+                self._pool = ThreadPoolExecutor(
+                    max_workers=self.max_workers, thread_name_prefix=f"{self.name}-executor"
+                )
+        return self._pool
+
+    def _release(self) -> None:
+        self._pending -= 1
+
+    async def run(self, fn: Callable[..., Any], *args: Any) -> Any:
+        """
+        fn(*args)를 풀에서 실행하고 결과를 기다립니다. (fn과 인자는 pickle 가능해야 합니다)
+        """
+        depth = self._pending
+        if depth >= self.max_pending:
+            self._emit(JobMetrics(executor=self.name, status="rejected", queue_depth=depth))
+            raise ExecutorSaturatedError(self.name, self.retry_after_seconds, self.saturated_detail)
+
+        loop = asyncio.get_running_loop()
+        started = time.perf_counter()
+        self._pending += 1
+        future = self._get_pool().submit(_timed_call, fn, *args)
+
+        def _on_done(_: Any) -> None:
+            # 타임아웃이 나도 워커의 작업은 계속 실행되므로, 실제로 끝났을 때 슬롯을 반납합니다.
+            try:
+                loop.call_soon_threadsafe(self._release)
+            except RuntimeError:  # 이벤트 루프가 이미 닫힌 경우(종료 중)
+                pass
+
+        future.add_done_callback(_on_done)
+
+        try:
+            result, run_seconds = await asyncio.wait_for(
+                asyncio.wrap_future(future), timeout=self.timeout_seconds
+            )
+        except asyncio.TimeoutError:
+            self._emit(JobMetrics(
+                executor=self.name, status="timeout", queue_depth=depth,
+                total_seconds=time.perf_counter() - started,
+            ))
+            raise ExecutorTimeoutError(self.name, self.timeout_seconds, self.retry_after_seconds, self.timeout_detail)
+        except Exception:
+            self._emit(JobMetrics(
+                executor=self.name, status="error", queue_depth=depth,
+                total_seconds=time.perf_counter() - started,
+            ))
+            raise
+
+        self._emit(JobMetrics(
+            executor=self.name, status="ok", queue_depth=depth,
+            total_seconds=time.perf_counter() - started, run_seconds=run_seconds,
+        ))
+        return result
+
+    def shutdown(self) -> None:
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
+
+
+# 코스 도전 유사도 계산용 실행기
+scoring_executor = CPUExecutor(
+    "scoring",
+    kind=settings.SCORING_EXECUTOR,
+    max_workers=settings.SCORING_WORKERS,
+    max_pending=settings.SCORING_MAX_PENDING,
+    timeout_seconds=settings.SCORING_TIMEOUT_SECONDS,
+    retry_after_seconds=settings.SCORING_RETRY_AFTER_SECONDS,
+    saturated_detail="Too many scoring requests. Please retry later.",
+    timeout_detail="Scoring timed out. Please retry later.",
+)
+
+# 경로 썸네일 렌더링용 실행기 (app.core.thumbnails)
+thumbnail_executor = CPUExecutor(
+    "thumbnail",
+    kind=settings.THUMBNAIL_EXECUTOR,
+    max_workers=settings.THUMBNAIL_WORKERS,
+    max_pending=settings.THUMBNAIL_MAX_PENDING,
+    timeout_seconds=settings.THUMBNAIL_TIMEOUT_SECONDS,
+    retry_after_seconds=settings.THUMBNAIL_RETRY_AFTER_SECONDS,
+    saturated_detail="Too many thumbnail requests. Please retry later.",
+    timeout_detail="Thumbnail rendering timed out. Please retry later.",
+)
+
+# 러닝 완료 지표/경로 단계 계산용 실행기 (app.core.route_levels)
+route_executor = CPUExecutor(
+    "route",
+    kind=settings.ROUTE_EXECUTOR,
+    max_workers=settings.ROUTE_WORKERS,
+    max_pending=settings.ROUTE_MAX_PENDING,
+    timeout_seconds=settings.ROUTE_TIMEOUT_SECONDS,
+    retry_after_seconds=settings.ROUTE_RETRY_AFTER_SECONDS,
+    saturated_detail="Too many route updates. Please retry later.",
+    timeout_detail="Route processing timed out. Please retry later.",
+)
+
+# 앨범 이미지 파생본 인코딩용 실행기 (app.core.images, crud.media.store_upload)
+media_executor = CPUExecutor(
+    "media",
+    kind=settings.IMAGE_EXECUTOR,
+    max_workers=settings.IMAGE_WORKERS,
+    max_pending=settings.IMAGE_MAX_PENDING,
+    timeout_seconds=settings.IMAGE_TIMEOUT_SECONDS,
+    retry_after_seconds=settings.IMAGE_RETRY_AFTER_SECONDS,
+    saturated_detail="Too many image uploads. Please retry later.",
+    timeout_detail="Image processing timed out. Please retry later.",
+)
+
+# 비밀번호 해싱/확인용 실행기 (app.core.security)
+password_executor = CPUExecutor(
+    "password",
+    kind=settings.PASSWORD_HASH_EXECUTOR,
+    max_workers=settings.PASSWORD_HASH_WORKERS,
+    max_pending=settings.PASSWORD_HASH_MAX_PENDING,
+    timeout_seconds=settings.PASSWORD_HASH_TIMEOUT_SECONDS,
+    retry_after_seconds=settings.PASSWORD_HASH_RETRY_AFTER_SECONDS,
+    saturated_detail="Too many authentication requests. Please retry later.",
+    timeout_detail="Authentication timed out. Please retry later.",
+)
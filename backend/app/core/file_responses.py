@@ -0,0 +1,167 @@
+# app/core/file_responses.py
+import os
+import stat
+from email.utils import formatdate
+from typing import Mapping, Optional, Tuple
+
+import anyio
+from fastapi import status
+from fastapi.responses import FileResponse, Response
+from starlette.types import Receive, Scope, Send
+
+# Range 응답을 보낼 때 한 번에 읽는 크기
+RANGE_CHUNK_SIZE = 256 * 1024
+
+
+class RangeNotSatisfiableError(Exception):
+    """
+    Range 헤더가 파일 크기를 벗어났을 때 발생합니다. (416)
+    """
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """
+    If-None-Match 헤더 값이 etag(따옴표 없는 값)와 맞는지 확인합니다. (약한 비교, RFC 9110)
+    """
+    if not if_none_match:
+        return False
+    tags = [tag.strip() for tag in if_none_match.split(",")]
+    return "*" in tags or f'"{etag}"' in tags or f'W/"{etag}"' in tags
+
+
+def stat_etag(stat_result: os.stat_result) -> str:
+    """
+    내용이 바뀔 수 있는 파일용 ETag (수정 시각 + 크기). 파일은 항상 rename으로 통째로 바뀌므로 strong으로 씁니다.
+    """
+    return f"{stat_result.st_mtime_ns:x}-{stat_result.st_size:x}"
+
+
+def parse_range(range_header: Optional[str], size: int) -> Optional[Tuple[int, int]]:
+    """
+    "bytes=..." 헤더에서 (시작, 끝) 바이트 위치(끝 포함)를 구합니다.
+    - 헤더가 없거나 형식이 다르거나 여러 구간이면 None (전체 응답, RFC 9110에서 허용)
+    - 구간이 파일 밖이면 RangeNotSatisfiableError
+    """
+    if not range_header:
+        return None
+    unit, _, spec = range_header.partition("=")
+    if unit.strip().lower() != "bytes" or "," in spec:
+        return None
+    first, sep, last = spec.strip().partition("-")
+    if not sep:
+        return None
+    try:
+        if first:
+            start = int(first)
+            end = int(last) if last else size - 1
+        else:
+            # bytes=-N: 마지막 N바이트
+            suffix = int(last)
+            if suffix <= 0:
+                raise RangeNotSatisfiableError(range_header)
+            start, end = max(0, size - suffix), size - 1
+    except ValueError:
+        return None
+    if start >= size:
+        raise RangeNotSatisfiableError(range_header)
+    if start < 0 or start > end:
+        return None
+    return start, min(end, size - 1)
+
+
+class PartialFileResponse(Response):
+    """
+    파일의 한 구간을 206 Partial Content로 보냅니다. (동영상 탐색, 끊긴 다운로드 이어받기)
+    파일 전체를 읽지 않고 필요한 구간만 RANGE_CHUNK_SIZE씩 읽어 보냅니다.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        start: int,
+        end: int,
+        stat_result: os.stat_result,
+        *,
+        media_type: Optional[str] = None,
+        headers: Optional[Mapping[str, str]] = None,
+    ) -> None:
+        self.path = path
+        self.start = start
+        self.end = end
+        self.status_code = status.HTTP_206_PARTIAL_CONTENT
+        self.media_type = media_type
+        self.background = None
+        self.init_headers(headers)
+        self.headers["content-range"] = f"bytes {start}-{end}/{stat_result.st_size}"
+        self.headers["content-length"] = str(end - start + 1)
+        self.headers.setdefault("last-modified", formatdate(stat_result.st_mtime, usegmt=True))
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        await send({"type": "http.response.start", "status": self.status_code, "headers": self.raw_headers})
+        if scope["method"].upper() == "HEAD":
+            await send({"type": "http.response.body", "body": b"", "more_body": False})
+            return
+        remaining = self.end - self.start + 1
+        async with await anyio.open_file(self.path, mode="rb") as file:
+            await file.seek(self.start)
+            while remaining > 0:
+                chunk = await file.read(min(RANGE_CHUNK_SIZE, remaining))
+                if not chunk:  # 보내는 중에 파일이 줄어든 경우
+                    break
+                remaining -= len(chunk)
+                await send({"type": "http.response.body", "body": chunk, "more_body": remaining > 0})
+        if remaining > 0:
+            await send({"type": "http.response.body", "body": b"", "more_body": False})
+
+
+def file_response(
+    path: str,
+    stat_result: Optional[os.stat_result],
+    *,
+    etag: str,
+    cache_control: str,
+    media_type: Optional[str] = None,
+    if_none_match: Optional[str] = None,
+    range_header: Optional[str] = None,
+    if_range: Optional[str] = None,
+    accel_redirect: Optional[str] = None,
+) -> Response:
+    """
+    디스크 파일 응답을 만듭니다.
+    - accel_redirect가 있으면 본문 대신 X-Accel-Redirect로 앞단 nginx가 보내게 합니다. (sendfile, 304/Range도 nginx가 처리)
+    - If-None-Match가 ETag와 맞으면 304 (본문 없음)
+    - Range가 있으면 206 (If-Range가 현재 ETag와 다르면 전체 200), 파일 밖이면 416
+    - 전체 파일은 FileResponse로 보냅니다. (서버가 http.response.pathsend를 지원하면 파일 경로만 넘겨 복사 없이 전송)
+    stat_result는 accel_redirect일 때만 None이어도 됩니다. (앱은 파일을 보지 않음)
+    """
+    if accel_redirect:
+        # nginx는 X-Accel-Redirect 응답의 ETag를 버리고 자기 ETag/Last-Modified로 304/Range를 처리합니다.
+        return Response(media_type=media_type, headers={"X-Accel-Redirect": accel_redirect, "Cache-Control": cache_control})
+
+    headers = {"ETag": f'"{etag}"', "Cache-Control": cache_control, "Accept-Ranges": "bytes"}
+    if etag_matches(if_none_match, etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+
+    if range_header and (not if_range or if_range.strip() == f'"{etag}"'):
+        try:
+            byte_range = parse_range(range_header, stat_result.st_size)
+        except RangeNotSatisfiableError:
+            return Response(
+                status_code=status.HTTP_416_REQUESTED_RANGE_NOT_SATISFIABLE,
+                headers={**headers, "Content-Range": f"bytes */{stat_result.st_size}"},
+            )
+        if byte_range is not None:
+            return PartialFileResponse(path, *byte_range, stat_result, media_type=media_type, headers=headers)
+
+    return FileResponse(path, media_type=media_type, headers=headers, stat_result=stat_result)
+
+
+async def stat_file(path: str) -> Optional[os.stat_result]:
+    """
+    일반 파일이면 stat 결과, 없거나 디렉토리면 None (디스크 접근이라 워커 스레드에서 실행)
+    """
+    try:
+        stat_result = await anyio.to_thread.run_sync(os.stat, path)
+    except (FileNotFoundError, NotADirectoryError):
+        return None
+    return stat_result if stat.S_ISREG(stat_result.st_mode) else None
@@ -0,0 +1,92 @@
+# app/core/geo.py
+from typing import Any, Dict, List, Optional, Union
+
+import numpy as np
+
+from app.core import polyline
+
+EARTH_RADIUS_M = 6371e3  # 지구의 반지름 (미터)
+
+RouteLike = Union[List[Dict[str, Any]], np.ndarray, bytes, None]
+
+
+def route_to_array(route: RouteLike) -> np.ndarray:
+    """
+    경로를 (N, 2) 형태의 [lat, lng] float64 배열로 변환합니다.
+    - [{"lat": .., "lng": ..}, ...] 리스트, encoded polyline 바이트, 이미 변환된 ndarray를 모두 허용합니다.
+    """
+    if route is None:
+        return np.empty((0, 2), dtype=np.float64)
+    if isinstance(route, (bytes, bytearray, memoryview)):
+        return polyline.decode(route)
+    if isinstance(route, np.ndarray):
+        return route.reshape(-1, 2).astype(np.float64, copy=False)
+    return np.array(
+        [(p["lat"], p["lng"]) for p in route], dtype=np.float64
+    ).reshape(-1, 2)
+
+
+def haversine_array(latlng_a: np.ndarray, latlng_b: np.ndarray) -> np.ndarray:
+    """
+    두 [lat, lng] 배열의 대응되는 점들 사이 거리(m)를 한 번에 계산합니다.
+    """
+    lat1, lng1 = np.radians(latlng_a[..., 0]), np.radians(latlng_a[..., 1])
+    lat2, lng2 = np.radians(latlng_b[..., 0]), np.radians(latlng_b[..., 1])
+    a = (
+        np.sin((lat2 - lat1) / 2) ** 2
+        + np.cos(lat1) * np.cos(lat2) * np.sin((lng2 - lng1) / 2) ** 2
+    )
+    return 2 * EARTH_RADIUS_M * np.arcsin(np.sqrt(np.clip(a, 0.0, 1.0)))
+
+
+class LocalProjection:
+    """
+    기준점 주변을 평면(미터)으로 근사하는 등장방형(equirectangular) 투영입니다.
+    러닝 코스 규모(수십 km 이내)에서는 오차가 무시할 수준입니다.
+    """
+
+    def __init__(self, lat0: float, lng0: float) -> None:
+        self.lat0 = lat0
+        self.lng0 = lng0
+        self._kx = EARTH_RADIUS_M * np.cos(np.radians(lat0)) * np.pi / 180.0
+        self._ky = EARTH_RADIUS_M * np.pi / 180.0
+
+    @classmethod
+    def for_points(cls, latlng: np.ndarray) -> "LocalProjection":
+        """
+        점들의 경계 상자 중심을 기준점으로 하는 투영을 만듭니다.
+        """
+        if len(latlng) == 0:
+            return cls(0.0, 0.0)
+        lo = latlng.min(axis=0)
+        hi = latlng.max(axis=0)
+        return cls(float((lo[0] + hi[0]) / 2), float((lo[1] + hi[1]) / 2))
+
+    def forward(self, latlng: np.ndarray) -> np.ndarray:
+        """
+        [lat, lng] 배열을 [x, y] (m) 배열로 변환합니다.
+        """
+        xy = np.empty_like(latlng, dtype=np.float64)
+        xy[:, 0] = (latlng[:, 1] - self.lng0) * self._kx
+        xy[:, 1] = (latlng[:, 0] - self.lat0) * self._ky
+        return xy
+
+    def inverse(self, xy: np.ndarray) -> np.ndarray:
+        """
+        [x, y] (m) 배열을 다시 [lat, lng] 배열로 변환합니다.
+        """
+        latlng = np.empty_like(xy, dtype=np.float64)
+        latlng[:, 0] = xy[:, 1] / self._ky + self.lat0
+        latlng[:, 1] = xy[:, 0] / self._kx + self.lng0
+        return latlng
+
+
+def project_route(
+    route: RouteLike, projection: Optional[LocalProjection] = None
+) -> tuple[np.ndarray, LocalProjection]:
+    """
+    경로를 평면 좌표로 투영하고 (xy 배열, 사용한 투영)을 함께 반환합니다.
+    """
+    latlng = route_to_array(route)
+    projection = projection or LocalProjection.for_points(latlng)
+    return projection.forward(latlng), projection
@@ -0,0 +1,145 @@
+# app/core/images.py
+import base64
+import os
+import re
+from dataclasses import asdict, dataclass, field
+from io import BytesIO
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence
+
+from PIL import Image, ImageOps, features
+
+# 앨범 이미지 파생본(목록/그리드용 작은 이미지)
+# 키: derived/<sha 앞 2자리>/<다음 2자리>/<원본 sha256>/w<폭>.<포맷>
+# 원본이 콘텐츠 주소라 파생본도 내용이 바뀌지 않습니다. (영구 캐시 가능, 원본 GC 때 함께 지움)
+DERIVED_PREFIX = "derived"
+DERIVED_KEY_PATTERN = re.compile(rf"^{DERIVED_PREFIX}/[0-9a-f]{{2}}/[0-9a-f]{{2}}/([0-9a-f]{{64}})/w[0-9]+\.[a-z0-9]+$")
+
+# 형식 → (Pillow 포맷, Content-Type, 저장 옵션)
+# 인코더 노력(speed/method)은 가장 빠른 쪽에 가깝게 둡니다. 기본값보다 파일이 3~8% 크지만 인코딩은 2배 이상 빠릅니다.
+# (형식별 크기/시간은 benchmarks.album_grid로 비교)
+VARIANT_FORMATS = {
+    "avif": ("AVIF", "image/avif", {"quality": 55, "speed": 10}),
+    "webp": ("WEBP", "image/webp", {"quality": 75, "method": 2}),
+}
+
+# 자리표시(LQIP) 이미지: 이 폭으로 줄인 뒤 data URI로 응답에 바로 넣습니다. (원본 로딩 전 흐린 미리보기, 수백 바이트)
+PLACEHOLDER_WIDTH = 16
+PLACEHOLDER_QUALITY = 30
+
+EXIF_ORIENTATION = 0x0112
+
+
+def derivative_key(sha256: str, width: int, fmt: str) -> str:
+    return f"{DERIVED_PREFIX}/{sha256[:2]}/{sha256[2:4]}/{sha256}/w{width}.{fmt}"
+
+
+def derivative_source(key: str) -> Optional[str]:
+    """
+    파생본 키에서 원본 해시를 꺼냅니다. 파생본 키가 아니면 None
+    """
+    match = DERIVED_KEY_PATTERN.match(key)
+    return match.group(1) if match else None
+
+
+def supported_formats(formats: Sequence[str]) -> List[str]:
+    """
+    설정된 형식 중 이 Pillow 빌드가 인코딩할 수 있는 것만 남깁니다. (AVIF는 libavif가 있어야 함)
+    """
+    return [fmt for fmt in formats if fmt in VARIANT_FORMATS and features.check(fmt)]
+
+
+@dataclass
+class ImageVariant:
+    """
+    파생본 파일 하나 (media_blobs.variants 항목, key는 저장소에 올린 뒤 채움)
+    """
+    format: str
+    width: int
+    height: int
+    size: int
+    path: str = ""
+    key: str = ""
+
+    def to_json(self) -> Dict[str, object]:
+        data = asdict(self)
+        data.pop("path")
+        return data
+
+
+@dataclass
+class ImageDerivatives:
+    """
+    build_derivatives() 결과: 원본 크기, 자리표시 data URI, 파생본 목록
+    """
+    width: int
+    height: int
+    placeholder: str
+    variants: List[ImageVariant] = field(default_factory=list)
+
+
+def _target_widths(source_width: int, widths: Sequence[int]) -> List[int]:
+    # 원본보다 크게 늘리지 않습니다. 원본이 가장 작은 폭보다 작으면 원본 폭 하나만 만듭니다.
+    targets = sorted({w for w in widths if w < source_width})
+    if not targets or max(widths) >= source_width:
+        targets.append(source_width)
+    return sorted(set(targets), reverse=True)
+
+
+def _resize(image: Image.Image, width: int) -> Image.Image:
+    if width == image.width:
+        return image
+    height = max(1, round(image.height * width / image.width))
+    # reducing_gap: 먼저 정수 배로 빠르게 줄인 뒤 LANCZOS로 마무리합니다. (화질 차이 없이 몇 배 빠름)
+    return image.resize((width, height), Image.Resampling.LANCZOS, reducing_gap=3.0)
+
+
+def _placeholder(image: Image.Image) -> str:
+    small = _resize(image, min(PLACEHOLDER_WIDTH, image.width))
+    out = BytesIO()
+    small.save(out, format="WEBP", quality=PLACEHOLDER_QUALITY)
+    return "data:image/webp;base64," + base64.b64encode(out.getvalue()).decode("ascii")
+
+
+def build_derivatives(
+    source: str, out_dir: str, widths: Sequence[int], formats: Sequence[str]
+) -> ImageDerivatives:
+    """
+    원본 이미지에서 폭별/형식별 파생본을 out_dir에 쓰고 결과를 반환합니다. (media_executor 워커에서 실행)
+    - EXIF 회전을 반영하고, 투명도가 있으면 유지합니다.
+    - 큰 폭부터 만들고 작은 폭은 바로 위 단계에서 줄여 원본 전체를 여러 번 리샘플링하지 않습니다.
+    - 이미지가 아니거나 깨졌으면 PIL.UnidentifiedImageError / OSError
+    """
+    target = Path(out_dir)
+    target.mkdir(parents=True, exist_ok=True)
+    with Image.open(source) as opened:
+        # 원본 크기(EXIF 회전 반영)는 클라이언트가 로딩 전에 칸 비율을 잡는 데 씁니다.
+        width, height = opened.size
+        if opened.getexif().get(EXIF_ORIENTATION) in (5, 6, 7, 8):
+            width, height = height, width
+        # JPEG는 디코딩 단계에서 바로 줄여 읽습니다. (EXIF 회전 전이라 정사각형으로 요청, 가장 큰 파생본보다 작아지지는 않음)
+        largest = max(widths)
+        opened.draft(None, (largest, largest))
+        image = ImageOps.exif_transpose(opened)
+        has_alpha = image.mode in ("RGBA", "LA", "PA") or (image.mode == "P" and "transparency" in image.info)
+        image = image.convert("RGBA" if has_alpha else "RGB")
+
+    result = ImageDerivatives(width=width, height=height, placeholder="")
+    current = image
+    for width in _target_widths(image.width, widths):
+        current = _resize(current, width)
+        for fmt in formats:
+            pil_format, _, options = VARIANT_FORMATS[fmt]
+            path = target / f"w{width}.{fmt}"
+            current.save(path, format=pil_format, **options)
+            result.variants.append(ImageVariant(
+                format=fmt, width=current.width, height=current.height,
+                size=os.path.getsize(path), path=str(path),
+            ))
+    result.placeholder = _placeholder(current)
+    return result
+
+
+def variant_content_type(fmt: str) -> Optional[str]:
+    entry = VARIANT_FORMATS.get(fmt)
+    return entry[1] if entry else None
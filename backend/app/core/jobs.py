@@ -0,0 +1,128 @@
+# app/core/jobs.py
+import asyncio
+import logging
+from abc import ABC, abstractmethod
+from typing import Awaitable, Callable, List, Optional
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# 작업 ID(문자열)를 받아 처리하는 비동기 핸들러
+JobHandler = Callable[[str], Awaitable[None]]
+
+
+class JobQueue(ABC):
+    """
+    백그라운드 작업 큐의 공통 인터페이스입니다.
+    - enqueue(): API 요청 안에서 작업 ID를 넣습니다.
+    - run_consumers(): 워커(앱 내부 태스크 또는 별도 프로세스)에서 작업을 꺼내 handler로 처리합니다.
+    """
+
+    name: str
+
+    @abstractmethod
+    async def enqueue(self, job_id: str) -> None:
+        ...
+
+    @abstractmethod
+    async def run_consumers(self, handler: JobHandler, concurrency: int = 1) -> None:
+        ...
+
+    async def close(self) -> None:
+        pass
+
+
+async def _handle_safely(handler: JobHandler, queue_name: str, job_id: str) -> None:
+    try:
+        await handler(job_id)
+    except Exception:  # 한 작업의 실패로 컨슈머가 죽지 않도록 합니다.
+        logger.exception("job %s from %s queue failed", job_id, queue_name)
+
+
+class InProcessJobQueue(JobQueue):
+    """
+    API 프로세스 안의 asyncio.Queue를 사용하는 큐입니다. (로컬 개발/단일 워커용)
+    프로세스가 재시작되면 큐 내용이 사라지므로, 시작 시 대기 중인 작업을 다시 넣어야 합니다.
+    """
+
+    def __init__(self, name: str) -> None:
+        self.name = name
+        self._queue: "asyncio.Queue[str]" = asyncio.Queue()
+
+    async def enqueue(self, job_id: str) -> None:
+        self._queue.put_nowait(job_id)
+
+    async def _consume(self, handler: JobHandler) -> None:
+        while True:
+            job_id = await self._queue.get()
+            try:
+                await _handle_safely(handler, self.name, job_id)
+            finally:
+                self._queue.task_done()
+
+    async def run_consumers(self, handler: JobHandler, concurrency: int = 1) -> None:
+        await asyncio.gather(*(self._consume(handler) for _ in range(concurrency)))
+
+
+class RedisJobQueue(JobQueue):
+    """
+    Redis 리스트(LPUSH/BRPOP)를 사용하는 큐입니다.
+    API와 워커(`python -m app.worker`)가 서로 다른 프로세스/컨테이너일 때 사용합니다.
+    """
+
+    def __init__(self, name: str, url: str) -> None:
+        # redis 패키지는 이 백엔드를 쓸 때만 필요합니다.
+        from redis import asyncio as aioredis
+
+        self.name = name
+        self._key = f"r3:jobs:{name}"
+        self._redis = aioredis.from_url(url, decode_responses=True)
+
+    async def enqueue(self, job_id: str) -> None:
+        await self._redis.lpush(self._key, job_id)
+
+    async def _consume(self, handler: JobHandler) -> None:
+        while True:
+            item = await self._redis.brpop(self._key, timeout=5)
+            if item is None:
+                continue
+            _, job_id = item
+            await _handle_safely(handler, self.name, job_id)
+
+    async def run_consumers(self, handler: JobHandler, concurrency: int = 1) -> None:
+        await asyncio.gather(*(self._consume(handler) for _ in range(concurrency)))
+
+    async def close(self) -> None:
+        await self._redis.aclose()
+
+
+def create_job_queue(name: str) -> JobQueue:
+    """
+    설정(JOB_QUEUE_BACKEND)에 맞는 큐 구현을 만듭니다.
+    """
+    if settings.JOB_QUEUE_BACKEND == "redis":
+        return RedisJobQueue(name, settings.REDIS_URL)
+    if settings.JOB_QUEUE_BACKEND == "inprocess":
+        return InProcessJobQueue(name)
+    raise ValueError(f"Unknown JOB_QUEUE_BACKEND: {settings.JOB_QUEUE_BACKEND!r}")
+
+
+_queues: dict = {}
+
+
+def get_job_queue(name: str) -> JobQueue:
+    """
+    이름별 큐 인스턴스를 하나씩만 만들어 재사용합니다.
+    """
+    queue: Optional[JobQueue] = _queues.get(name)
+    if queue is None:
+        queue = _queues[name] = create_job_queue(name)
+    return queue
+
+
+async def close_job_queues() -> None:
+    queues: List[JobQueue] = list(_queues.values())
+    _queues.clear()
+    for queue in queues:
+        await queue.close()
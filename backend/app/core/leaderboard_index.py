@@ -0,0 +1,217 @@
+# app/core/leaderboard_index.py
+import bisect
+import time
+import uuid
+from abc import ABC, abstractmethod
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from app.core.config import settings
+
+# (best_duration, achieved_at, user_id) - course_leaderboard 한 행에서 순위에 필요한 값
+RankedEntry = Tuple[float, datetime, uuid.UUID]
+
+
+def _member(achieved_at: datetime, user_id: uuid.UUID) -> str:
+    # 같은 기록 시간이면 먼저 달성한 순, 그다음 user_id 순이 되도록 고정 폭 문자열로 만듭니다. (Redis는 같은 점수를 사전순 정렬)
+    return f"{achieved_at:%Y%m%d%H%M%S%f}:{user_id}"
+
+
+def _member_user(member: str) -> uuid.UUID:
+    return uuid.UUID(member.rpartition(":")[2])
+
+
+class LeaderboardIndex(ABC):
+    """
+    코스별 리더보드 순위 인덱스(정렬 집합)의 공통 인터페이스입니다.
+    course_leaderboard 테이블이 원본이고, 이것은 순위/구간 조회를 O(log n)으로 하기 위한 사본입니다. (crud.leaderboard)
+    - load(): 코스의 전체 항목으로 채웁니다. 채워지지 않은 코스는 조회 전에 DB에서 다시 읽습니다.
+    - upsert()/remove(): 항목이 바뀌면 반영합니다. 채워지지 않은 코스면 아무것도 하지 않습니다.
+    - 원본과 어긋나도(롤백, DB에서 직접 지운 행 등) TTL_SECONDS가 지나면 DB에서 다시 채웁니다.
+    """
+
+    TTL_SECONDS = 3600
+
+    @abstractmethod
+    async def is_loaded(self, course_id: uuid.UUID) -> bool:
+        ...
+
+    @abstractmethod
+    async def load(self, course_id: uuid.UUID, entries: Iterable[RankedEntry]) -> None:
+        ...
+
+    @abstractmethod
+    async def upsert(self, course_id: uuid.UUID, entry: RankedEntry) -> None:
+        ...
+
+    @abstractmethod
+    async def remove(self, course_id: uuid.UUID, user_id: uuid.UUID) -> None:
+        ...
+
+    @abstractmethod
+    async def rank(self, course_id: uuid.UUID, user_id: uuid.UUID) -> Optional[int]:
+        """
+        0부터 시작하는 순위 (없으면 None)
+        """
+
+    @abstractmethod
+    async def page(self, course_id: uuid.UUID, offset: int, limit: int) -> List[uuid.UUID]:
+        """
+        순위순으로 offset부터 limit명의 user_id
+        """
+
+    async def close(self) -> None:
+        pass
+
+
+class InProcessLeaderboardIndex(LeaderboardIndex):
+    """
+    API 프로세스 메모리 안의 인덱스입니다. (로컬 개발/테스트/단일 워커용)
+    정렬된 리스트에서 이진 탐색으로 순위를 찾습니다. (삽입/삭제는 리스트 이동이 있어 O(n)이지만 memmove라 빠름)
+    """
+
+    def __init__(self) -> None:
+        # 코스 → (만료 시각(monotonic), 정렬된 (기록, 멤버) 목록, user_id → (기록, 멤버))
+        self._courses: Dict[uuid.UUID, Tuple[float, List[Tuple[float, str]], Dict[uuid.UUID, Tuple[float, str]]]] = {}
+
+    def _get(self, course_id: uuid.UUID):
+        course = self._courses.get(course_id)
+        if course is not None and course[0] <= time.monotonic():
+            del self._courses[course_id]
+            return None
+        return course
+
+    async def is_loaded(self, course_id: uuid.UUID) -> bool:
+        return self._get(course_id) is not None
+
+    async def load(self, course_id: uuid.UUID, entries: Iterable[RankedEntry]) -> None:
+        keys = {user_id: (duration, _member(achieved_at, user_id)) for duration, achieved_at, user_id in entries}
+        self._courses[course_id] = (time.monotonic() + self.TTL_SECONDS, sorted(keys.values()), keys)
+
+    async def upsert(self, course_id: uuid.UUID, entry: RankedEntry) -> None:
+        course = self._get(course_id)
+        if course is None:
+            return
+        duration, achieved_at, user_id = entry
+        await self.remove(course_id, user_id)
+        key = (duration, _member(achieved_at, user_id))
+        bisect.insort(course[1], key)
+        course[2][user_id] = key
+
+    async def remove(self, course_id: uuid.UUID, user_id: uuid.UUID) -> None:
+        course = self._get(course_id)
+        key = course[2].pop(user_id, None) if course is not None else None
+        if key is not None:
+            del course[1][bisect.bisect_left(course[1], key)]
+
+    async def rank(self, course_id: uuid.UUID, user_id: uuid.UUID) -> Optional[int]:
+        course = self._get(course_id)
+        key = course[2].get(user_id) if course is not None else None
+        return None if key is None else bisect.bisect_left(course[1], key)
+
+    async def page(self, course_id: uuid.UUID, offset: int, limit: int) -> List[uuid.UUID]:
+        course = self._get(course_id)
+        if course is None:
+            return []
+        return [_member_user(member) for _, member in course[1][offset:offset + limit]]
+
+
+# 코스가 채워져 있을 때만 항목 하나를 바꿉니다. (KEYS: 채움 표시, 정렬 집합, user_id → 멤버 해시)
+# ARGV: user_id, 새 멤버(빈 문자열이면 삭제), 기록
+_UPSERT_SCRIPT = """
+if redis.call('EXISTS', KEYS[1]) == 0 then return 0 end
+local old = redis.call('HGET', KEYS[3], ARGV[1])
+if old then redis.call('ZREM', KEYS[2], old) end
+if ARGV[2] == '' then
+  redis.call('HDEL', KEYS[3], ARGV[1])
+else
+  redis.call('ZADD', KEYS[2], ARGV[3], ARGV[2])
+  redis.call('HSET', KEYS[3], ARGV[1], ARGV[2])
+end
+return 1
+"""
+
+
+class RedisLeaderboardIndex(LeaderboardIndex):
+    """
+    Redis 정렬 집합(점수 = 기록, 멤버 = 달성 시각 + user_id)을 쓰는 인덱스입니다. API/채점 워커가 여러 프로세스일 때 사용합니다.
+    순위는 HGET(user_id → 멤버) + ZRANK, 구간은 ZRANGE로 모두 O(log n)입니다.
+    """
+
+    def __init__(self, url: str) -> None:
+        # redis 패키지는 이 백엔드를 쓸 때만 필요합니다.
+        from redis import asyncio as aioredis
+
+        self._redis = aioredis.from_url(url, decode_responses=True)
+        self._upsert = self._redis.register_script(_UPSERT_SCRIPT)
+
+    @staticmethod
+    def _keys(course_id: uuid.UUID) -> List[str]:
+        key = f"r3:leaderboard:{course_id}"
+        return [f"{key}:loaded", key, f"{key}:members"]
+
+    async def is_loaded(self, course_id: uuid.UUID) -> bool:
+        return bool(await self._redis.exists(self._keys(course_id)[0]))
+
+    async def load(self, course_id: uuid.UUID, entries: Iterable[RankedEntry]) -> None:
+        loaded, ranking, members = self._keys(course_id)
+        scores = {_member(achieved_at, user_id): duration for duration, achieved_at, user_id in entries}
+        async with self._redis.pipeline(transaction=True) as pipe:
+            pipe.delete(ranking, members)
+            if scores:
+                pipe.zadd(ranking, scores)
+                pipe.hset(members, mapping={str(_member_user(member)): member for member in scores})
+            for key in (ranking, members):
+                pipe.expire(key, self.TTL_SECONDS)
+            pipe.set(loaded, 1, ex=self.TTL_SECONDS)
+            await pipe.execute()
+
+    async def upsert(self, course_id: uuid.UUID, entry: RankedEntry) -> None:
+        duration, achieved_at, user_id = entry
+        await self._upsert(keys=self._keys(course_id), args=[str(user_id), _member(achieved_at, user_id), duration])
+
+    async def remove(self, course_id: uuid.UUID, user_id: uuid.UUID) -> None:
+        await self._upsert(keys=self._keys(course_id), args=[str(user_id), "", 0])
+
+    async def rank(self, course_id: uuid.UUID, user_id: uuid.UUID) -> Optional[int]:
+        _, ranking, members = self._keys(course_id)
+        member = await self._redis.hget(members, str(user_id))
+        return None if member is None else await self._redis.zrank(ranking, member)
+
+    async def page(self, course_id: uuid.UUID, offset: int, limit: int) -> List[uuid.UUID]:
+        members = await self._redis.zrange(self._keys(course_id)[1], offset, offset + limit - 1)
+        return [_member_user(member) for member in members]
+
+    async def close(self) -> None:
+        await self._redis.aclose()
+
+
+def create_leaderboard_index() -> LeaderboardIndex:
+    """
+    설정(LEADERBOARD_INDEX_BACKEND)에 맞는 인덱스 구현을 만듭니다.
+    """
+    if settings.LEADERBOARD_INDEX_BACKEND == "redis":
+        return RedisLeaderboardIndex(settings.REDIS_URL)
+    if settings.LEADERBOARD_INDEX_BACKEND == "inprocess":
+        return InProcessLeaderboardIndex()
+    raise ValueError(f"Unknown LEADERBOARD_INDEX_BACKEND: {settings.LEADERBOARD_INDEX_BACKEND!r}")
+
+
+_index: Optional[LeaderboardIndex] = None
+
+
+def get_leaderboard_index() -> LeaderboardIndex:
+    """
+    프로세스당 인덱스 인스턴스를 하나만 만들어 재사용합니다.
+    """
+    global _index
+    if _index is None:
+        _index = create_leaderboard_index()
+    return _index
+
+
+async def close_leaderboard_index() -> None:
+    global _index
+    index, _index = _index, None
+    if index is not None:
+        await index.close()
@@ -0,0 +1,255 @@
+# app/core/live.py
+import asyncio
+import json
+import logging
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Set, Tuple
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+Message = Dict[str, Any]
+
+# 채널 메시지 type
+# - totals: 러너의 누적 거리/움직인 시간/평균·현재 페이스/마지막 위치
+# - status: 러너 연결 상태 변화 (connected true/false)
+# - finished: 러닝 완료 (관전 연결은 이 메시지 뒤에 닫힘)
+MESSAGE_TOTALS = "totals"
+MESSAGE_STATUS = "status"
+MESSAGE_FINISHED = "finished"
+
+
+def run_channel(run_id: Any) -> str:
+    """
+    러닝 기록 하나의 실시간 채널 이름
+    """
+    return f"run:{run_id}"
+
+
+class Subscription:
+    """
+    채널 구독 하나 (WebSocket 연결 하나)
+    - 크기가 제한된 버퍼를 가지며, 가득 차면 가장 오래된 메시지를 버립니다. (느린 관전자가 메모리를 늘리지 않도록)
+    - 실시간 누적값은 최신 메시지만 의미가 있으므로 중간 메시지 유실은 괜찮습니다.
+    """
+
+    def __init__(self, channel: str, maxsize: int) -> None:
+        self.channel = channel
+        self.dropped = 0
+        self._queue: "asyncio.Queue[Message]" = asyncio.Queue(maxsize=maxsize)
+
+    def deliver(self, message: Message) -> None:
+        if self._queue.full():
+            self._queue.get_nowait()
+            self.dropped += 1
+        self._queue.put_nowait(message)
+
+    async def get(self) -> Message:
+        return await self._queue.get()
+
+
+class LiveBroker(ABC):
+    """
+    실시간 트래킹 pub/sub의 공통 인터페이스입니다. (채널 = 러닝 기록 하나)
+    - publish(): 러너 연결이 누적값을 보냅니다.
+    - subscribe()/unsubscribe(): 관전자 연결이 채널을 구독합니다.
+    - last(): 마지막으로 발행된 메시지 (새 관전자에게 바로 보여줄 값), clear(): 러닝이 끝나면 지웁니다.
+      완료 없이 버려진 기록의 값이 계속 남지 않도록 LAST_TTL_SECONDS가 지나면 사라집니다.
+    """
+
+    LAST_TTL_SECONDS = 6 * 3600
+
+    @abstractmethod
+    async def publish(self, channel: str, message: Message) -> None:
+        ...
+
+    @abstractmethod
+    async def subscribe(self, channel: str) -> Subscription:
+        ...
+
+    @abstractmethod
+    async def unsubscribe(self, subscription: Subscription) -> None:
+        ...
+
+    @abstractmethod
+    async def last(self, channel: str) -> Optional[Message]:
+        ...
+
+    @abstractmethod
+    async def clear(self, channel: str) -> None:
+        ...
+
+    async def close(self) -> None:
+        pass
+
+
+class _LocalFanout:
+    """
+    이 프로세스 안의 구독자들에게 메시지를 나눠 주는 부분 (두 브로커 구현이 공유)
+    """
+
+    def __init__(self, buffer_size: int) -> None:
+        self._buffer_size = buffer_size
+        self._subscribers: Dict[str, Set[Subscription]] = {}
+
+    def add(self, channel: str) -> Subscription:
+        subscription = Subscription(channel, self._buffer_size)
+        self._subscribers.setdefault(channel, set()).add(subscription)
+        return subscription
+
+    def remove(self, subscription: Subscription) -> bool:
+        """
+        구독을 제거하고, 그 채널의 마지막 구독자였으면 True를 반환합니다.
+        """
+        subscribers = self._subscribers.get(subscription.channel)
+        if not subscribers:
+            return False
+        subscribers.discard(subscription)
+        if subscribers:
+            return False
+        del self._subscribers[subscription.channel]
+        return True
+
+    def deliver(self, channel: str, message: Message) -> None:
+        for subscription in self._subscribers.get(channel, ()):
+            subscription.deliver(message)
+
+
+class InProcessLiveBroker(LiveBroker):
+    """
+    API 프로세스 메모리 안에서 동작하는 브로커입니다. (로컬 개발/단일 워커용)
+    러너와 관전자가 같은 프로세스에 연결되어 있어야 메시지가 전달됩니다.
+    마지막 메시지는 최근 발행한 채널 max_channels개까지만 LAST_TTL_SECONDS 동안 보관합니다. (LRU)
+    """
+
+    def __init__(self, buffer_size: int, max_channels: int) -> None:
+        self._fanout = _LocalFanout(buffer_size)
+        self._max_channels = max_channels
+        # 채널 → (만료 시각(monotonic), 메시지), 오래 발행하지 않은 채널부터
+        self._last: "OrderedDict[str, Tuple[float, Message]]" = OrderedDict()
+
+    async def publish(self, channel: str, message: Message) -> None:
+        self._last[channel] = (time.monotonic() + self.LAST_TTL_SECONDS, message)
+        self._last.move_to_end(channel)
+        while len(self._last) > self._max_channels:
+            self._last.popitem(last=False)
+        self._fanout.deliver(channel, message)
+
+    async def subscribe(self, channel: str) -> Subscription:
+        return self._fanout.add(channel)
+
+    async def unsubscribe(self, subscription: Subscription) -> None:
+        self._fanout.remove(subscription)
+
+    async def last(self, channel: str) -> Optional[Message]:
+        entry = self._last.get(channel)
+        if entry is None:
+            return None
+        expires_at, message = entry
+        if expires_at <= time.monotonic():
+            del self._last[channel]
+            return None
+        return message
+
+    async def clear(self, channel: str) -> None:
+        self._last.pop(channel, None)
+
+
+class RedisLiveBroker(LiveBroker):
+    """
+    Redis pub/sub을 사용하는 브로커입니다. 여러 API 워커/컨테이너에 러너와 관전자가 흩어져 있을 때 사용합니다.
+    - 프로세스마다 pub/sub 연결 하나만 쓰고, 이 프로세스에 구독자가 있는 채널만 SUBSCRIBE합니다.
+    - 받은 메시지는 _LocalFanout으로 각 연결의 버퍼에 나눠 줍니다.
+    - 마지막 메시지는 별도 키(TTL)로 저장합니다.
+    """
+
+    def __init__(self, url: str, buffer_size: int) -> None:
+        # redis 패키지는 이 백엔드를 쓸 때만 필요합니다.
+        from redis import asyncio as aioredis
+
+        self._redis = aioredis.from_url(url, decode_responses=True)
+        self._pubsub = self._redis.pubsub()
+        self._fanout = _LocalFanout(buffer_size)
+        self._reader: Optional[asyncio.Task] = None
+
+    @staticmethod
+    def _key(channel: str) -> str:
+        return f"r3:live:{channel}"
+
+    async def publish(self, channel: str, message: Message) -> None:
+        payload = json.dumps(message)
+        key = self._key(channel)
+        async with self._redis.pipeline(transaction=False) as pipe:
+            pipe.set(f"{key}:last", payload, ex=self.LAST_TTL_SECONDS)
+            pipe.publish(key, payload)
+            await pipe.execute()
+
+    async def subscribe(self, channel: str) -> Subscription:
+        subscription = self._fanout.add(channel)
+        await self._pubsub.subscribe(self._key(channel))
+        if self._reader is None or self._reader.done():
+            self._reader = asyncio.create_task(self._read())
+        return subscription
+
+    async def unsubscribe(self, subscription: Subscription) -> None:
+        if self._fanout.remove(subscription):
+            await self._pubsub.unsubscribe(self._key(subscription.channel))
+
+    async def last(self, channel: str) -> Optional[Message]:
+        payload = await self._redis.get(f"{self._key(channel)}:last")
+        return None if payload is None else json.loads(payload)
+
+    async def clear(self, channel: str) -> None:
+        await self._redis.delete(f"{self._key(channel)}:last")
+
+    async def _read(self) -> None:
+        prefix = len(self._key(""))
+        while True:
+            try:
+                item = await self._pubsub.get_message(ignore_subscribe_messages=True, timeout=1.0)
+            except Exception:  # 연결이 끊겨도 다음 구독에서 다시 시작되도록 로그만 남깁니다.
+                logger.exception("live broker reader failed")
+                return
+            if item is None or item.get("type") != "message":
+                continue
+            self._fanout.deliver(item["channel"][prefix:], json.loads(item["data"]))
+
+    async def close(self) -> None:
+        if self._reader is not None:
+            self._reader.cancel()
+        await self._pubsub.aclose()
+        await self._redis.aclose()
+
+
+def create_live_broker() -> LiveBroker:
+    """
+    설정(LIVE_BROKER_BACKEND)에 맞는 브로커 구현을 만듭니다.
+    """
+    if settings.LIVE_BROKER_BACKEND == "redis":
+        return RedisLiveBroker(settings.REDIS_URL, settings.LIVE_BUFFER_SIZE)
+    if settings.LIVE_BROKER_BACKEND == "inprocess":
+        return InProcessLiveBroker(settings.LIVE_BUFFER_SIZE, settings.LIVE_LAST_MAX_CHANNELS)
+    raise ValueError(f"Unknown LIVE_BROKER_BACKEND: {settings.LIVE_BROKER_BACKEND!r}")
+
+
+_broker: Optional[LiveBroker] = None
+
+
+def get_live_broker() -> LiveBroker:
+    """
+    프로세스당 브로커 인스턴스를 하나만 만들어 재사용합니다.
+    """
+    global _broker
+    if _broker is None:
+        _broker = create_live_broker()
+    return _broker
+
+
+async def close_live_broker() -> None:
+    global _broker
+    broker, _broker = _broker, None
+    if broker is not None:
+        await broker.close()
@@ -0,0 +1,195 @@
+# app/core/media.py
+import hashlib
+import os
+from dataclasses import dataclass
+from pathlib import Path
+from typing import BinaryIO, Dict, Optional
+
+import anyio
+import multipart
+from multipart.multipart import parse_options_header
+from starlette.requests import Request
+
+from app.core.config import settings
+
+# 업로드 스트림을 이 크기씩 모아 씁니다. (업로드 하나당 메모리 사용량 상한)
+UPLOAD_CHUNK_SIZE = 256 * 1024
+# multipart 경계/헤더 여유. 요청 본문이 MAX_UPLOAD_BYTES + 이 값보다 크면 파일 내용과 상관없이 413입니다.
+MULTIPART_OVERHEAD_BYTES = 64 * 1024
+
+
+class UploadTooLargeError(Exception):
+    """
+    업로드 크기가 상한(MAX_UPLOAD_BYTES)을 넘었을 때 발생합니다. (API에서는 413으로 변환)
+    """
+
+    def __init__(self, max_bytes: int) -> None:
+        super().__init__(f"upload exceeds {max_bytes} bytes")
+        self.max_bytes = max_bytes
+
+
+class UploadFormError(ValueError):
+    """
+    업로드 요청이 multipart/form-data가 아니거나 파일 필드가 없을 때 발생합니다. (API에서는 400으로 변환)
+    """
+
+
+@dataclass
+class StoredUpload:
+    """
+    저장된 업로드 파일 정보
+    """
+    path: Path
+    size: int
+    sha256: str
+    filename: Optional[str] = None
+    content_type: Optional[str] = None
+
+
+_io_limiter: Optional[anyio.CapacityLimiter] = None
+
+
+def _get_io_limiter() -> anyio.CapacityLimiter:
+    # 이벤트 루프 안에서 처음 필요할 때 만듭니다.
+    global _io_limiter
+    if _io_limiter is None:
+        _io_limiter = anyio.CapacityLimiter(settings.UPLOAD_IO_CONCURRENCY)
+    return _io_limiter
+
+
+def _open_temp(tmp: Path) -> BinaryIO:
+    tmp.parent.mkdir(parents=True, exist_ok=True)
+    return open(tmp, "wb")
+
+
+def _write_chunk(out: BinaryIO, digest: "hashlib._Hash", chunk: bytes) -> None:
+    # 해시 계산과 쓰기를 같은 워커 스레드에서 한 번에 합니다. (sha256은 GIL을 놓고 계산)
+    digest.update(chunk)
+    out.write(chunk)
+
+
+def _commit_temp(out: BinaryIO, tmp: Path, target: Path) -> None:
+    out.flush()
+    os.fsync(out.fileno())
+    out.close()
+    # 같은 디렉토리 안의 rename이라 원자적입니다. (읽는 쪽은 완성된 파일만 봅니다)
+    os.replace(tmp, target)
+
+
+def _discard_temp(out: BinaryIO, tmp: Path) -> None:
+    out.close()
+    tmp.unlink(missing_ok=True)
+
+
+class _FilePartParser:
+    """
+    multipart 본문에서 파일 필드 하나의 바이트만 골라 data에 모읍니다. (python-multipart 푸시 파서 콜백)
+    다른 필드와 두 번째 이후의 같은 이름 필드는 버립니다.
+    """
+
+    def __init__(self, boundary: bytes, field: str) -> None:
+        self.field = field
+        self.data = bytearray()
+        self.filename: Optional[str] = None
+        self.content_type: Optional[str] = None
+        self.found = self.finished = False
+        self._active = False
+        self._header_field = b""
+        self._header_value = b""
+        self._headers: Dict[bytes, bytes] = {}
+        self.parser = multipart.MultipartParser(
+            boundary,
+            {
+                "on_part_begin": self._on_part_begin,
+                "on_header_field": self._on_header_field,
+                "on_header_value": self._on_header_value,
+                "on_header_end": self._on_header_end,
+                "on_headers_finished": self._on_headers_finished,
+                "on_part_data": self._on_part_data,
+                "on_part_end": self._on_part_end,
+            },
+        )
+
+    def _on_part_begin(self) -> None:
+        self._headers = {}
+
+    def _on_header_field(self, data: bytes, start: int, end: int) -> None:
+        self._header_field += data[start:end]
+
+    def _on_header_value(self, data: bytes, start: int, end: int) -> None:
+        self._header_value += data[start:end]
+
+    def _on_header_end(self) -> None:
+        self._headers[self._header_field.lower()] = self._header_value
+        self._header_field = self._header_value = b""
+
+    def _on_headers_finished(self) -> None:
+        _, options = parse_options_header(self._headers.get(b"content-disposition", b""))
+        if self.found or options.get(b"name", b"").decode("latin-1") != self.field:
+            return
+        self.found = self._active = True
+        filename = options.get(b"filename")
+        self.filename = filename.decode("utf-8", "replace") if filename is not None else None
+        self.content_type = self._headers.get(b"content-type", b"").decode("latin-1") or None
+
+    def _on_part_data(self, data: bytes, start: int, end: int) -> None:
+        if self._active:
+            self.data += data[start:end]
+
+    def _on_part_end(self) -> None:
+        if self._active:
+            self._active = False
+            self.finished = True
+
+
+async def receive_upload(
+    request: Request, target: Path, *, field: str = "file", max_bytes: Optional[int] = None
+) -> StoredUpload:
+    """
+    multipart/form-data 요청의 파일 필드(field)를 target에 저장합니다.
+    - Content-Length가 상한(기본 MAX_UPLOAD_BYTES)보다 크면 본문을 읽기 전에 UploadTooLargeError를 냅니다.
+    - Starlette의 폼 파싱(임시 파일 스풀)을 거치지 않고 request.stream()을 직접 파싱해,
+      받은 바이트를 UPLOAD_CHUNK_SIZE씩 한 번만 임시 파일에 쓰면서 SHA-256을 계산한 뒤 target으로 rename합니다.
+    - 받는 도중 상한을 넘으면 그 자리에서 멈추고 임시 파일을 지웁니다. (Content-Length 없는 chunked 요청도 동일)
+    - 디스크 작업은 전용 스레드 수(UPLOAD_IO_CONCURRENCY) 안에서만 실행되어,
+      동시 업로드가 많아도 이벤트 루프나 다른 요청이 쓰는 기본 스레드풀을 막지 않습니다.
+    multipart 본문이 아니거나 파일 필드가 없으면 UploadFormError
+    """
+    limit = settings.MAX_UPLOAD_BYTES if max_bytes is None else max_bytes
+    body_limit = limit + MULTIPART_OVERHEAD_BYTES
+    content_type, params = parse_options_header(request.headers.get("content-type", ""))
+    boundary = params.get(b"boundary")
+    if content_type != b"multipart/form-data" or not boundary:
+        raise UploadFormError("multipart/form-data body required")
+    content_length = request.headers.get("content-length", "")
+    if content_length.isdigit() and int(content_length) > body_limit:
+        raise UploadTooLargeError(limit)
+
+    form = _FilePartParser(boundary, field)
+    limiter = _get_io_limiter()
+    digest = hashlib.sha256()
+    received = size = 0
+    tmp = target.with_name(f".{target.name}.{os.urandom(4).hex()}.tmp")
+    out = await anyio.to_thread.run_sync(_open_temp, tmp, limiter=limiter)
+    try:
+        async for chunk in request.stream():
+            received += len(chunk)
+            if received > body_limit:
+                raise UploadTooLargeError(limit)
+            form.parser.write(chunk)
+            if size + len(form.data) > limit:
+                raise UploadTooLargeError(limit)
+            if len(form.data) >= UPLOAD_CHUNK_SIZE or (form.finished and form.data):
+                data = bytes(form.data)
+                form.data.clear()
+                size += len(data)
+                await anyio.to_thread.run_sync(_write_chunk, out, digest, data, limiter=limiter)
+        form.parser.finalize()
+        if not form.finished:
+            raise UploadFormError(f"missing file field '{field}'")
+        await anyio.to_thread.run_sync(_commit_temp, out, tmp, target, limiter=limiter)
+    except BaseException:
+        with anyio.CancelScope(shield=True):
+            await anyio.to_thread.run_sync(_discard_temp, out, tmp, limiter=limiter)
+        raise
+    return StoredUpload(path=target, size=size, sha256=digest.hexdigest(), filename=form.filename, content_type=form.content_type)
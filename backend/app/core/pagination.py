@@ -0,0 +1,34 @@
+# app/core/pagination.py
+import base64
+from typing import List
+
+# keyset(커서) 페이지네이션용 커서 인코딩
+# - 커서는 마지막 항목의 정렬 키 값들을 '|'로 이어 붙인 뒤 URL-safe base64로 감싼 문자열입니다.
+# - 클라이언트는 내용을 해석하지 않고 X-Next-Cursor 값을 그대로 다음 요청의 cursor로 보내면 됩니다.
+
+MAX_PAGE_SIZE = 100
+DEFAULT_PAGE_SIZE = 20
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+
+class InvalidCursorError(ValueError):
+    pass
+
+
+def encode_cursor(*values: object) -> str:
+    raw = "|".join(str(v) for v in values)
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str, parts: int) -> List[str]:
+    """
+    커서를 정렬 키 문자열 목록으로 되돌립니다. 형식이 맞지 않으면 InvalidCursorError를 발생시킵니다.
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        values = base64.urlsafe_b64decode(padded.encode("ascii")).decode("utf-8").split("|")
+    except (ValueError, UnicodeError) as e:
+        raise InvalidCursorError("Invalid cursor") from e
+    if len(values) != parts:
+        raise InvalidCursorError("Invalid cursor")
+    return values
@@ -0,0 +1,99 @@
+# app/core/polyline.py
+from typing import Any, Dict, List, Union
+
+import numpy as np
+
+# Google Encoded Polyline 알고리즘을 정밀도 1e-6(약 0.11m)으로 사용합니다. (OSRM의 polyline6와 동일)
+# - 좌표를 정수로 반올림 → 이전 점과의 차이(delta) → zigzag → 5비트 단위 varint → ASCII(63~126)
+# - 결과는 ASCII 바이트라서 bytea에 그대로 저장하고, 응답에는 문자열로 그대로 내보낼 수 있습니다.
+ROUTE_POLYLINE_PRECISION = 6
+
+# int64 delta는 5비트 청크 13개면 충분합니다. (실제 좌표는 최대 6청크)
+_MAX_CHUNKS = 13
+
+PolylineLike = Union[bytes, bytearray, memoryview, str]
+
+# 연속 비트(0x20)가 있는 청크 문자 (63 + 0x20 이상). 나머지 문자는 값 하나의 끝입니다.
+_CONTINUATION_CHARS = bytes(range(63 + 0x20, 256))
+
+
+def encode(latlng: np.ndarray, precision: int = ROUTE_POLYLINE_PRECISION) -> bytes:
+    """
+    (N, 2) [lat, lng] 배열을 encoded polyline 바이트로 변환합니다.
+    """
+    coords = np.asarray(latlng, dtype=np.float64).reshape(-1, 2)
+    if len(coords) == 0:
+        return b""
+
+    ints = np.round(coords * 10.0 ** precision).astype(np.int64)
+    deltas = np.diff(ints, axis=0, prepend=np.zeros((1, 2), dtype=np.int64)).ravel()
+    # zigzag: 음수를 홀수, 양수를 짝수로 매핑합니다. (Google 알고리즘의 ~(v << 1)과 동일)
+    values = ((deltas << 1) ^ (deltas >> 63)).astype(np.uint64)
+
+    chunks = np.ones(len(values), dtype=np.int64)
+    for k in range(1, _MAX_CHUNKS):
+        chunks += values >= np.uint64(1) << np.uint64(5 * k)
+
+    owner = np.repeat(np.arange(len(values)), chunks)
+    starts = np.cumsum(chunks) - chunks
+    within = np.arange(len(owner)) - starts[owner]
+    out = (values[owner] >> (5 * within).astype(np.uint64)) & np.uint64(0x1F)
+    # 마지막 청크를 제외한 나머지에는 연속 비트(0x20)를 붙입니다.
+    out |= np.where(within < chunks[owner] - 1, np.uint64(0x20), np.uint64(0))
+    return (out + np.uint64(63)).astype(np.uint8).tobytes()
+
+
+def count_points(data: PolylineLike) -> int:
+    """
+    디코딩하지 않고 점 수만 셉니다. (값 하나의 끝 문자 수 / 2, 바이트 단위 C 연산이라 1만 점에 0.1ms 안팎)
+    형식 검증은 하지 않습니다.
+    """
+    if isinstance(data, str):
+        data = data.encode("ascii")
+    data = bytes(data)
+    return len(data.translate(None, _CONTINUATION_CHARS)) // 2
+
+
+def decode(data: PolylineLike, precision: int = ROUTE_POLYLINE_PRECISION) -> np.ndarray:
+    """
+    encoded polyline을 (N, 2) [lat, lng] float64 배열로 되돌립니다.
+    형식이 올바르지 않으면 ValueError를 발생시킵니다.
+    """
+    if isinstance(data, str):
+        data = data.encode("ascii")
+    raw = np.frombuffer(data, dtype=np.uint8).astype(np.int64) - 63
+    if len(raw) == 0:
+        return np.empty((0, 2), dtype=np.float64)
+    if raw.min() < 0 or raw.max() > 63:
+        raise ValueError("polyline contains characters outside the encoding range")
+
+    more = (raw & 0x20) != 0
+    if more[-1]:
+        raise ValueError("polyline is truncated")
+    ends = np.flatnonzero(~more)
+    starts = np.concatenate(([0], ends[:-1] + 1))
+    lengths = ends - starts + 1
+    if lengths.max() > _MAX_CHUNKS:
+        raise ValueError("polyline value is too long")
+    if len(ends) % 2:
+        raise ValueError("polyline has an odd number of values")
+
+    within = np.arange(len(raw)) - np.repeat(starts, lengths)
+    values = np.add.reduceat((raw & 0x1F) << (5 * within), starts)
+    deltas = (values >> 1) ^ -(values & 1)
+    return np.cumsum(deltas.reshape(-1, 2), axis=0) / 10.0 ** precision
+
+
+def encode_points(points: List[Dict[str, Any]], precision: int = ROUTE_POLYLINE_PRECISION) -> bytes:
+    """
+    [{"lat": .., "lng": ..}, ...] 경로를 encoded polyline 바이트로 변환합니다.
+    """
+    latlng = np.array([(p["lat"], p["lng"]) for p in points], dtype=np.float64)
+    return encode(latlng, precision)
+
+
+def decode_points(data: PolylineLike, precision: int = ROUTE_POLYLINE_PRECISION) -> List[Dict[str, float]]:
+    """
+    encoded polyline을 [{"lat": .., "lng": ..}, ...] 경로로 되돌립니다. (기존 JSON 응답 형식)
+    """
+    return [{"lat": lat, "lng": lng} for lat, lng in decode(data, precision).tolist()]
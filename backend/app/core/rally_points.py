@@ -0,0 +1,139 @@
+# app/core/rally_points.py
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+from app.core.geo import LocalProjection, RouteLike, route_to_array
+from app.core.simplify import _point_segment_dist2
+
+# 출발점부터 이 거리(m)마다 체크포인트를 둡니다.
+CHECKPOINT_INTERVAL_M = 500.0
+# 진행 방향이 이 각도(도) 이상 꺾이는 꼭짓점을 회전 지점으로 봅니다.
+TURN_ANGLE_DEG = 60.0
+# 랠리 포인트끼리 이보다 가까우면(경로 거리 기준) 뒤의 회전 지점은 버립니다.
+MIN_RALLY_SPACING_M = 100.0
+# 러닝 경로(샘플 사이 선분)가 랠리 포인트의 이 반경(m) 안을 지나면 통과로 봅니다.
+RALLY_RADIUS_M = 30.0
+# 사전 검증에서 통과해야 하는 랠리 포인트 비율. 이보다 적으면 유사도 계산 없이 0점입니다.
+MIN_RALLY_PASS_RATIO = 0.8
+
+# 랠리 포인트 type
+RALLY_START = "start"
+RALLY_CHECKPOINT = "checkpoint"
+RALLY_TURN = "turn"
+RALLY_FINISH = "finish"
+
+
+def generate_rally_points(route: RouteLike) -> List[Dict[str, Any]]:
+    """
+    (단순화된) 코스 경로에서 랠리 포인트 목록을 만듭니다. 경로를 한 번만 훑는 벡터 연산입니다.
+    - start / finish: 경로의 첫 점과 마지막 점
+    - checkpoint: 누적 거리 CHECKPOINT_INTERVAL_M마다 경로 위의 점 (보간)
+    - turn: 진행 방향이 TURN_ANGLE_DEG 이상 바뀌는 꼭짓점 (다른 랠리 포인트와 MIN_RALLY_SPACING_M 이상 떨어진 것만)
+    각 항목: {"order", "type", "lat", "lng", "distance_m"} (order는 경로 진행 순서)
+    """
+    latlng = route_to_array(route)
+    if len(latlng) < 2:
+        return []
+
+    xy = LocalProjection.for_points(latlng).forward(latlng)
+    delta = np.diff(xy, axis=0)
+    seg_len = np.hypot(delta[:, 0], delta[:, 1])
+    cum = np.concatenate(([0.0], np.cumsum(seg_len)))
+    total = float(cum[-1])
+
+    # 체크포인트: 누적 거리로 위도/경도를 각각 보간합니다. (같은 누적 거리가 반복되는 정지 구간은 첫 점 기준)
+    marks = np.arange(CHECKPOINT_INTERVAL_M, total - MIN_RALLY_SPACING_M, CHECKPOINT_INTERVAL_M)
+    cum_unique, first = np.unique(cum, return_index=True)
+    checkpoint_latlng = np.column_stack(
+        (np.interp(marks, cum_unique, latlng[first, 0]), np.interp(marks, cum_unique, latlng[first, 1]))
+    )
+
+    # 회전 지점: 길이가 0인 구간을 빼고 이웃한 구간 사이의 방향 변화를 계산합니다.
+    moving = np.flatnonzero(seg_len > 0)
+    heading = np.degrees(np.arctan2(delta[moving, 1], delta[moving, 0]))
+    change = (np.diff(heading) + 180.0) % 360.0 - 180.0
+    vertex = moving[1:]  # 구간 moving[i]와 moving[i+1] 사이의 꼭짓점
+    turn_idx = vertex[np.abs(change) >= TURN_ANGLE_DEG]
+    turn_dist = cum[turn_idx]
+    # 체크포인트/출발/도착과 가까운 회전 지점, 바로 앞 회전 지점과 가까운 회전 지점은 버립니다.
+    anchors = np.concatenate(([0.0], marks, [total]))
+    nearest = np.abs(turn_dist[:, None] - anchors[None, :]).min(axis=1)
+    spaced = np.diff(turn_dist, prepend=-np.inf) >= MIN_RALLY_SPACING_M
+    turn_idx = turn_idx[(nearest >= MIN_RALLY_SPACING_M) & spaced]
+
+    kinds = (
+        [RALLY_START]
+        + [RALLY_CHECKPOINT] * len(marks)
+        + [RALLY_TURN] * len(turn_idx)
+        + [RALLY_FINISH]
+    )
+    points = np.vstack((latlng[:1], checkpoint_latlng, latlng[turn_idx], latlng[-1:]))
+    distances = np.concatenate(([0.0], marks, cum[turn_idx], [total]))
+    order = np.argsort(distances, kind="stable")
+    return [
+        {
+            "order": rank,
+            "type": kinds[i],
+            "lat": float(points[i, 0]),
+            "lng": float(points[i, 1]),
+            "distance_m": round(float(distances[i]), 1),
+        }
+        for rank, i in enumerate(order.tolist())
+    ]
+
+
+@dataclass
+class RallyCheck:
+    """
+    랠리 포인트 사전 검증 결과
+    """
+    total: int
+    passed: int
+    missed: List[int] = field(default_factory=list)  # 통과하지 못한 랠리 포인트의 order
+
+    @property
+    def ratio(self) -> float:
+        return self.passed / self.total if self.total else 1.0
+
+    @property
+    def ok(self) -> bool:
+        return self.ratio >= MIN_RALLY_PASS_RATIO
+
+
+def check_rally_points(rally_points: Optional[List[Dict[str, Any]]], route: RouteLike) -> RallyCheck:
+    """
+    러닝 경로가 랠리 포인트들을 순서대로 지났는지 확인합니다. (랠리 포인트 k개에 대해 k번의 벡터 탐색)
+    거리는 샘플 점이 아니라 샘플 사이 선분까지 재므로, 샘플 간격이 반경보다 넓어도(빠른 구간, 낮은 기록 주기)
+    포인트 옆을 지나간 것을 놓치지 않습니다.
+    각 랠리 포인트는 앞 랠리 포인트를 통과한 선분 이후에서만 찾으므로, 출발점과 도착점이 같은
+    순환 코스나 역주행도 구분됩니다. 통과하지 못한 포인트는 건너뛰고 다음 포인트를 계속 찾습니다.
+    """
+    if not rally_points:
+        return RallyCheck(total=0, passed=0)
+    latlng = route_to_array(route)
+    rally = sorted(rally_points, key=lambda p: p.get("order", 0))
+    if len(latlng) == 0:
+        return RallyCheck(total=len(rally), passed=0, missed=[p.get("order", i) for i, p in enumerate(rally)])
+
+    rally_latlng = np.array([(p["lat"], p["lng"]) for p in rally], dtype=np.float64)
+    projection = LocalProjection.for_points(rally_latlng)
+    run_xy = projection.forward(latlng)
+    if len(run_xy) == 1:
+        run_xy = np.vstack([run_xy, run_xy])  # 점 하나짜리 기록은 길이 0인 선분으로 취급
+    rally_xy = projection.forward(rally_latlng)
+
+    passed = 0
+    missed: List[int] = []
+    position = 0  # 앞 랠리 포인트를 통과한 선분 번호
+    for i, target in enumerate(rally_xy):
+        a, b = run_xy[position:-1], run_xy[position + 1:]
+        dist2 = _point_segment_dist2(np.broadcast_to(target, a.shape), a, b)
+        hits = np.flatnonzero(dist2 <= RALLY_RADIUS_M ** 2)
+        if len(hits):
+            passed += 1
+            position += int(hits[0])
+        else:
+            missed.append(rally[i].get("order", i))
+    return RallyCheck(total=len(rally), passed=passed, missed=missed)
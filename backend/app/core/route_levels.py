@@ -0,0 +1,88 @@
+# app/core/route_levels.py
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+import numpy as np
+
+from geoalchemy2 import WKTElement
+from sqlalchemy import func, inspect
+
+from app.core import polyline
+from app.core.executor import route_executor
+from app.core.run_metrics import RunMetrics, compute_run_metrics, samples_to_array
+from app.core.simplify import simplify_levels
+from app.models.route import ROUTE_MAP_POINTS, ROUTE_THUMB_POINTS, SRID_WGS84, RouteMixin
+
+# 이보다 짧은 polyline(약 250점 이하)은 풀에 보내는 비용과 비슷해 이벤트 루프에서 바로 계산합니다. (수 ms)
+INLINE_MAX_BYTES = 1024
+# 완료 처리도 같은 기준으로, 이보다 적은 샘플(1Hz 기준 약 4분)은 이벤트 루프에서 바로 계산합니다.
+INLINE_MAX_SAMPLES = 256
+
+# (route_thumb, route_map, 시작점 (lat, lng), 영역 (lat_min, lng_min, lat_max, lng_max))
+RouteLevels = Tuple[bytes, bytes, Tuple[float, float], Tuple[float, float, float, float]]
+# (서버가 계산한 지표, 그 경로의 polyline, 경로 단계)
+FinishedRun = Tuple[RunMetrics, bytes, Optional[RouteLevels]]
+# 요청의 샘플 목록([{"t", "lat", "lng", "alt"?}, ...]) 또는 저장된 묶음을 합친 (N, 4) 배열
+RawSamples = Union[List[Dict[str, Any]], np.ndarray]
+
+
+def build_route_levels(encoded: Optional[bytes]) -> Optional[RouteLevels]:
+    """
+    저장된 경로에서 점 수를 줄인 단계와 시작점/영역을 만듭니다. 빈 경로면 None (긴 경로는 route_executor 워커에서 실행)
+    1만 점 이상이면 디코딩/단순화에 수십~수백 ms가 걸리므로 요청 처리 중 이벤트 루프에서 부르지 않습니다.
+    """
+    latlng = polyline.decode(bytes(encoded) if encoded else b"")
+    if len(latlng) == 0:
+        return None
+    thumb, map_level = simplify_levels(latlng, (ROUTE_THUMB_POINTS, ROUTE_MAP_POINTS))
+    lat, lng = latlng[0].tolist()
+    (lat_min, lng_min), (lat_max, lng_max) = latlng.min(axis=0).tolist(), latlng.max(axis=0).tolist()
+    return polyline.encode(thumb), polyline.encode(map_level), (lat, lng), (lat_min, lng_min, lat_max, lng_max)
+
+
+def build_finished_run(samples: RawSamples, weight_kg: Optional[float], avg_cadence: Optional[int]) -> FinishedRun:
+    """
+    완료된 러닝의 원시 샘플로 지표, 경로 polyline, 경로 단계를 한 번에 계산합니다. (긴 기록은 route_executor 워커에서 실행)
+    2만 샘플이면 배열 변환 + 지표 계산만 수십 ms라 경로 단계와 함께 한 작업으로 이벤트 루프 밖에서 처리합니다.
+    """
+    raw = samples_to_array(samples) if isinstance(samples, list) else samples
+    metrics = compute_run_metrics(raw, weight_kg=weight_kg, avg_cadence=avg_cadence)
+    encoded = polyline.encode(metrics.latlng)
+    return metrics, encoded, build_route_levels(encoded)
+
+
+async def compute_finished_run(
+    samples: RawSamples, *, weight_kg: Optional[float] = None, avg_cadence: Optional[int] = None
+) -> FinishedRun:
+    """
+    build_finished_run을 샘플 수에 따라 이벤트 루프나 executor에서 실행합니다.
+    (대기열이 가득 차면 ExecutorSaturatedError, 시간 초과 시 ExecutorTimeoutError)
+    """
+    if len(samples) <= INLINE_MAX_SAMPLES:
+        return build_finished_run(samples, weight_kg, avg_cadence)
+    return await route_executor.run(build_finished_run, samples, weight_kg, avg_cadence)
+
+
+def set_route_levels(db_obj: RouteMixin, levels: Optional[RouteLevels]) -> None:
+    """
+    계산해 둔 경로 단계와 시작점/영역을 객체에 채웁니다. 빈 경로(None)면 그대로 둡니다.
+    """
+    if levels is None:
+        return
+    db_obj.route_thumb, db_obj.route_map, (lat, lng), (lat_min, lng_min, lat_max, lng_max) = levels
+    db_obj.start_point = WKTElement(f"POINT({lng!r} {lat!r})", srid=SRID_WGS84)
+    db_obj.bbox = func.ST_MakeEnvelope(lng_min, lat_min, lng_max, lat_max, SRID_WGS84)
+
+
+async def apply_route_levels(db_obj: RouteMixin) -> None:
+    """
+    route_polyline이 바뀐 객체(러닝/코스)의 경로 단계와 시작점/영역을 채웁니다. 커밋 전에 crud에서 호출합니다.
+    (대기열이 가득 차면 ExecutorSaturatedError, 시간 초과 시 ExecutorTimeoutError)
+    """
+    if not inspect(db_obj).attrs.route_polyline.history.has_changes():
+        return
+    encoded = db_obj.route_polyline
+    if not encoded or len(encoded) <= INLINE_MAX_BYTES:
+        levels = build_route_levels(encoded)
+    else:
+        levels = await route_executor.run(build_route_levels, bytes(encoded))
+    set_route_levels(db_obj, levels)
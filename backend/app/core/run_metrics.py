@@ -0,0 +1,261 @@
+# app/core/run_metrics.py
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from app.core.geo import haversine_array
+
+# 원시 GPS 샘플 배열의 열 순서는 [t(초), lat, lng, alt(m, 없으면 NaN)]입니다.
+
+# 한 샘플 구간의 속도가 이 값을 넘으면 GPS 튐으로 보고 거리에서 뺍니다. (약 1분 23초/km)
+MAX_RUNNING_SPEED_MPS = 12.0
+# 이보다 느리면 멈춘 것으로 봅니다. (moving_time에서 제외)
+MIN_MOVING_SPEED_MPS = 0.5
+# 샘플 간격이 이보다 길면 일시정지로 보고 움직인 시간에서 제외합니다.
+MAX_SAMPLE_GAP_SECONDS = 10.0
+# GPS 고도 노이즈를 줄이기 위한 이동평균 창 크기(샘플 수, 1Hz 기준 약 15초)
+ALTITUDE_SMOOTHING_WINDOW = 15
+# 실시간 현재 페이스를 계산하는 최근 구간 길이(움직인 시간 기준)
+CURRENT_PACE_WINDOW_SECONDS = 30.0
+# 응답/저장용 차트 데이터 최대 점 수
+MAX_CHART_POINTS = 200
+# 체중 정보가 없을 때 쓰는 값 (클라이언트 RunningCalculatorService와 동일)
+DEFAULT_WEIGHT_KG = 65.0
+
+# 페이스(분/km) 상한별 MET 값 (클라이언트 RunningCalculatorService._getMET와 동일한 표)
+_MET_PACE_LIMITS = np.array([4.5, 5.0, 5.5, 6.0, 7.0])
+_MET_VALUES = np.array([14.0, 12.5, 11.5, 10.5, 9.0, 7.0])
+
+
+@dataclass
+class RunMetrics:
+    """
+    원시 GPS 샘플에서 계산한 러닝 기록 지표
+    """
+    distance: float              # m
+    duration: float              # 첫 샘플 ~ 마지막 샘플 (s)
+    moving_time: float           # 멈춘 구간/일시정지를 뺀 시간 (s)
+    avg_pace: float              # moving_time 기준 초/km
+    total_elevation_gain: Optional[float]  # m (샘플에 고도가 없으면 None)
+    calories_burned: float
+    splits: List[Dict[str, Any]]
+    chart_data: List[Dict[str, Any]]
+    latlng: np.ndarray           # 정렬/중복 제거된 경로 (N, 2)
+
+
+def samples_to_array(samples: List[Dict[str, Any]]) -> np.ndarray:
+    """
+    [{"t", "lat", "lng", "alt"?}, ...] 샘플 목록을 (N, 4) 배열로 바꿉니다. 고도가 없으면 NaN입니다.
+    """
+    rows = [
+        (s["t"], s["lat"], s["lng"], np.nan if s.get("alt") is None else s["alt"]) for s in samples
+    ]
+    return np.array(rows, dtype=np.float64).reshape(-1, 4)
+
+
+def pack_samples(samples: np.ndarray) -> bytes:
+    """
+    (N, 4) 샘플 배열을 저장용 바이트(float64 리틀엔디언)로 바꿉니다. (점당 32바이트, 파싱 비용 없음)
+    """
+    return np.ascontiguousarray(samples, dtype="<f8").tobytes()
+
+
+def unpack_samples(data: bytes) -> np.ndarray:
+    """
+    pack_samples로 저장한 바이트를 (N, 4) 배열로 되돌립니다.
+    """
+    return np.frombuffer(data, dtype="<f8").reshape(-1, 4)
+
+
+def _met_for_pace(pace_sec_per_km: np.ndarray) -> np.ndarray:
+    minutes_per_km = pace_sec_per_km / 60.0
+    met = _MET_VALUES[np.searchsorted(_MET_PACE_LIMITS, minutes_per_km, side="left")]
+    return np.where(pace_sec_per_km > 0, met, 0.0)
+
+
+def _elevation_gain_series(alt: np.ndarray) -> np.ndarray:
+    """
+    각 샘플까지의 누적 상승 고도(m)를 계산합니다. 고도가 없는 샘플은 앞뒤 값으로 채웁니다.
+    """
+    valid = ~np.isnan(alt)
+    if valid.sum() < 2:
+        return np.zeros(len(alt))
+    idx = np.arange(len(alt))
+    filled = np.interp(idx, idx[valid], alt[valid])
+
+    window = min(ALTITUDE_SMOOTHING_WINDOW, len(filled))
+    padded = np.pad(filled, (window // 2, window - 1 - window // 2), mode="edge")
+    smoothed = np.convolve(padded, np.ones(window) / window, mode="valid")
+
+    climb = np.diff(smoothed, prepend=smoothed[0])
+    return np.cumsum(np.clip(climb, 0.0, None))
+
+
+def _segments(t: np.ndarray, latlng: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    연속한 샘플 사이 구간마다 (인정 거리(m), 움직인 시간(s))을 계산합니다. t는 순증가해야 합니다.
+    """
+    dt = np.diff(t)
+    seg = haversine_array(latlng[:-1], latlng[1:])
+    speed = seg / dt
+    seg = np.where(speed <= MAX_RUNNING_SPEED_MPS, seg, 0.0)
+    moving = (speed >= MIN_MOVING_SPEED_MPS) & (speed <= MAX_RUNNING_SPEED_MPS) & (dt <= MAX_SAMPLE_GAP_SECONDS)
+    return seg, np.where(moving, dt, 0.0)
+
+
+def _interp_at(x: np.ndarray, xp: np.ndarray, fp: np.ndarray) -> np.ndarray:
+    # xp(누적 거리)는 멈춘 동안 같은 값이 반복될 수 있으므로 처음 도달한 시점을 기준으로 보간합니다.
+    xp_unique, first = np.unique(xp, return_index=True)
+    return np.interp(x, xp_unique, fp[first])
+
+
+def compute_run_metrics(
+    samples: np.ndarray,
+    *,
+    weight_kg: Optional[float] = None,
+    avg_cadence: Optional[int] = None,
+) -> RunMetrics:
+    """
+    원시 GPS 샘플 (N, 4) [t, lat, lng, alt] 배열을 한 번 훑어 지표를 계산합니다. (파이썬 루프 없이 벡터 연산)
+    - 거리: 샘플 간 haversine 합, 비현실적인 속도의 구간은 제외
+    - moving_time: 멈춤/일시정지 구간을 뺀 시간
+    - splits: 1km 지점 통과 시각을 보간해 계산 (클라이언트 splits 형식)
+    - chart_data: 최대 MAX_CHART_POINTS개로 줄인 구간 페이스 시계열 (클라이언트 chart_data 형식)
+    - calories: 구간 페이스별 MET × 체중 × 시간 (클라이언트와 같은 MET 표)
+    """
+    samples = np.asarray(samples, dtype=np.float64).reshape(-1, 4)
+    # 시간 순으로 정렬하고 같은 시각의 중복 샘플은 하나만 남깁니다.
+    samples = samples[np.argsort(samples[:, 0], kind="stable")]
+    _, keep = np.unique(samples[:, 0], return_index=True)
+    samples = samples[keep]
+
+    t, latlng, alt = samples[:, 0], samples[:, 1:3], samples[:, 3]
+    if len(samples) < 2:
+        return RunMetrics(0.0, 0.0, 0.0, 0.0, None, 0.0, [], [], latlng)
+
+    seg, moving_dt = _segments(t, latlng)
+
+    # 샘플별 누적 값 (첫 샘플은 0)
+    cum_dist = np.concatenate(([0.0], np.cumsum(seg)))
+    cum_moving = np.concatenate(([0.0], np.cumsum(moving_dt)))
+    cum_gain = _elevation_gain_series(alt)
+
+    distance = float(cum_dist[-1])
+    moving_time = float(cum_moving[-1])
+    duration = float(t[-1] - t[0])
+    avg_pace = moving_time / (distance / 1000) if distance > 0 else 0.0
+
+    # 칼로리: 움직인 구간마다 그 구간 페이스의 MET를 적용합니다.
+    weight = weight_kg if weight_kg and weight_kg > 0 else DEFAULT_WEIGHT_KG
+    with np.errstate(divide="ignore", invalid="ignore"):
+        seg_pace = np.where(seg > 0, moving_dt / (seg / 1000), 0.0)
+    calories = float(np.sum(_met_for_pace(seg_pace) * weight * moving_dt / 3600.0))
+
+    # splits: k km 지점을 지난 시각(움직인 시간 기준)과 누적 상승을 보간합니다.
+    full_km = int(distance // 1000)
+    splits: List[Dict[str, Any]] = []
+    if full_km > 0:
+        marks = np.arange(0, full_km + 1) * 1000.0
+        time_at = _interp_at(marks, cum_dist, cum_moving)
+        gain_at = _interp_at(marks, cum_dist, cum_gain)
+        split_time = np.diff(time_at)
+        split_gain = np.diff(gain_at)
+        splits = [
+            {
+                "split": k + 1,
+                "pace": round(float(split_time[k]), 1),
+                "cumulative_time": round(float(time_at[k + 1]), 1),
+                "time": round(float(split_time[k]), 1),
+                "cadence": avg_cadence or 0,
+                "elevation": round(float(split_gain[k]), 1),
+            }
+            for k in range(full_km)
+        ]
+
+    # chart_data: 샘플을 균등한 간격으로 골라 직전 선택 지점과의 구간 페이스를 계산합니다.
+    n_points = min(MAX_CHART_POINTS, len(samples))
+    picks = np.unique(np.linspace(0, len(samples) - 1, n_points).round().astype(np.int64))
+    d_dist = np.diff(cum_dist[picks], prepend=0.0)
+    d_time = np.diff(cum_moving[picks], prepend=0.0)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        pace = np.where(d_dist > 0, d_time / (d_dist / 1000), 0.0)
+    chart_data = [
+        {"time": round(tm, 1), "pace": round(pc, 1), "lat": la, "lng": ln, "distance": round(ds, 1)}
+        for tm, pc, (la, ln), ds in zip(
+            cum_moving[picks].tolist(), pace.tolist(), latlng[picks].tolist(), cum_dist[picks].tolist()
+        )
+    ]
+
+    return RunMetrics(
+        distance=distance,
+        duration=duration,
+        moving_time=moving_time,
+        avg_pace=avg_pace,
+        total_elevation_gain=float(cum_gain[-1]) if not np.isnan(alt).all() else None,
+        calories_burned=calories,
+        splits=splits,
+        chart_data=chart_data,
+        latlng=latlng,
+    )
+
+
+class LiveRunAccumulator:
+    """
+    실시간 트래킹용 누적 계산기. 샘플 묶음이 들어올 때마다 그 묶음만 벡터 연산으로 처리해
+    compute_run_metrics와 같은 규칙(튐 제거/멈춤 제외)으로 누적 거리와 움직인 시간을 갱신합니다.
+    이미 받은 시각 이전의 샘플(재전송/순서 뒤바뀜)은 무시합니다.
+    """
+
+    def __init__(self) -> None:
+        self.distance = 0.0
+        self.moving_time = 0.0
+        self.point_count = 0
+        self._last: Optional[np.ndarray] = None  # 마지막 샘플 [t, lat, lng, alt]
+        # 현재 페이스 계산용 최근 (움직인 시간 누적, 거리 누적)
+        self._recent = np.empty((0, 2), dtype=np.float64)
+
+    def add(self, samples: np.ndarray) -> None:
+        samples = np.asarray(samples, dtype=np.float64).reshape(-1, 4)
+        samples = samples[np.argsort(samples[:, 0], kind="stable")]
+        _, keep = np.unique(samples[:, 0], return_index=True)
+        samples = samples[keep]
+        if self._last is not None:
+            samples = samples[samples[:, 0] > self._last[0]]
+        if len(samples) == 0:
+            return
+
+        chain = samples if self._last is None else np.vstack((self._last, samples))
+        seg, moving_dt = _segments(chain[:, 0], chain[:, 1:3])
+        cum_dist = self.distance + np.cumsum(seg)
+        cum_moving = self.moving_time + np.cumsum(moving_dt)
+        if len(seg):
+            self.distance = float(cum_dist[-1])
+            self.moving_time = float(cum_moving[-1])
+
+        recent = np.vstack((self._recent, np.column_stack((cum_moving, cum_dist))))
+        self._recent = recent[recent[:, 0] >= self.moving_time - CURRENT_PACE_WINDOW_SECONDS]
+        self._last = samples[-1]
+        self.point_count += len(samples)
+
+    @property
+    def avg_pace(self) -> float:
+        return self.moving_time / (self.distance / 1000) if self.distance > 0 else 0.0
+
+    @property
+    def current_pace(self) -> float:
+        if len(self._recent) < 2:
+            return 0.0
+        d_time, d_dist = self._recent[-1] - self._recent[0]
+        return d_time / (d_dist / 1000) if d_dist > 0 else 0.0
+
+    def totals(self) -> Dict[str, Any]:
+        last = self._last
+        return {
+            "distance": round(self.distance, 1),
+            "moving_time": round(self.moving_time, 1),
+            "avg_pace": round(self.avg_pace, 1),
+            "current_pace": round(self.current_pace, 1),
+            "point_count": self.point_count,
+            "last_point": None if last is None else {"t": float(last[0]), "lat": float(last[1]), "lng": float(last[2])},
+        }
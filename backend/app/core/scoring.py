@@ -0,0 +1,36 @@
+# app/core/scoring.py
+from typing import Any, Dict, List, Optional
+
+from app import models
+from app.core.config import settings
+from app.core.executor import scoring_executor
+from app.core.geo import RouteLike
+from app.core.rally_points import check_rally_points
+from app.core.similarity import calculate_similarity_score
+
+
+def score_route(
+    course_route: RouteLike,
+    run_route: RouteLike,
+    rally_points: Optional[List[Dict[str, Any]]],
+    engine: str,
+) -> float:
+    """
+    랠리 포인트 사전 검증 후 유사도 점수를 계산합니다. (scoring_executor 워커에서 실행)
+    랠리 포인트를 충분히 지나지 않은 기록은 전체 유사도 계산 없이 0점입니다.
+    """
+    if rally_points and not check_rally_points(rally_points, run_route).ok:
+        return 0.0
+    return calculate_similarity_score(course_route, run_route, engine)
+
+
+async def score_attempt(course: models.Course, run: models.Run) -> float:
+    """
+    러닝 기록(run)이 코스(course)를 얼마나 따라갔는지 점수(0.0 ~ 1.0)를 계산합니다.
+    CPU 작업이므로 이벤트 루프를 막지 않도록 scoring_executor에서 실행합니다.
+    (대기열이 가득 차면 ExecutorSaturatedError, 시간 초과 시 ExecutorTimeoutError)
+    경로는 인코딩된 polyline 바이트 그대로 넘겨 워커 쪽에서 디코딩합니다. (pickle 비용 최소화)
+    """
+    return await scoring_executor.run(
+        score_route, course.route_polyline, run.route_polyline, course.rally_points, settings.SIMILARITY_ENGINE
+    )
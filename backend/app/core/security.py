@@ -1,9 +1,15 @@
 from datetime import datetime, timedelta, timezone
+from typing import Optional, Tuple
 from passlib.context import CryptContext
 from jose import JWTError, jwt
 from app.core.config import settings
+from app.core.executor import password_executor
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+# rounds(작업량)를 바꾸면 기존 해시는 needs_update 대상이 되어, 다음 로그인 성공 때 새 설정으로 다시 저장됩니다.
+pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto", bcrypt__rounds=settings.PASSWORD_BCRYPT_ROUNDS)
+
+# 비밀번호로 로그인할 수 없는 계정(카카오 등 소셜 가입)의 hashed_password 값. 어떤 해시 형식과도 겹치지 않습니다.
+UNUSABLE_PASSWORD = "!"
 
 def get_password_hash(password: str) -> str:
     """
@@ -17,6 +23,26 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
     """
     return pwd_context.verify(plain_password, hashed_password)
 
+def is_password_usable(hashed_password: Optional[str]) -> bool:
+    return bool(hashed_password) and not hashed_password.startswith(UNUSABLE_PASSWORD)
+
+async def hash_password(password: str) -> str:
+    """
+    get_password_hash를 password_executor에서 실행합니다. (bcrypt 한 번에 수백 ms라 이벤트 루프에서 돌리지 않음)
+    대기열이 가득 차면 ExecutorSaturatedError, 시간 초과 시 ExecutorTimeoutError
+    """
+    return await password_executor.run(get_password_hash, password)
+
+async def verify_password_async(plain_password: str, hashed_password: Optional[str]) -> Tuple[bool, Optional[str]]:
+    """
+    비밀번호를 password_executor에서 확인하고 (일치 여부, 새 해시)를 반환합니다.
+    - 새 해시는 일치했고 저장된 해시의 설정(rounds 등)이 현재와 다를 때만 있습니다. (호출한 쪽이 저장)
+    - 로그인할 수 없는 계정(UNUSABLE_PASSWORD)은 해싱 없이 (False, None)
+    """
+    if not is_password_usable(hashed_password):
+        return False, None
+    return await password_executor.run(pwd_context.verify_and_update, plain_password, hashed_password)
+
 def create_access_token(data: dict, expires_delta: timedelta | None = None) -> str:
     """
     주어진 데이터로 JWT 액세스 토큰을 생성합니다.
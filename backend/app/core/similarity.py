@@ -1,5 +1,27 @@
 import math
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional, Sequence
+
+import numpy as np
+
+from app.core.geo import RouteLike, project_route, route_to_array
+
+# 사용 가능한 유사도 계산 엔진
+# - "vectorized": 평면 투영 + 선분 격자 인덱스 + NumPy 일괄 계산 (기본값)
+# - "naive": 기존 V1 구현 (모든 점 쌍에 대해 haversine 계산, 비교/검증용)
+SIMILARITY_ENGINES = ("vectorized", "naive")
+
+# 평균 이탈 거리가 이 값(m) 이상이면 0점입니다.
+MAX_AVERAGE_DEVIATION_M = 50.0
+
+# 격자 단계별 셀 한 변의 길이(m). 작은 셀부터 조회하고, 셀 크기보다 멀리 있는 점만 다음 단계로 넘깁니다.
+# 마지막 단계보다도 멀리 있는 점은 전체 선분과 비교합니다.
+DEFAULT_CELL_SIZES_M = (10.0, 80.0, 640.0)
+
+# 한 선분이 차지할 수 있는 최대 셀 수. 이보다 긴 선분(GPS 끊김 등)은 격자에 넣지 않고 별도로 검사합니다.
+_MAX_CELLS_PER_SEGMENT = 4096
+
+# 한 번에 처리할 (점, 선분) 쌍의 최대 개수 (메모리 사용량 상한)
+_PAIR_BLOCK_SIZE = 1 << 20
 
 def haversine_distance(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
     """
@@ -18,15 +40,189 @@ def haversine_distance(lat1: float, lon1: float, lat2: float, lon2: float) -> fl
 
     return R * c
 
-def calculate_similarity_score(original_route: List[Dict[str, Any]], user_route: List[Dict[str, Any]]) -> float:
+
+class _SegmentGrid:
     """
-    V1: 간단한 경로 유사도 계산 알고리즘
-    - 각 사용자 경로 점이 원본 경로에서 얼마나 벗어났는지 평균 거리를 계산합니다.
-    - 평균 이탈 거리가 적을수록 높은 점수를 부여합니다.
+    선분들을 (경계 상자 + 셀 크기)만큼 확장한 영역의 모든 셀에 등록한 균일 격자입니다.
+    어떤 점에서 cell_size 이내에 있는 선분은 그 점이 속한 셀 하나만 보면 모두 찾을 수 있습니다.
     """
-    if not original_route or not user_route:
-        return 0.0
 
+    def __init__(self, seg_lo: np.ndarray, seg_hi: np.ndarray, cell_size: float) -> None:
+        self.cell_size = cell_size
+        lo = seg_lo - cell_size
+        hi = seg_hi + cell_size
+        self.origin = lo.min(axis=0)
+        cell_lo = np.floor((lo - self.origin) / cell_size).astype(np.int64)
+        cell_hi = np.floor((hi - self.origin) / cell_size).astype(np.int64)
+        self.nx = int(cell_hi[:, 0].max()) + 1
+        self.ny = int(cell_hi[:, 1].max()) + 1
+
+        span = cell_hi - cell_lo + 1
+        n_cells = span[:, 0] * span[:, 1]
+        is_long = n_cells > _MAX_CELLS_PER_SEGMENT
+        self.long_segments = np.flatnonzero(is_long)
+
+        # 선분 하나가 덮는 모든 셀에 대해 (셀 키, 선분 번호) 쌍을 만들고 셀 키로 정렬합니다.
+        seg_ids = np.flatnonzero(~is_long)
+        counts = n_cells[seg_ids]
+        rep_seg = np.repeat(seg_ids, counts)
+        local = np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts)
+        span_y = span[rep_seg, 1]
+        cx = cell_lo[rep_seg, 0] + local // span_y
+        cy = cell_lo[rep_seg, 1] + local % span_y
+        keys = cx * self.ny + cy
+        order = np.argsort(keys, kind="stable")
+        self.cell_keys = keys[order]
+        self.cell_segments = rep_seg[order]
+
+    def lookup(self, p: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+        """
+        각 점이 속한 셀의 후보 선분 구간 (cell_segments 시작 위치, 개수)을 반환합니다.
+        """
+        cells = np.floor((p - self.origin) / self.cell_size).astype(np.int64)
+        inside = (
+            (cells[:, 0] >= 0) & (cells[:, 0] < self.nx)
+            & (cells[:, 1] >= 0) & (cells[:, 1] < self.ny)
+        )
+        keys = cells[:, 0] * self.ny + cells[:, 1]
+        left = np.searchsorted(self.cell_keys, keys, side="left")
+        counts = np.searchsorted(self.cell_keys, keys, side="right") - left
+        counts[~inside] = 0
+        return left, counts
+
+
+class RouteIndex:
+    """
+    코스 경로의 선분(segment)들에 대한 다단계 균일 격자 공간 인덱스입니다.
+    - 경로를 코스 중심 기준의 평면(m)으로 투영합니다.
+    - 점-선분 거리를 사용하므로 코스 점 간격과 무관하게 정확한 이탈 거리를 구합니다.
+    - 작은 셀 격자에서 찾지 못한(셀 크기보다 먼) 점만 더 큰 셀 격자로, 마지막에는 전체 선분으로 검사합니다.
+    """
+
+    def __init__(self, route: RouteLike, cell_sizes_m: Sequence[float] = DEFAULT_CELL_SIZES_M) -> None:
+        xy, self.projection = project_route(route)
+        if len(xy) == 0:
+            raise ValueError("route must contain at least one point")
+        if len(xy) == 1:
+            xy = np.vstack([xy, xy])  # 점 하나짜리 코스는 길이 0인 선분으로 취급
+
+        self._a = xy[:-1]
+        self._ab = xy[1:] - xy[:-1]
+        self._ab_len2 = np.einsum("ij,ij->i", self._ab, self._ab)
+
+        self._seg_lo = np.minimum(xy[:-1], xy[1:])
+        self._seg_hi = np.maximum(xy[:-1], xy[1:])
+        self._cell_sizes = sorted(float(c) for c in cell_sizes_m)
+        # 큰 셀 격자는 먼 점이 있을 때만 필요하므로 처음 사용할 때 만듭니다.
+        self._grids: Dict[float, _SegmentGrid] = {}
+
+    def _grid(self, cell_size: float) -> _SegmentGrid:
+        grid = self._grids.get(cell_size)
+        if grid is None:
+            grid = self._grids[cell_size] = _SegmentGrid(self._seg_lo, self._seg_hi, cell_size)
+        return grid
+
+    @property
+    def segment_count(self) -> int:
+        return len(self._a)
+
+    def _segment_dist2(self, p: np.ndarray, seg: np.ndarray) -> np.ndarray:
+        """
+        점 p[i]와 선분 seg[i] 사이의 제곱 거리를 계산합니다.
+        """
+        a = self._a[seg]
+        ab = self._ab[seg]
+        ap = p - a
+        len2 = self._ab_len2[seg]
+        t = np.divide(
+            np.einsum("ij,ij->i", ap, ab), len2,
+            out=np.zeros_like(len2), where=len2 > 0,
+        )
+        np.clip(t, 0.0, 1.0, out=t)
+        d = ap - ab * t[:, None]
+        return np.einsum("ij,ij->i", d, d)
+
+    def _brute_min_dist2(self, p: np.ndarray, segments: Optional[np.ndarray] = None) -> np.ndarray:
+        """
+        각 점에 대해 주어진 선분들(기본값: 전체) 중 가장 가까운 선분까지의 제곱 거리를 구합니다.
+        """
+        if segments is None:
+            segments = np.arange(self.segment_count)
+        out = np.full(len(p), np.inf)
+        if len(segments) == 0 or len(p) == 0:
+            return out
+        block = max(1, _PAIR_BLOCK_SIZE // len(segments))
+        for start in range(0, len(p), block):
+            chunk = p[start:start + block]
+            pts = np.repeat(np.arange(len(chunk)), len(segments))
+            segs = np.tile(segments, len(chunk))
+            d2 = self._segment_dist2(chunk[pts], segs).reshape(len(chunk), len(segments))
+            out[start:start + block] = d2.min(axis=1)
+        return out
+
+    def _grid_min_dist2(self, p: np.ndarray, grid: _SegmentGrid) -> np.ndarray:
+        """
+        각 점이 속한 셀에 등록된 선분들(과 격자에 넣지 않은 긴 선분들)만 검사하여 최소 제곱 거리를 구합니다.
+        """
+        out = np.full(len(p), np.inf)
+        left, counts = grid.lookup(p)
+
+        # (점, 후보 선분) 쌍이 너무 많아지지 않도록 점들을 블록 단위로 나눠 처리합니다.
+        cum = np.cumsum(counts)
+        start = 0
+        while start < len(p):
+            base = cum[start - 1] if start else 0
+            end = int(np.searchsorted(cum, base + _PAIR_BLOCK_SIZE, side="right"))
+            end = min(max(end, start + 1), len(p))
+            c = counts[start:end]
+            total = int(c.sum())
+            if total:
+                offsets = np.cumsum(c) - c
+                pts = np.repeat(np.arange(start, end), c)
+                local = np.arange(total) - np.repeat(offsets, c)
+                segs = grid.cell_segments[np.repeat(left[start:end], c) + local]
+                d2 = self._segment_dist2(p[pts], segs)
+                has = c > 0
+                out[start:end][has] = np.minimum.reduceat(d2, offsets[has])
+            start = end
+
+        if len(grid.long_segments):
+            out = np.minimum(out, self._brute_min_dist2(p, grid.long_segments))
+        return out
+
+    def distances(self, points: RouteLike) -> np.ndarray:
+        """
+        각 점에서 코스 경로(선분)까지의 최단 거리(m)를 반환합니다.
+        """
+        xy, _ = project_route(points, self.projection)
+        d2 = np.full(len(xy), np.inf)
+        # 아직 확정되지 않은 점들의 번호
+        pending = np.arange(len(xy))
+        for cell_size in self._cell_sizes:
+            if len(pending) == 0:
+                break
+            grid = self._grid(cell_size)
+            found = self._grid_min_dist2(xy[pending], grid)
+            d2[pending] = found
+            # 셀 크기보다 먼 값은 최솟값이라는 보장이 없으므로 다음 단계에서 다시 검사합니다.
+            pending = pending[found > cell_size ** 2]
+        if len(pending):
+            d2[pending] = self._brute_min_dist2(xy[pending])
+        return np.sqrt(d2)
+
+
+def _score_from_average_deviation(average_deviation: float) -> float:
+    # 점수화: 평균 이탈 거리가 50m 이상이면 0점, 0m이면 1.0점으로 계산합니다.
+    # (이 로직은 나중에 더 정교하게 개선될 수 있습니다.)
+    return max(0.0, 1.0 - (average_deviation / MAX_AVERAGE_DEVIATION_M))
+
+
+def _naive_similarity_score(original_route: List[Dict[str, Any]], user_route: List[Dict[str, Any]]) -> float:
+    """
+    V1: 간단한 경로 유사도 계산 알고리즘
+    - 각 사용자 경로 점이 원본 경로의 '점'들에서 얼마나 벗어났는지 평균 거리를 계산합니다.
+    - O(N·M) 순수 파이썬 계산이므로 긴 경로에서는 매우 느립니다.
+    """
     total_deviation = 0.0
     for user_point in user_route:
         # 사용자의 각 지점에서 원본 경로까지의 가장 짧은 거리를 찾습니다.
@@ -37,12 +233,41 @@ def calculate_similarity_score(original_route: List[Dict[str, Any]], user_route:
             ) for orig_point in original_route
         )
         total_deviation += min_dist_to_original
-    
+
     # 사용자 경로의 모든 점들에 대한 평균 이탈 거리
-    average_deviation = total_deviation / len(user_route)
+    return _score_from_average_deviation(total_deviation / len(user_route))
 
-    # 점수화: 평균 이탈 거리가 50m 이상이면 0점, 0m이면 1.0점으로 계산합니다.
-    # (이 로직은 나중에 더 정교하게 개선될 수 있습니다.)
-    score = max(0.0, 1.0 - (average_deviation / 50.0))
-    
-    return score
\ No newline at end of file
+
+def _vectorized_similarity_score(original_route: RouteLike, user_route: RouteLike) -> float:
+    """
+    V2: 각 사용자 경로 점에서 원본 경로의 '선분'까지의 평균 거리로 점수를 계산합니다.
+    """
+    deviations = RouteIndex(original_route).distances(user_route)
+    return _score_from_average_deviation(float(deviations.mean()))
+
+
+def _as_points(route: RouteLike) -> List[Dict[str, Any]]:
+    if isinstance(route, list):
+        return route
+    return [{"lat": lat, "lng": lng} for lat, lng in route_to_array(route).tolist()]
+
+
+def calculate_similarity_score(
+    original_route: RouteLike,
+    user_route: RouteLike,
+    engine: str = "vectorized",
+) -> float:
+    """
+    원본 코스 경로와 사용자 경로의 유사도 점수(0.0 ~ 1.0)를 계산합니다.
+    - 평균 이탈 거리가 적을수록 높은 점수를 부여합니다.
+    - 경로는 [{"lat", "lng"}, ...] 리스트, encoded polyline 바이트, ndarray 모두 허용합니다.
+    - engine: "vectorized"(기본값) 또는 "naive"
+    """
+    if original_route is None or user_route is None or len(original_route) == 0 or len(user_route) == 0:
+        return 0.0
+
+    if engine == "vectorized":
+        return _vectorized_similarity_score(original_route, user_route)
+    if engine == "naive":
+        return _naive_similarity_score(_as_points(original_route), _as_points(user_route))
+    raise ValueError(f"Unknown similarity engine: {engine!r} (expected one of {SIMILARITY_ENGINES})")
@@ -0,0 +1,135 @@
+# app/core/simplify.py
+from typing import List, Sequence
+
+import numpy as np
+
+from app.core.geo import LocalProjection
+
+# 코스 생성 시 기본 허용 오차(m). GPS 오차(수 m) 수준이라 지도/유사도 계산에서 차이가 보이지 않습니다.
+DEFAULT_TOLERANCE_M = 5.0
+
+
+def _point_segment_dist2(p: np.ndarray, a: np.ndarray, b: np.ndarray) -> np.ndarray:
+    """
+    점 p에서 선분 a-b까지의 제곱 거리 (모두 (N, 2) 평면 좌표, 대응되는 행끼리 계산)
+    """
+    ab = b - a
+    ap = p - a
+    len2 = np.einsum("ij,ij->i", ab, ab)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        t = np.where(len2 > 0, np.einsum("ij,ij->i", ap, ab) / len2, 0.0)
+    closest = a + np.clip(t, 0.0, 1.0)[:, None] * ab
+    d = p - closest
+    return np.einsum("ij,ij->i", d, d)
+
+
+def simplify_indices(latlng: np.ndarray, tolerance_m: float = DEFAULT_TOLERANCE_M) -> np.ndarray:
+    """
+    Ramer–Douglas–Peucker로 남길 점의 번호(오름차순)를 반환합니다. 허용 오차는 미터 단위입니다.
+    - 재귀 대신 "현재 남긴 점들로 나뉜 모든 구간"을 한 번에 처리하는 반복으로 구현했습니다.
+      반복 한 번에 모든 구간의 최대 이탈 점을 벡터 연산으로 찾아 추가하고, 허용 오차 안으로 들어온 구간은 다시 보지 않습니다.
+    - 직선 대신 선분까지의 거리를 쓰므로 출발점으로 돌아오는 순환 코스도 무너지지 않습니다.
+    """
+    latlng = np.asarray(latlng, dtype=np.float64).reshape(-1, 2)
+    n = len(latlng)
+    if n <= 2 or tolerance_m <= 0:
+        return np.arange(n)
+
+    xy = LocalProjection.for_points(latlng).forward(latlng)
+    tol2 = tolerance_m ** 2
+    keep = np.zeros(n, dtype=bool)
+    keep[[0, -1]] = True
+    # 아직 허용 오차 안으로 확정되지 않은 구간에 속한 점들만 다시 계산합니다.
+    active = ~keep
+
+    while True:
+        anchors = np.flatnonzero(keep)
+        points = np.flatnonzero(active)
+        if len(points) == 0:
+            return anchors
+        # 점 번호가 곧 경로 순서이므로 같은 구간(anchors[k] ~ anchors[k + 1])의 점들은 연속해서 나옵니다.
+        segment = np.searchsorted(anchors, points, side="right") - 1
+        dist2 = _point_segment_dist2(xy[points], xy[anchors[segment]], xy[anchors[segment + 1]])
+
+        starts = np.flatnonzero(np.r_[True, segment[1:] != segment[:-1]])
+        group = np.cumsum(np.r_[True, segment[1:] != segment[:-1]]) - 1
+        group_max = np.maximum.reduceat(dist2, starts)
+        split = group_max > tol2
+
+        # 허용 오차를 넘는 구간마다 최대 이탈 점(동률이면 앞쪽)을 남기고, 나머지 구간의 점들은 확정합니다.
+        candidates = np.flatnonzero((dist2 == group_max[group]) & split[group])
+        _, first = np.unique(group[candidates], return_index=True)
+        new_anchors = points[candidates[first]]
+        keep[new_anchors] = True
+        active[points[~split[group]]] = False
+        active[new_anchors] = False
+
+
+def simplify_route(latlng: np.ndarray, tolerance_m: float = DEFAULT_TOLERANCE_M) -> np.ndarray:
+    """
+    경로 (N, 2) [lat, lng] 배열을 단순화한 배열을 반환합니다.
+    """
+    latlng = np.asarray(latlng, dtype=np.float64).reshape(-1, 2)
+    return latlng[simplify_indices(latlng, tolerance_m)]
+
+
+
+def simplify_ranks(latlng: np.ndarray) -> np.ndarray:
+    """
+    각 점의 RDP 중요도(m)를 반환합니다. (양 끝점은 inf)
+    중요도 > tolerance인 점만 남기면 simplify_indices(latlng, tolerance)와 같은 결과이므로,
+    한 번 계산해 두면 여러 단계(점 수)의 단순화를 다시 RDP를 돌리지 않고 고를 수 있습니다.
+    - 점이 추가될 때의 이탈 거리와 그 구간을 만든 점의 중요도 중 작은 값을 씁니다. (자식은 부모보다 중요할 수 없음)
+    - 구간을 만든 점의 중요도는 구간 양 끝점 중요도의 최솟값과 같습니다.
+    """
+    latlng = np.asarray(latlng, dtype=np.float64).reshape(-1, 2)
+    n = len(latlng)
+    rank2 = np.zeros(n)
+    rank2[[0, -1]] = np.inf
+    if n <= 2:
+        return np.sqrt(rank2)
+
+    xy = LocalProjection.for_points(latlng).forward(latlng)
+    keep = np.zeros(n, dtype=bool)
+    keep[[0, -1]] = True
+    active = ~keep
+
+    while True:
+        anchors = np.flatnonzero(keep)
+        points = np.flatnonzero(active)
+        if len(points) == 0:
+            return np.sqrt(rank2)
+        segment = np.searchsorted(anchors, points, side="right") - 1
+        dist2 = _point_segment_dist2(xy[points], xy[anchors[segment]], xy[anchors[segment + 1]])
+
+        boundary = np.r_[True, segment[1:] != segment[:-1]]
+        starts = np.flatnonzero(boundary)
+        group = np.cumsum(boundary) - 1
+        group_max = np.maximum.reduceat(dist2, starts)
+        # 구간 위에 정확히 놓인 점들(이탈 0)은 더 나눌 필요 없이 중요도 0으로 확정합니다.
+        split = group_max > 0
+
+        candidates = np.flatnonzero((dist2 == group_max[group]) & split[group])
+        groups, first = np.unique(group[candidates], return_index=True)
+        new_anchors = points[candidates[first]]
+        seg = segment[starts[groups]]
+        parent = np.minimum(rank2[anchors[seg]], rank2[anchors[seg + 1]])
+        rank2[new_anchors] = np.minimum(group_max[groups], parent)
+        keep[new_anchors] = True
+        active[points[~split[group]]] = False
+        active[new_anchors] = False
+
+
+def simplify_levels(latlng: np.ndarray, counts: Sequence[int]) -> List[np.ndarray]:
+    """
+    counts의 각 최대 점 수(2 이상)에 맞춘 단순화 결과를 한 번의 중요도 계산으로 만듭니다. (목록/지도용 경로 단계)
+    기본 허용 오차로 먼저 줄인 뒤 중요도 순으로 상위 점을 고르므로, 점 수를 넘지 않는 가장 작은 허용 오차의 RDP와 같습니다.
+    (같은 중요도는 앞쪽 점 우선)
+    """
+    latlng = np.asarray(latlng, dtype=np.float64).reshape(-1, 2)
+    if len(latlng) <= min(counts):
+        return [latlng for _ in counts]
+
+    base = simplify_route(latlng, DEFAULT_TOLERANCE_M)
+    order = np.argsort(-simplify_ranks(base), kind="stable")
+    return [base if len(base) <= count else base[np.sort(order[:count])] for count in counts]
@@ -0,0 +1,208 @@
+# app/core/storage.py
+import os
+import re
+from abc import ABC, abstractmethod
+from pathlib import Path
+from typing import Optional
+
+import anyio
+
+from app.core.config import settings
+
+# 콘텐츠 주소 키: blobs/<sha 앞 2자리>/<다음 2자리>/<sha256><확장자>
+# 같은 바이트는 항상 같은 키라서 한 번만 저장됩니다. (내용이 바뀌지 않으므로 URL을 영구 캐시해도 안전)
+BLOB_PREFIX = "blobs"
+BLOB_KEY_PATTERN = re.compile(rf"(?:^|/){BLOB_PREFIX}/[0-9a-f]{{2}}/[0-9a-f]{{2}}/([0-9a-f]{{64}})(?:\.[a-z0-9]+)?$")
+CONTENT_TYPE_EXTENSIONS = {
+    "image/png": ".png",
+    "image/jpeg": ".jpg",
+    "image/webp": ".webp",
+    "image/avif": ".avif",
+    "image/gif": ".gif",
+}
+IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+
+
+def blob_key(sha256: str, content_type: Optional[str]) -> str:
+    ext = CONTENT_TYPE_EXTENSIONS.get((content_type or "").lower(), "")
+    return f"{BLOB_PREFIX}/{sha256[:2]}/{sha256[2:4]}/{sha256}{ext}"
+
+
+def sha256_from_url(url: Optional[str]) -> Optional[str]:
+    """
+    저장소 URL(또는 키)에서 콘텐츠 해시를 꺼냅니다. 콘텐츠 주소 URL이 아니면(예전 업로드) None입니다.
+    """
+    if not url:
+        return None
+    match = BLOB_KEY_PATTERN.search(url.split("?", 1)[0])
+    return match.group(1) if match else None
+
+
+class MediaStorage(ABC):
+    """
+    미디어 원본 바이트 저장소의 공통 인터페이스입니다. (키 = blob_key())
+    - put_file(): 로컬 임시 파일을 키 위치로 옮깁니다/올립니다. 이미 있으면 그대로 둡니다. (같은 키 = 같은 내용)
+    - delete(): 참조가 모두 사라진 객체를 지웁니다. (crud.media의 GC)
+    - url(): 클라이언트가 받을 URL
+    """
+
+    name: str
+
+    @abstractmethod
+    async def put_file(self, local_path: Path, key: str, content_type: Optional[str]) -> None:
+        ...
+
+    @abstractmethod
+    async def exists(self, key: str) -> bool:
+        ...
+
+    @abstractmethod
+    async def delete(self, key: str) -> None:
+        ...
+
+    @abstractmethod
+    def url(self, key: str) -> str:
+        ...
+
+    async def close(self) -> None:
+        pass
+
+
+class LocalMediaStorage(MediaStorage):
+    """
+    MEDIA_ROOT 아래 디스크에 저장합니다. (MEDIA_URL로 서빙)
+    임시 파일도 MEDIA_ROOT 아래에 두므로 put_file은 같은 파일시스템 안의 rename 한 번입니다.
+    """
+
+    name = "local"
+
+    def __init__(self, root: str, base_url: str) -> None:
+        self.root = Path(root)
+        self.base_url = base_url.rstrip("/")
+
+    def path(self, key: str) -> Path:
+        return self.root / key
+
+    def _put(self, local_path: Path, key: str) -> None:
+        target = self.path(key)
+        if target.exists():
+            local_path.unlink(missing_ok=True)
+            return
+        target.parent.mkdir(parents=True, exist_ok=True)
+        os.replace(local_path, target)
+
+    async def put_file(self, local_path: Path, key: str, content_type: Optional[str]) -> None:
+        await anyio.to_thread.run_sync(self._put, local_path, key)
+
+    async def exists(self, key: str) -> bool:
+        return await anyio.to_thread.run_sync(self.path(key).exists)
+
+    async def delete(self, key: str) -> None:
+        await anyio.to_thread.run_sync(lambda: self.path(key).unlink(missing_ok=True))
+
+    def url(self, key: str) -> str:
+        return f"{self.base_url}/{key}"
+
+
+class S3MediaStorage(MediaStorage):
+    """
+    S3 호환 객체 저장소(AWS S3, 로컬 개발은 MinIO)에 저장합니다.
+    boto3 클라이언트는 동기식이라 호출마다 워커 스레드에서 실행합니다.
+    """
+
+    name = "s3"
+
+    def __init__(
+        self,
+        *,
+        bucket: str,
+        endpoint_url: Optional[str] = None,
+        region: Optional[str] = None,
+        access_key_id: Optional[str] = None,
+        secret_access_key: Optional[str] = None,
+        public_url: Optional[str] = None,
+    ) -> None:
+        # boto3 패키지는 이 백엔드를 쓸 때만 필요합니다.
+        import boto3
+
+        self.bucket = bucket
+        self._client = boto3.client(
+            "s3",
+            endpoint_url=endpoint_url,
+            region_name=region,
+            aws_access_key_id=access_key_id,
+            aws_secret_access_key=secret_access_key,
+        )
+        base = public_url or (f"{endpoint_url.rstrip('/')}/{bucket}" if endpoint_url else f"https://{bucket}.s3.amazonaws.com")
+        self.base_url = base.rstrip("/")
+
+    def _exists(self, key: str) -> bool:
+        from botocore.exceptions import ClientError
+
+        try:
+            self._client.head_object(Bucket=self.bucket, Key=key)
+        except ClientError as e:
+            if e.response.get("Error", {}).get("Code") in ("404", "NoSuchKey", "NotFound"):
+                return False
+            raise
+        return True
+
+    def _put(self, local_path: Path, key: str, content_type: Optional[str]) -> None:
+        try:
+            if not self._exists(key):
+                extra = {"CacheControl": IMMUTABLE_CACHE_CONTROL}
+                if content_type:
+                    extra["ContentType"] = content_type
+                self._client.upload_file(str(local_path), self.bucket, key, ExtraArgs=extra)
+        finally:
+            local_path.unlink(missing_ok=True)
+
+    async def put_file(self, local_path: Path, key: str, content_type: Optional[str]) -> None:
+        await anyio.to_thread.run_sync(self._put, local_path, key, content_type)
+
+    async def exists(self, key: str) -> bool:
+        return await anyio.to_thread.run_sync(self._exists, key)
+
+    async def delete(self, key: str) -> None:
+        await anyio.to_thread.run_sync(lambda: self._client.delete_object(Bucket=self.bucket, Key=key))
+
+    def url(self, key: str) -> str:
+        return f"{self.base_url}/{key}"
+
+
+def create_media_storage() -> MediaStorage:
+    """
+    설정(STORAGE_BACKEND)에 맞는 저장소 구현을 만듭니다.
+    """
+    if settings.STORAGE_BACKEND == "local":
+        return LocalMediaStorage(settings.MEDIA_ROOT, settings.MEDIA_URL)
+    if settings.STORAGE_BACKEND == "s3":
+        return S3MediaStorage(
+            bucket=settings.S3_BUCKET,
+            endpoint_url=settings.S3_ENDPOINT_URL,
+            region=settings.S3_REGION,
+            access_key_id=settings.S3_ACCESS_KEY_ID,
+            secret_access_key=settings.S3_SECRET_ACCESS_KEY,
+            public_url=settings.S3_PUBLIC_URL,
+        )
+    raise ValueError(f"Unknown STORAGE_BACKEND: {settings.STORAGE_BACKEND!r}")
+
+
+_storage: Optional[MediaStorage] = None
+
+
+def get_media_storage() -> MediaStorage:
+    """
+    프로세스당 저장소 인스턴스를 하나만 만들어 재사용합니다.
+    """
+    global _storage
+    if _storage is None:
+        _storage = create_media_storage()
+    return _storage
+
+
+async def close_media_storage() -> None:
+    global _storage
+    storage, _storage = _storage, None
+    if storage is not None:
+        await storage.close()
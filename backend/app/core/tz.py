@@ -0,0 +1,47 @@
+# app/core/tz.py
+from datetime import date, datetime, time, timezone
+from typing import Optional
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+
+# 사용자가 시간대를 정하지 않았을 때 쓰는 IANA 시간대 (서비스 주 사용자 기준)
+DEFAULT_TIMEZONE = "Asia/Seoul"
+
+
+class InvalidTimezoneError(ValueError):
+    pass
+
+
+def get_zone(name: str) -> ZoneInfo:
+    """
+    IANA 시간대 이름(예: 'Asia/Seoul')을 ZoneInfo로 바꿉니다.
+    알 수 없는 이름이면 InvalidTimezoneError를 발생시킵니다.
+    """
+    try:
+        return ZoneInfo(name)
+    except (ZoneInfoNotFoundError, ValueError) as e:
+        raise InvalidTimezoneError(f"unknown timezone: {name!r}") from e
+
+
+def validate_timezone(value: Optional[str]) -> Optional[str]:
+    """
+    스키마 입력용 검증기. None은 그대로 두고, 이름이 올바른지만 확인합니다.
+    """
+    if value is not None:
+        get_zone(value)
+    return value
+
+
+def to_naive_utc(ts: datetime) -> datetime:
+    """
+    DB에 저장하는 형식(UTC, tzinfo 없음)으로 맞춥니다. tzinfo가 없으면 이미 UTC로 봅니다.
+    """
+    if ts.tzinfo is None:
+        return ts
+    return ts.astimezone(timezone.utc).replace(tzinfo=None)
+
+
+def local_midnight_utc(day: date, zone: ZoneInfo) -> datetime:
+    """
+    시간대 zone에서 day가 시작되는 순간(00:00)을 UTC(naive)로 반환합니다.
+    """
+    return to_naive_utc(datetime.combine(day, time.min, tzinfo=zone))
@@ -1,7 +1,10 @@
 from . import user
 from . import run
+from . import run_points
 from . import course
 from . import course_attempt
+from . import leaderboard
 from . import stats
 from . import album
+from . import media
 #from . import post
@@ -1,28 +1,48 @@
 # backend/app/crud/album.py
-from typing import List, Optional
+from typing import Any, List, Optional
 from uuid import UUID
 
-from sqlalchemy import select
+from sqlalchemy import or_, select
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import selectinload
 
 from .base import CRUDBase
+from . import media
+from app.core.images import derivative_source
+from app.core.storage import get_media_storage, sha256_from_url
 from app.models.album import Album
 from app.schemas.album import AlbumCreate, AlbumUpdate
 
 class CRUDAlbum(CRUDBase[Album, AlbumCreate, AlbumUpdate]):
+    async def get(self, db: AsyncSession, id: Any) -> Optional[Album]:
+        # 응답의 composed_image(파생본/자리표시)를 위해 합성 이미지 객체 행을 함께 읽습니다.
+        return await db.get(Album, id, options=[selectinload(Album.composed_media)])
+
     async def create_with_owner(self, db: AsyncSession, *, obj_in: AlbumCreate, user_id: UUID) -> Album:
+        """
+        URL이 콘텐츠 주소 저장소(/upload 결과)를 가리키면 해당 객체의 참조 수를 함께 늘립니다.
+        저장소에 없는 해시면 media.UnknownMediaError
+        """
         db_obj = Album(
             user_id=user_id,
             run_id=obj_in.run_id,
             original_url=obj_in.original_url,
             composed_url=obj_in.composed_url,
+            original_blob=sha256_from_url(obj_in.original_url),
+            composed_blob=sha256_from_url(obj_in.composed_url),
             caption=obj_in.caption,
             tags=obj_in.tags,
             visibility=(obj_in.visibility or "private"),
         )
+        try:
+            await media.add_refs(db, (db_obj.original_blob, db_obj.composed_blob))
+        except media.UnknownMediaError:
+            await db.rollback()
+            raise
         db.add(db_obj)
         await db.commit()
         await db.refresh(db_obj)
+        await db.refresh(db_obj, attribute_names=["composed_media"])
         return db_obj
 
     async def get_multi_by_user(
@@ -31,6 +51,7 @@ class CRUDAlbum(CRUDBase[Album, AlbumCreate, AlbumUpdate]):
         stmt = (
             select(Album)
             .where(Album.user_id == user_id)
+            .options(selectinload(Album.composed_media))
             .order_by(Album.created_at.desc())
             .offset(skip)
             .limit(limit)
@@ -38,11 +59,32 @@ class CRUDAlbum(CRUDBase[Album, AlbumCreate, AlbumUpdate]):
         res = await db.execute(stmt)
         return list(res.scalars())
 
+    async def is_media_visible(self, db: AsyncSession, *, key: str, user_id: Optional[UUID]) -> bool:
+        """
+        MEDIA_ROOT 아래 파일(key)을 이 사용자에게 보내도 되는지 확인합니다. (MEDIA_PRIVATE_ALBUMS)
+        - 그 파일을 쓰는 앨범 중 하나라도 공개(public)이거나 본인 것이면 True
+        - 콘텐츠 주소 객체/파생본은 해시로, 예전 업로드는 URL로 앨범을 찾습니다.
+        - 어떤 앨범도 쓰지 않는 파일(업로드 직후 등)은 True
+        """
+        sha256 = sha256_from_url(key) or derivative_source(key)
+        if sha256:
+            condition = or_(Album.composed_blob == sha256, Album.original_blob == sha256)
+        else:
+            url = get_media_storage().url(key)
+            condition = or_(Album.composed_url == url, Album.original_url == url)
+        rows = (await db.execute(select(Album.user_id, Album.visibility).where(condition))).all()
+        if not rows:
+            return True
+        return any(row.visibility == "public" or (user_id is not None and row.user_id == user_id) for row in rows)
+
     async def remove_for_user(self, db: AsyncSession, *, id: UUID, user_id: UUID) -> Optional[Album]:
         obj = await self.get(db, id=id)
         if not obj or obj.user_id != user_id:
             return None
         await db.delete(obj)
+        await db.flush()
+        # 마지막 참조였던 객체는 저장소에서도 지웁니다.
+        await media.release_refs(db, (obj.original_blob, obj.composed_blob))
         await db.commit()
         return obj
 
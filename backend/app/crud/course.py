@@ -1,24 +1,72 @@
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
-from sqlalchemy import or_
-from typing import List
+from sqlalchemy import Float, and_, cast, func, or_, tuple_
+from geoalchemy2 import Geography, Geometry
+from typing import List, Optional, Sequence, Tuple
+import re
 import uuid
 
 from app import models, schemas
+from app.core import polyline
+from app.core.rally_points import generate_rally_points
+from app.core.route_levels import apply_route_levels
+from app.core.simplify import DEFAULT_TOLERANCE_M, simplify_route
+from app.models.route import ROUTE_LEVEL_COLUMNS, SRID_WGS84
 
-async def create_course_from_run(db: AsyncSession, course_in: schemas.CourseCreate, run: models.Run, user_id: uuid.UUID) -> models.Course:
+# 검색어를 단어로 나누는 기준 (DB의 r3_bigrams()와 같은 규칙: 공백/문장부호)
+SEARCH_WORD_SPLIT = re.compile(r"[\s\W_]+")
+
+# 목록/탐색 응답에서 SELECT하는 컬럼 (경로 데이터는 route_detail을 요청할 때만 작은 단계를 읽습니다)
+COURSE_SUMMARY_COLUMNS = (
+    models.Course.id,
+    models.Course.user_id,
+    models.Course.name,
+    models.Course.description,
+    models.Course.distance,
+    models.Course.status,
+    models.Course.visibility,
+    models.Course.created_at,
+    func.ST_Y(cast(models.Course.start_point, Geometry("POINT", srid=SRID_WGS84))).label("start_lat"),
+    func.ST_X(cast(models.Course.start_point, Geometry("POINT", srid=SRID_WGS84))).label("start_lng"),
+)
+
+
+def _summary_columns(route_detail: Optional[str]) -> tuple:
+    """
+    요약 컬럼에 요청한 단계의 경로 컬럼(route_thumb/route_map)을 더합니다. (None이면 경로 제외)
+    """
+    if route_detail is None:
+        return COURSE_SUMMARY_COLUMNS
+    return COURSE_SUMMARY_COLUMNS + (getattr(models.Course, ROUTE_LEVEL_COLUMNS[route_detail]),)
+
+async def create_course_from_run(db: AsyncSession, course_in: schemas.CourseCreateFromRun, run: models.Run, user_id: uuid.UUID) -> models.Course:
     """
     기존 러닝 기록(Run)을 바탕으로 새로운 코스(Course)를 생성합니다.
+    simplify가 켜져 있으면(기본값) 경로를 RDP로 단순화해 저장하고, 원본은 raw_route_polyline에 보관합니다.
+    generate_rally_points가 켜져 있으면 저장할 경로에서 랠리 포인트(체크포인트/회전 지점)를 만듭니다.
+    이후 유사도 계산/목록/지도 렌더링은 모두 단순화된 경로를 사용합니다.
     """
     db_course = models.Course(
         name=course_in.name,
         description=course_in.description,
+        visibility=course_in.visibility or "private",
         distance=run.distance,
-        duration=run.duration,
-        route=run.route,
         original_run_id=run.id,
         user_id=user_id
     )
+    route = run.route_array
+    if course_in.simplify is not False and len(route) > 2:
+        tolerance = course_in.simplify_tolerance_m
+        route = simplify_route(route, DEFAULT_TOLERANCE_M if tolerance is None else tolerance)
+        db_course.route_polyline = polyline.encode(route)
+        db_course.raw_route_polyline = run.route_polyline
+    else:
+        # 인코딩된 경로를 그대로 복사합니다. (디코딩 불필요)
+        db_course.route_polyline = run.route_polyline
+    if course_in.generate_rally_points:
+        # 도전 채점 시 유사도 계산 전에 통과 여부를 먼저 확인하는 데 씁니다. (app.core.scoring)
+        db_course.rally_points = generate_rally_points(route)
+    await apply_route_levels(db_course)
     db.add(db_course)
     await db.commit()
     await db.refresh(db_course)
@@ -36,53 +84,93 @@ async def get_courses_by_user(db: AsyncSession, user_id: uuid.UUID) -> List[mode
     return result.scalars().all()
 
 
-async def get_course(db: AsyncSession, id: uuid.UUID, user_id: uuid.UUID) -> models.Course | None:
+async def get_course_route_level(db: AsyncSession, id: uuid.UUID, detail: str = "map"):
     """
-    특정 ID의 코스를 조회합니다.
-    다른 사용자의 코스를 볼 수 없도록 user_id도 함께 검사합니다.
+    코스의 (user_id, status, visibility, route) 행만 조회합니다. (썸네일처럼 권한 확인과 경로만 필요한 곳용)
     """
+    column = getattr(models.Course, ROUTE_LEVEL_COLUMNS[detail])
     result = await db.execute(
-        select(models.Course)
-        .filter(models.Course.id == id, models.Course.user_id == user_id)
+        select(
+            models.Course.user_id, models.Course.status, models.Course.visibility, column.label("route")
+        ).filter(models.Course.id == id)
     )
-    return result.scalars().first()
+    return result.first()
 
-async def update_course(db: AsyncSession, db_course: models.Course, course_in: schemas.CourseUpdate) -> models.Course:
-    """
-    코스를 수정합니다.
-    """
-    data = course_in.model_dump(exclude_unset=True)
-    for k, v in data.items():
-        setattr(db_course, k, v)
-    await db.commit()
-    await db.refresh(db_course)
-    return db_course
+def _has_bigram(query: str) -> bool:
+    # r3_bigrams()는 2글자 이상인 단어에서만 조각을 만듭니다. (조각이 없으면 @> 조건이 모든 행과 일치)
+    return any(len(word) >= 2 for word in SEARCH_WORD_SPLIT.split(query))
 
-async def delete_course(db: AsyncSession, db_course: models.Course):
-    """
-    코스를 삭제합니다.
-    """
-    await db.delete(db_course)
-    await db.commit()
-    return db_course
 
-async def search_courses(db: AsyncSession, query: str) -> List[models.Course]:
-    """
-    쿼리 문자열로 코스 이름 또는 설명을 검색합니다 (대소문자 무시).
-    """
-    # ilike는 대소문자를 구분하지 않는 'like' 검색을 지원합니다.
-    search_query = f"%{query}%"
-    result = await db.execute(
-        select(models.Course)
-        .filter(
-            or_(
-                models.Course.name.ilike(search_query),
-                models.Course.description.ilike(search_query)
-            )
+async def search_courses(
+    db: AsyncSession,
+    query: str,
+    *,
+    limit: int,
+    after: Optional[Tuple[float, uuid.UUID]] = None,
+    route_detail: Optional[str] = None,
+) -> Sequence:
+    """
+    공개(published + public) 코스를 이름/설명으로 검색해 관련도 순으로 limit개 가져옵니다.
+    - 부분 일치: 검색어의 2글자 조각이 모두 들어 있는 코스 (search_bigrams @> ..., GIN)
+    - 오타 허용: 단어 유사도(pg_trgm word_similarity)가 임계값 이상인 코스 (search_text %> ..., GIN)
+    - 순위: 본문 단어 유사도 + 이름 유사도
+    - after: 이전 페이지 마지막 항목의 (score, id). (keyset)
+    """
+    q = query.strip().lower()
+    score = (
+        func.word_similarity(q, models.Course.search_text) + func.similarity(q, func.lower(models.Course.name))
+    )
+
+    matches = [models.Course.search_text.op("%>")(q)]
+    if _has_bigram(q):
+        matches.append(models.Course.search_bigrams.contains(func.r3_bigrams(q)))
+
+    stmt = select(*_summary_columns(route_detail), score.label("score")).filter(
+        models.Course.status == "published",
+        models.Course.visibility == "public",
+        or_(*matches),
+    )
+    if after is not None:
+        after_score, after_id = after
+        stmt = stmt.filter(
+            or_(score < after_score, and_(score == after_score, models.Course.id > after_id))
         )
-        .order_by(models.Course.created_at.desc())
+
+    result = await db.execute(stmt.order_by(score.desc(), models.Course.id).limit(limit))
+    return result.all()
+
+async def get_nearby_courses(
+    db: AsyncSession,
+    *,
+    lat: float,
+    lng: float,
+    radius_m: float,
+    limit: int,
+    after: Optional[Tuple[float, uuid.UUID]] = None,
+    route_detail: Optional[str] = None,
+) -> Sequence:
+    """
+    (lat, lng)에서 radius_m 안에서 시작하는 공개(published + public) 코스를 가까운 순으로 limit개 가져옵니다.
+    - ix_courses_public_start_point(부분 GiST) 인덱스로 반경 필터(ST_DWithin)와 KNN 정렬(<->)을 처리합니다.
+    - after: 이전 페이지 마지막 항목의 (distance_m, id). 이 값보다 먼 항목만 조회합니다. (keyset)
+    """
+    origin = cast(
+        func.ST_SetSRID(func.ST_MakePoint(lng, lat), SRID_WGS84),
+        Geography("POINT", srid=SRID_WGS84),
     )
-    return result.scalars().all()
+    # geography의 <->는 구면 거리(m)를 돌려주며, 정렬과 커서 비교에 같은 식을 사용합니다.
+    distance_m = models.Course.start_point.op("<->", return_type=Float)(origin)
+
+    query = select(*_summary_columns(route_detail), distance_m.label("distance_m")).filter(
+        models.Course.status == "published",
+        models.Course.visibility == "public",
+        func.ST_DWithin(models.Course.start_point, origin, radius_m),
+    )
+    if after is not None:
+        query = query.filter(tuple_(distance_m, models.Course.id) > tuple_(*after))
+
+    result = await db.execute(query.order_by(distance_m, models.Course.id).limit(limit))
+    return result.all()
 
 # ----> 아래 함수를 추가합니다. <----
 async def get_course_by_id_for_attempt(db: AsyncSession, id: uuid.UUID) -> models.Course | None:
@@ -108,12 +196,23 @@ async def get_course(db: AsyncSession, id: uuid.UUID, user_id: uuid.UUID) -> mod
 async def update_course(db: AsyncSession, db_course: models.Course, course_in: schemas.CourseUpdate) -> models.Course:
     """
     코스를 수정합니다.
+    경로(route/route_polyline)가 바뀌면 이전 경로에서 나온 값을 새 경로에 맞춥니다.
+    - raw_route_polyline(단순화 전 원본)은 더 이상 이 경로의 원본이 아니므로 지웁니다.
+    - 랠리 포인트가 있던 코스는 새 경로로 다시 만듭니다. (요청에 rally_points가 있으면 그 값을 씀)
     """
     update_data = course_in.model_dump(exclude_unset=True)
-    
+    had_rally_points = bool(db_course.rally_points)
+
     for key, value in update_data.items():
         setattr(db_course, key, value)
-        
+
+    if update_data.keys() & {"route", "route_polyline"}:
+        db_course.raw_route_polyline = None
+        if had_rally_points and "rally_points" not in update_data:
+            route = db_course.route_array
+            db_course.rally_points = generate_rally_points(route) if len(route) else None
+        await apply_route_levels(db_course)
+
     db.add(db_course)
     await db.commit()
     await db.refresh(db_course)
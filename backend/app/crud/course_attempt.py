@@ -1,17 +1,21 @@
+from sqlalchemy import func, update
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
+from datetime import timedelta
 from typing import List
 import uuid
-from sqlalchemy.orm import selectinload
 
 from app import models, schemas
+from app.crud import leaderboard
+
+# MVP에서는 80% (0.8) 이상을 성공으로 간주합니다.
+SUCCESS_SCORE_THRESHOLD = 0.8
 
 async def create_course_attempt(db: AsyncSession, *, run_id: uuid.UUID, course_id: uuid.UUID, user_id: uuid.UUID, score: float) -> models.CourseAttempt:
     """
     새로운 코스 도전 기록을 데이터베이스에 생성합니다.
     """
-    # MVP에서는 80% (0.8) 이상을 성공으로 간주합니다.
-    is_successful = score >= 0.8
+    is_successful = score >= SUCCESS_SCORE_THRESHOLD
 
     db_attempt = models.CourseAttempt(
         run_id=run_id,
@@ -21,29 +25,111 @@ async def create_course_attempt(db: AsyncSession, *, run_id: uuid.UUID, course_i
         is_successful=is_successful
     )
     db.add(db_attempt)
+    await db.flush()
+    await leaderboard.record_attempt(db, db_attempt.id)
     await db.commit()
     await db.refresh(db_attempt)
     return db_attempt
 
-async def get_attempt_by_run_id(db: AsyncSession, run_id: uuid.UUID) -> models.CourseAttempt | None:
+async def create_pending_attempt(db: AsyncSession, *, run_id: uuid.UUID, course_id: uuid.UUID, user_id: uuid.UUID) -> models.CourseAttempt:
     """
-    Run ID로 기존 도전 기록이 있는지 확인합니다 (중복 제출 방지용).
+    점수 없이 'pending' 상태의 도전 기록을 생성합니다. (백그라운드 워커가 채점)
+    """
+    db_attempt = models.CourseAttempt(
+        run_id=run_id,
+        course_id=course_id,
+        user_id=user_id,
+        similarity_score=None,
+        is_successful=False,
+        status="pending",
+    )
+    db.add(db_attempt)
+    await db.commit()
+    await db.refresh(db_attempt)
+    return db_attempt
+
+async def get_attempt(db: AsyncSession, id: uuid.UUID, user_id: uuid.UUID) -> models.CourseAttempt | None:
+    """
+    ID로 도전 기록을 조회합니다. 다른 사용자의 기록은 볼 수 없습니다.
     """
     result = await db.execute(
-        select(models.CourseAttempt).filter(models.CourseAttempt.run_id == run_id)
+        select(models.CourseAttempt)
+        .filter(models.CourseAttempt.id == id, models.CourseAttempt.user_id == user_id)
     )
     return result.scalars().first()
 
-async def get_course_ranking(db: AsyncSession, course_id: uuid.UUID, limit: int = 10) -> List[models.CourseAttempt]:
+async def get_pending_attempt_ids(db: AsyncSession, limit: int = 1000) -> List[uuid.UUID]:
     """
-    특정 코스의 랭킹을 조회합니다 (성공한 도전 기록 중 소요 시간이 가장 짧은 순).
+    아직 채점되지 않은(pending) 도전 기록 ID 목록을 오래된 순으로 조회합니다.
     """
     result = await db.execute(
-        select(models.CourseAttempt)
-        .options(selectinload(models.CourseAttempt.user)) # 사용자 정보도 함께 로드
-        .filter(models.CourseAttempt.course_id == course_id, models.CourseAttempt.is_successful == True)
-        .join(models.Run) # Run 모델과 조인하여 duration을 기준으로 정렬
-        .order_by(models.Run.duration.asc())
+        select(models.CourseAttempt.id)
+        .filter(models.CourseAttempt.status == "pending")
+        .order_by(models.CourseAttempt.attempted_at.asc())
         .limit(limit)
     )
-    return result.scalars().all()
\ No newline at end of file
+    return list(result.scalars().all())
+
+async def claim_pending_attempt(db: AsyncSession, id: uuid.UUID) -> bool:
+    """
+    pending 상태의 도전 기록을 scoring으로 바꿔 이 워커가 가져갑니다. (조건부 UPDATE라 원자적)
+    같은 ID가 큐에 여러 번 들어 있거나 워커가 여러 개여도 한 번만 True이고, 나머지는 건너뜁니다.
+    """
+    result = await db.execute(
+        update(models.CourseAttempt)
+        .where(models.CourseAttempt.id == id, models.CourseAttempt.status == "pending")
+        .values(status="scoring", claimed_at=func.now())
+        .returning(models.CourseAttempt.id)
+    )
+    claimed = result.scalar_one_or_none() is not None
+    await db.commit()
+    return claimed
+
+async def release_stale_claims(db: AsyncSession, older_than: timedelta) -> int:
+    """
+    scoring 상태로 older_than보다 오래 남은 기록(채점 중 워커가 죽은 경우)을 다시 pending으로 되돌립니다.
+    claimed_at은 DB 시계(now())로 찍으므로 비교도 DB 시계로 합니다. (앱 서버와 DB 세션의 시간대가 달라도 맞도록)
+    """
+    result = await db.execute(
+        update(models.CourseAttempt)
+        .where(
+            models.CourseAttempt.status == "scoring",
+            models.CourseAttempt.claimed_at < func.now() - older_than,
+        )
+        .values(status="pending", claimed_at=None)
+        .returning(models.CourseAttempt.id)
+    )
+    released = len(result.scalars().all())
+    await db.commit()
+    return released
+
+async def set_attempt_score(db: AsyncSession, db_attempt: models.CourseAttempt, score: float) -> models.CourseAttempt:
+    """
+    워커가 가져간(scoring) 도전 기록에 채점 결과를 기록합니다.
+    """
+    db_attempt.similarity_score = score
+    db_attempt.is_successful = score >= SUCCESS_SCORE_THRESHOLD
+    db_attempt.status = "scored"
+    await db.flush()
+    await leaderboard.record_attempt(db, db_attempt.id)
+    await db.commit()
+    await db.refresh(db_attempt)
+    return db_attempt
+
+async def mark_attempt_failed(db: AsyncSession, db_attempt: models.CourseAttempt) -> models.CourseAttempt:
+    """
+    채점에 실패한 도전 기록을 'failed' 상태로 표시합니다.
+    """
+    db_attempt.status = "failed"
+    await db.commit()
+    await db.refresh(db_attempt)
+    return db_attempt
+
+async def get_attempt_by_run_id(db: AsyncSession, run_id: uuid.UUID) -> models.CourseAttempt | None:
+    """
+    Run ID로 기존 도전 기록이 있는지 확인합니다 (중복 제출 방지용).
+    """
+    result = await db.execute(
+        select(models.CourseAttempt).filter(models.CourseAttempt.run_id == run_id)
+    )
+    return result.scalars().first()
@@ -0,0 +1,141 @@
+# app/crud/leaderboard.py
+from sqlalchemy import delete, select
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import Optional, Sequence
+import uuid
+
+from app import models
+from app.core.leaderboard_index import get_leaderboard_index
+
+Entry = models.CourseLeaderboardEntry
+
+
+async def _ensure_index(db: AsyncSession, course_id: uuid.UUID) -> None:
+    # 인덱스에 없는(처음 조회/만료) 코스는 테이블의 전체 항목으로 채웁니다. (ix_course_leaderboard_rank 범위, index-only)
+    index = get_leaderboard_index()
+    if await index.is_loaded(course_id):
+        return
+    rows = await db.execute(
+        select(Entry.best_duration, Entry.achieved_at, Entry.user_id).filter(Entry.course_id == course_id)
+    )
+    await index.load(course_id, rows.tuples())
+
+
+async def record_attempt(db: AsyncSession, attempt_id: uuid.UUID) -> None:
+    """
+    채점된 도전 기록이 성공이면 리더보드에 반영합니다. (사용자의 기존 최고 기록보다 빠를 때만 갱신)
+    도전 기록은 flush된 상태여야 하며, 커밋은 호출한 쪽의 트랜잭션에 맡깁니다.
+    """
+    Attempt = models.CourseAttempt
+    source = (
+        select(
+            Attempt.course_id,
+            Attempt.user_id,
+            Attempt.id,
+            Attempt.run_id,
+            models.Run.duration,
+            Attempt.similarity_score,
+            Attempt.attempted_at,
+        )
+        .join(models.Run, models.Run.id == Attempt.run_id)
+        .filter(Attempt.id == attempt_id, Attempt.is_successful.is_(True))
+    )
+    stmt = insert(Entry).from_select(
+        ["course_id", "user_id", "attempt_id", "run_id", "best_duration", "similarity_score", "achieved_at"],
+        source,
+    )
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[Entry.course_id, Entry.user_id],
+        set_={
+            "attempt_id": stmt.excluded.attempt_id,
+            "run_id": stmt.excluded.run_id,
+            "best_duration": stmt.excluded.best_duration,
+            "similarity_score": stmt.excluded.similarity_score,
+            "achieved_at": stmt.excluded.achieved_at,
+        },
+        where=stmt.excluded.best_duration < Entry.best_duration,
+    ).returning(Entry.course_id, Entry.user_id, Entry.best_duration, Entry.achieved_at)
+    changed = (await db.execute(stmt)).first()
+    if changed is not None:
+        await get_leaderboard_index().upsert(
+            changed.course_id, (changed.best_duration, changed.achieved_at, changed.user_id)
+        )
+
+
+async def recompute_entry(db: AsyncSession, *, course_id: uuid.UUID, user_id: uuid.UUID) -> None:
+    """
+    사용자의 리더보드 항목을 남아 있는 성공한 도전 중 가장 빠른 기록으로 다시 만듭니다. (없으면 항목 삭제)
+    record_attempt는 더 빠른 기록으로만 갱신하므로, 최고 기록이 삭제되거나 기록 시간이 바뀌면 이것을 호출합니다.
+    커밋은 호출한 쪽의 트랜잭션에 맡깁니다. (두 함수 모두 바뀐 항목을 순위 인덱스에도 반영)
+    """
+    Attempt = models.CourseAttempt
+    await db.execute(delete(Entry).where(Entry.course_id == course_id, Entry.user_id == user_id))
+    source = (
+        select(
+            Attempt.course_id,
+            Attempt.user_id,
+            Attempt.id,
+            Attempt.run_id,
+            models.Run.duration,
+            Attempt.similarity_score,
+            Attempt.attempted_at,
+        )
+        .join(models.Run, models.Run.id == Attempt.run_id)
+        .filter(Attempt.course_id == course_id, Attempt.user_id == user_id, Attempt.is_successful.is_(True))
+        .order_by(models.Run.duration, Attempt.attempted_at)
+        .limit(1)
+    )
+    best = (
+        await db.execute(
+            insert(Entry)
+            .from_select(
+                ["course_id", "user_id", "attempt_id", "run_id", "best_duration", "similarity_score", "achieved_at"],
+                source,
+            )
+            .returning(Entry.best_duration, Entry.achieved_at)
+        )
+    ).first()
+    index = get_leaderboard_index()
+    if best is None:
+        await index.remove(course_id, user_id)
+    else:
+        await index.upsert(course_id, (best.best_duration, best.achieved_at, user_id))
+
+
+async def get_ranking_page(
+    db: AsyncSession, *, course_id: uuid.UUID, offset: int, limit: int
+) -> Sequence:
+    """
+    리더보드를 순위순으로 offset부터 limit개 가져옵니다. (닉네임 포함)
+    - 구간의 user_id는 순위 인덱스에서 O(log n + limit)으로 찾고, 항목은 기본 키로 읽습니다. (OFFSET으로 앞 순위를 건너뛰지 않음)
+    """
+    await _ensure_index(db, course_id)
+    user_ids = await get_leaderboard_index().page(course_id, offset, limit)
+    if not user_ids:
+        return []
+    result = await db.execute(
+        select(
+            Entry.user_id,
+            models.User.nickname,
+            Entry.attempt_id,
+            Entry.run_id,
+            Entry.best_duration,
+            Entry.similarity_score,
+            Entry.achieved_at,
+        )
+        .join(models.User, models.User.id == Entry.user_id)
+        .filter(Entry.course_id == course_id, Entry.user_id.in_(user_ids))
+    )
+    rows = {row.user_id: row for row in result}
+    return [rows[user_id] for user_id in user_ids if user_id in rows]
+
+
+async def get_user_rank(db: AsyncSession, *, course_id: uuid.UUID, user_id: uuid.UUID) -> Optional[int]:
+    """
+    사용자의 순위(1부터)를 반환합니다. 리더보드에 없으면 None.
+    - 순위 인덱스(정렬 집합)에서 O(log n)으로 구합니다. (앞선 사람 수를 세지 않음)
+    """
+    await _ensure_index(db, course_id)
+    rank = await get_leaderboard_index().rank(course_id, user_id)
+    return None if rank is None else rank + 1
@@ -0,0 +1,223 @@
+# app/crud/media.py
+from collections import Counter
+from datetime import timedelta
+from pathlib import Path
+from typing import Iterable, List, Optional, Tuple
+import logging
+import os
+import shutil
+
+from sqlalchemy import delete, func, literal_column, select, update
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from starlette.requests import Request
+
+from app import models
+from app.core.config import settings
+from app.core.executor import media_executor
+from app.core.images import build_derivatives, derivative_key, supported_formats, variant_content_type
+from app.core.media import receive_upload
+from app.core.storage import blob_key, get_media_storage
+from app.models.album import Album
+
+logger = logging.getLogger(__name__)
+
+Blob = models.MediaBlob
+
+# 업로드를 해시 계산하며 받아 두는 임시 디렉토리 (MEDIA_ROOT 아래라 로컬 저장소는 rename만으로 옮깁니다)
+STAGING_DIR = ".staging"
+# 마지막 업로드 후 이 시간이 지나도록 어떤 앨범도 참조하지 않은 객체는 gc_unreferenced_blobs가 지웁니다.
+UNREFERENCED_GRACE = timedelta(days=1)
+
+
+class UnknownMediaError(ValueError):
+    """
+    앨범이 가리키는 콘텐츠 주소 URL의 객체가 저장소에 없을 때 발생합니다. (다시 업로드해야 함)
+    """
+
+
+async def store_upload(db: AsyncSession, request: Request) -> Tuple[models.MediaBlob, bool]:
+    """
+    업로드 요청 본문(multipart의 file 필드)을 콘텐츠 주소 저장소에 넣고 (객체, 새로 저장했는지)를 반환합니다.
+    - 본문을 받으면서 SHA-256을 계산하고(app.core.media.receive_upload), 같은 해시가 이미 있으면 바이트를 다시 저장하지 않습니다.
+    - 행을 먼저 만들고(커밋) 객체를 올립니다. 마지막 참조를 지우는 GC가 같은 해시를 지우는 중이면
+      INSERT가 그 트랜잭션이 끝날 때까지 기다리므로, 지워진 객체를 가리키는 행이 남지 않습니다.
+    - 이미 있던 해시면 created_at을 지금으로 당겨, 참조되지 않은 채 오래된 객체를 다시 올린 직후
+      앨범을 만들기 전에 주기 GC가 지우지 않게 합니다. (새 행인지는 xmax = 0으로 구분)
+    - 이미지면 목록용 파생본과 자리표시를 만들어 둡니다. (_attach_derivatives, 실패해도 업로드는 저장)
+    - 저장 크기 상한을 넘으면 app.core.media.UploadTooLargeError, 폼 형식이 잘못되면 UploadFormError
+    """
+    staging = Path(settings.MEDIA_ROOT) / STAGING_DIR / os.urandom(8).hex()
+    stored = await receive_upload(request, staging)
+    try:
+        key = blob_key(stored.sha256, stored.content_type)
+        created = (
+            await db.execute(
+                insert(Blob)
+                .values(sha256=stored.sha256, storage_key=key, content_type=stored.content_type, size=stored.size)
+                .on_conflict_do_update(index_elements=[Blob.sha256], set_={"created_at": func.now()})
+                # 갱신된 행은 xmax에 이 트랜잭션 번호가 남고, 새로 넣은 행은 0입니다.
+                .returning(literal_column("xmax") == 0)
+            )
+        ).scalar_one()
+        await db.commit()
+        # 커밋으로 만료된 속성을 다시 읽지 않도록 커밋 뒤에 조회합니다. (방금 당긴 created_at 때문에 GC가 지우지 않음)
+        blob = (await db.execute(select(Blob).where(Blob.sha256 == stored.sha256))).scalar_one()
+        if blob.variants is None and (blob.content_type or "").startswith("image/"):
+            await _attach_derivatives(db, blob, staging)
+        # 이미 있던 해시여도 객체가 빠져 있으면 다시 채웁니다. (있으면 임시 파일만 지움)
+        await get_media_storage().put_file(staging, blob.storage_key, blob.content_type)
+    finally:
+        staging.unlink(missing_ok=True)
+    return blob, created
+
+
+async def _attach_derivatives(db: AsyncSession, blob: models.MediaBlob, source: Path) -> None:
+    """
+    임시 파일(source)에서 폭별 WebP/AVIF와 자리표시를 media_executor에서 만들어 저장소에 올리고 행에 기록합니다.
+    인코딩은 이벤트 루프 밖의 제한된 풀에서만 돌고, 풀이 가득 찼거나 이미지가 아니면 파생본 없이 넘어갑니다.
+    (앨범은 원본 URL을 그대로 쓰고, 같은 이미지를 다시 올리면 그때 채웁니다)
+    """
+    formats = supported_formats(settings.IMAGE_VARIANT_FORMATS)
+    if not formats or not settings.IMAGE_VARIANT_WIDTHS:
+        return
+    out_dir = source.with_name(f"{source.name}.derived")
+    try:
+        try:
+            derived = await media_executor.run(
+                build_derivatives, str(source), str(out_dir), list(settings.IMAGE_VARIANT_WIDTHS), formats
+            )
+        except Exception:
+            logger.warning("skipped image derivatives for %s", blob.sha256, exc_info=True)
+            return
+
+        storage = get_media_storage()
+        for variant in derived.variants:
+            variant.key = derivative_key(blob.sha256, variant.width, variant.format)
+            await storage.put_file(Path(variant.path), variant.key, variant_content_type(variant.format))
+        values = dict(
+            width=derived.width,
+            height=derived.height,
+            placeholder=derived.placeholder,
+            variants=[variant.to_json() for variant in derived.variants],
+        )
+        await db.execute(update(Blob).where(Blob.sha256 == blob.sha256).values(**values))
+        await db.commit()
+        await db.refresh(blob)
+    finally:
+        shutil.rmtree(out_dir, ignore_errors=True)
+
+
+async def _delete_objects(rows: Iterable[Tuple[str, Optional[list]]]) -> List[str]:
+    # 원본과 파생본 객체를 모두 지우고 원본 키 목록을 반환합니다.
+    storage = get_media_storage()
+    keys = []
+    for key, variants in rows:
+        for variant in variants or ():
+            await storage.delete(variant["key"])
+        await storage.delete(key)
+        keys.append(key)
+    return keys
+
+
+async def add_refs(db: AsyncSession, hashes: Iterable[Optional[str]]) -> None:
+    """
+    해시별 참조 수를 늘립니다. (같은 해시가 여러 번 오면 그만큼) 커밋은 호출한 쪽에 맡깁니다.
+    없는 해시가 있으면 UnknownMediaError
+    """
+    for sha256, count in Counter(h for h in hashes if h).items():
+        updated = (
+            await db.execute(
+                update(Blob)
+                .where(Blob.sha256 == sha256)
+                .values(ref_count=Blob.ref_count + count)
+                .returning(Blob.sha256)
+            )
+        ).scalar_one_or_none()
+        if updated is None:
+            raise UnknownMediaError(sha256)
+
+
+async def release_refs(db: AsyncSession, hashes: Iterable[Optional[str]]) -> List[str]:
+    """
+    해시별 참조 수를 줄이고, 0이 된 객체는 행과 저장소 객체(파생본 포함)를 지웁니다. (GC)
+    객체 삭제는 행 삭제를 커밋하기 전에 하므로, 같은 해시의 새 업로드는 이 트랜잭션이 끝난 뒤에 행을 다시 만듭니다.
+    지운 저장소 키 목록을 반환하며, 커밋은 호출한 쪽에 맡깁니다.
+    """
+    counts = Counter(h for h in hashes if h)
+    for sha256, count in counts.items():
+        await db.execute(update(Blob).where(Blob.sha256 == sha256).values(ref_count=Blob.ref_count - count))
+    if not counts:
+        return []
+
+    rows = (
+        await db.execute(
+            delete(Blob)
+            .where(Blob.sha256.in_(list(counts)), Blob.ref_count <= 0)
+            .returning(Blob.storage_key, Blob.variants)
+        )
+    ).all()
+    return await _delete_objects(rows)
+
+
+def _album_ref_count():
+    # 이 객체를 가리키는 앨범 참조 수 (원본/합성 각각, 같은 앨범이 둘 다 가리키면 2) - Blob 행에 대한 상관 서브쿼리
+    return (
+        select(func.count()).where(Album.original_blob == Blob.sha256).scalar_subquery()
+        + select(func.count()).where(Album.composed_blob == Blob.sha256).scalar_subquery()
+    )
+
+
+async def _resync_ref_counts(db: AsyncSession) -> int:
+    """
+    ref_count가 실제 앨범 참조 수와 다른 행을 앨범에서 다시 센 값으로 맞추고, 맞춘 행 수를 반환합니다.
+    ref_count는 crud가 앨범을 지울 때만 줄어들어, 사용자 삭제처럼 DB CASCADE로 앨범이 지워지면 늘어난 채 남습니다.
+    먼저 행을 잠근 뒤(다른 트랜잭션이 잡고 있으면 건너뜀) 새 스냅숏에서 다시 세므로, 진행 중인 앨범 생성/삭제와 어긋나지 않습니다.
+    """
+    drifted = (
+        await db.execute(
+            select(Blob.sha256)
+            .where(Blob.ref_count > 0, Blob.ref_count != _album_ref_count())
+            .with_for_update(skip_locked=True)
+        )
+    ).scalars().all()
+    if drifted:
+        await db.execute(
+            update(Blob).where(Blob.sha256.in_(drifted)).values(ref_count=_album_ref_count()),
+            execution_options={"synchronize_session": False},
+        )
+    return len(drifted)
+
+
+async def gc_unreferenced_blobs(db: AsyncSession, *, older_than: timedelta = UNREFERENCED_GRACE) -> List[str]:
+    """
+    참조되지 않은 객체를 지웁니다. (주기 작업: app.worker.run_media_gc)
+    - 먼저 앨범 CASCADE 삭제 등으로 어긋난 ref_count를 앨범에서 다시 센 값으로 맞춥니다. (_resync_ref_counts)
+    - 그 뒤 마지막 업로드 후 older_than이 지나도록 참조되지 않은 객체의 행과 저장소 객체(파생본 포함)를 지웁니다.
+      (기준 시각은 created_at을 채우는 DB 시계)
+    다른 트랜잭션이 잡고 있는 행은 건너뜁니다.
+    """
+    resynced = await _resync_ref_counts(db)
+    if resynced:
+        logger.info("resynced ref_count of %d media blobs from albums", resynced)
+
+    rows = (
+        await db.execute(
+            select(Blob.sha256)
+            .where(Blob.ref_count == 0, Blob.created_at < func.now() - older_than)
+            .with_for_update(skip_locked=True)
+        )
+    ).scalars().all()
+    if not rows:
+        await db.commit()
+        return []
+    deleted = (
+        await db.execute(
+            delete(Blob)
+            .where(Blob.sha256.in_(rows), Blob.ref_count == 0)
+            .returning(Blob.storage_key, Blob.variants)
+        )
+    ).all()
+    keys = await _delete_objects(deleted)
+    await db.commit()
+    return keys
@@ -1,11 +1,27 @@
 # app/crud/run.py
 
+from sqlalchemy import delete, tuple_
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
-from typing import List
+from datetime import datetime
+from typing import List, Optional, Sequence, Tuple
 import uuid
 
 from app import models, schemas
+from app.core.route_levels import (
+    FinishedRun,
+    RawSamples,
+    apply_route_levels,
+    compute_finished_run,
+    set_route_levels,
+)
+from app.crud import leaderboard, run_points
+from app.crud.stats import RunContribution, apply_stats_bucket, bucket_start_of
+from app.crud.user import apply_run_totals
+from app.models.route import ROUTE_LEVEL_COLUMNS
+
+# 통계/프로필 집계에 포함되는 상태
+FINISHED_STATUS = "finished"
 
 async def create_run(db: AsyncSession, user_id: uuid.UUID) -> models.Run:
     """
@@ -50,13 +66,60 @@ async def create_run_with_owner(
     return db_run
 
 
-async def get_runs_by_user(db: AsyncSession, user_id: uuid.UUID) -> List[models.Run]:
+# 목록 조회 시 SELECT하는 컬럼 (JSONB인 route/splits/chart_data는 읽지 않습니다)
+RUN_SUMMARY_COLUMNS = (
+    models.Run.id,
+    models.Run.user_id,
+    models.Run.title,
+    models.Run.distance,
+    models.Run.duration,
+    models.Run.calories_burned,
+    models.Run.avg_pace,
+    models.Run.total_elevation_gain,
+    models.Run.moving_time,
+    models.Run.created_at,
+    models.Run.end_at,
+    models.Run.status,
+    models.Run.is_edited,
+    models.Run.is_course_candidate,
+)
+
+
+async def get_runs_by_user(
+    db: AsyncSession,
+    user_id: uuid.UUID,
+    *,
+    limit: int,
+    after: Optional[Tuple[datetime, uuid.UUID]] = None,
+    date_from: Optional[datetime] = None,
+    date_to: Optional[datetime] = None,
+    status: Optional[str] = None,
+    route_detail: Optional[str] = None,
+) -> Sequence:
+    """
+    사용자의 러닝 기록 요약을 최신순(created_at DESC, id DESC)으로 limit개 가져옵니다.
+    - after: 이전 페이지 마지막 항목의 (created_at, id). 이 값보다 뒤의 항목만 조회합니다. (keyset)
+    - date_from / date_to: created_at 기준 [date_from, date_to) 범위 필터
+    - route_detail: thumb/map이면 해당 단계의 경로 컬럼(route_thumb/route_map)도 함께 읽습니다.
+    ix_runs_user_id_created_at 인덱스를 따라 읽으므로 기록 수와 관계없이 페이지 비용이 일정합니다.
+    """
+    columns = RUN_SUMMARY_COLUMNS
+    if route_detail is not None:
+        columns += (getattr(models.Run, ROUTE_LEVEL_COLUMNS[route_detail]),)
+    query = select(*columns).filter(models.Run.user_id == user_id)
+    if after is not None:
+        query = query.filter(tuple_(models.Run.created_at, models.Run.id) < tuple_(*after))
+    if date_from is not None:
+        query = query.filter(models.Run.created_at >= date_from)
+    if date_to is not None:
+        query = query.filter(models.Run.created_at < date_to)
+    if status is not None:
+        query = query.filter(models.Run.status == status)
+
     result = await db.execute(
-        select(models.Run)
-        .filter(models.Run.user_id == user_id)
-        .order_by(models.Run.created_at.desc())
+        query.order_by(models.Run.created_at.desc(), models.Run.id.desc()).limit(limit)
     )
-    return result.scalars().all()
+    return result.all()
 
 
 async def get_run(db: AsyncSession, id: uuid.UUID, user_id: uuid.UUID) -> models.Run | None:
@@ -67,17 +130,188 @@ async def get_run(db: AsyncSession, id: uuid.UUID, user_id: uuid.UUID) -> models
     return result.scalars().first()
 
 
-async def update_run(db: AsyncSession, db_run: models.Run, run_in: schemas.RunUpdate) -> models.Run:
+async def get_run_owner_status(db: AsyncSession, id: uuid.UUID):
+    """
+    기록의 (user_id, status)만 조회합니다. (실시간 관전처럼 경로가 필요 없는 권한 확인용)
+    """
+    result = await db.execute(
+        select(models.Run.user_id, models.Run.status).filter(models.Run.id == id)
+    )
+    return result.first()
+
+
+async def get_run_route_level(db: AsyncSession, id: uuid.UUID, user_id: uuid.UUID, detail: str = "map"):
+    """
+    내 기록의 한 단계 경로 바이트만 조회합니다. (썸네일처럼 다른 컬럼이 필요 없는 곳용)
+    기록이 없으면 None, 있으면 (route,) 행을 반환합니다. (경로가 없으면 route가 None)
+    """
+    column = getattr(models.Run, ROUTE_LEVEL_COLUMNS[detail])
+    result = await db.execute(
+        select(column.label("route")).filter(models.Run.id == id, models.Run.user_id == user_id)
+    )
+    return result.first()
+
+
+def _run_contribution(db_run: models.Run) -> Optional[RunContribution]:
+    """
+    완료된 기록이면 집계(사용자 합계/구간 집계)에 더해지는 값을, 아니면 None을 반환합니다.
+    """
+    if db_run.status != FINISHED_STATUS or db_run.created_at is None:
+        return None
+    return RunContribution(
+        bucket_start=bucket_start_of(db_run.created_at),
+        distance=db_run.distance or 0.0,
+        duration=db_run.duration or 0.0,
+        elevation_gain=db_run.total_elevation_gain or 0.0,
+        calories=db_run.calories_burned or 0.0,
+    )
+
+
+async def _apply_contribution_change(
+    db: AsyncSession,
+    db_run: models.Run,
+    old: Optional[RunContribution],
+    new: Optional[RunContribution],
+) -> None:
+    """
+    기록의 집계 기여분 변화(old → new)를 사용자 합계와 구간 집계에 같은 트랜잭션으로 반영합니다.
+    (완료 전환 / 완료 기록 수정 / 완료 취소 / 삭제)
+    """
+    runs_delta = int(new is not None) - int(old is not None)
+    distance_delta = (new.distance if new else 0.0) - (old.distance if old else 0.0)
+    if runs_delta or distance_delta:
+        await apply_run_totals(
+            db,
+            user_id=db_run.user_id,
+            runs_delta=runs_delta,
+            distance_delta=distance_delta,
+            run_at=db_run.created_at if runs_delta > 0 else None,
+            recompute_last_run_at=runs_delta < 0,
+        )
+    if old is not None:
+        await apply_stats_bucket(db, user_id=db_run.user_id, contribution=old, sign=-1)
+    if new is not None:
+        await apply_stats_bucket(db, user_id=db_run.user_id, contribution=new, sign=1)
+
+
+def _apply_run_metrics(db_run: models.Run, finished: FinishedRun, sent: set) -> None:
+    """
+    서버가 원시 샘플로 계산한 지표를 기록에 반영합니다.
+    클라이언트가 계산해 보낸 파생 값(distance, avg_pace, splits 등)은 덮어써 모든 클라이언트가 같은 값을 보게 합니다.
+    경과 시간(duration)과 경로는 클라이언트가 직접 보낸 경우 그대로 둡니다. (경로를 쓰면 함께 계산한 경로 단계도 채움)
+    """
+    metrics, encoded, levels = finished
+    db_run.distance = metrics.distance
+    db_run.moving_time = metrics.moving_time
+    db_run.avg_pace = metrics.avg_pace
+    db_run.calories_burned = metrics.calories_burned
+    db_run.splits = metrics.splits
+    db_run.chart_data = metrics.chart_data
+    if metrics.total_elevation_gain is not None:
+        db_run.total_elevation_gain = metrics.total_elevation_gain
+    if "duration" not in sent:
+        db_run.duration = metrics.duration
+    if not sent & {"route", "route_polyline"}:
+        db_run.route_polyline = encoded
+        set_route_levels(db_run, levels)
+
+
+async def _compute_finished(
+    raw: Optional[RawSamples], db_run: models.Run, weight_kg: Optional[float]
+) -> Optional[FinishedRun]:
+    """
+    샘플이 있으면 지표/경로/경로 단계를 계산합니다. 없으면 None (기존 값을 그대로 둠)
+    """
+    if raw is None or not len(raw):
+        return None
+    return await compute_finished_run(raw, weight_kg=weight_kg, avg_cadence=db_run.avg_cadence)
+
+
+async def update_run(
+    db: AsyncSession,
+    db_run: models.Run,
+    run_in: schemas.RunUpdate,
+    *,
+    weight_kg: Optional[float] = None,
+) -> models.Run:
+    """
+    러닝 기록을 부분 수정합니다.
+    완료 상태가 될 때 원시 GPS 샘플로 지표를 서버에서 한 번에 계산해 저장합니다. (weight_kg: 칼로리 계산용)
+    - 요청에 samples가 있으면 그것을, 없으면 POST /runs/{id}/points로 쌓인 묶음을 합쳐 사용합니다.
+    - 쌓인 묶음은 경로(route_polyline)와 지표로 합친 뒤 삭제합니다.
+    """
+    old = _run_contribution(db_run)
+    was_finished = db_run.status == FINISHED_STATUS
+    old_duration = db_run.duration
+
     update_data = run_in.model_dump(exclude_unset=True)
+    samples = update_data.pop("samples", None)
     for key, value in update_data.items():
         setattr(db_run, key, value)
+    # 클라이언트가 보낸 새 경로면 목록/지도용 단계를 만듭니다. (긴 경로는 route_executor에서, 행을 잠그기 전에)
+    await apply_route_levels(db_run)
+    # 샘플은 저장하지 않고 지표 계산에만 씁니다. (진행 중 기록의 samples는 무시)
+    if db_run.status == FINISHED_STATUS:
+        raw = samples or None
+        if raw is None and not was_finished:
+            raw = await run_points.load_samples(db, run_id=db_run.id)
+        # 샘플 변환, 지표, 경로 단계를 한 executor 작업으로 계산합니다. (긴 기록은 route_executor에서)
+        # 기록 행을 잠그기 전에 계산해, 계산을 기다리는 동안 같은 기록의 묶음 추가가 막히지 않게 합니다.
+        finished = await _compute_finished(raw, db_run, weight_kg)
+        if not was_finished:
+            # 묶음을 합치고 지우는 동안 새 묶음이 들어오지 않도록 기록 행을 잠급니다. (append_point_chunk는 FOR SHARE)
+            await db.execute(select(models.Run.id).filter(models.Run.id == db_run.id).with_for_update())
+            if not samples:
+                # 읽은 뒤 잠그기 전에 묶음이 더 들어왔으면 다시 합쳐 계산합니다. (드문 경로)
+                _, point_count, _ = await run_points.get_chunk_totals(db, run_id=db_run.id)
+                if point_count != (0 if raw is None else len(raw)):
+                    raw = await run_points.load_samples(db, run_id=db_run.id)
+                    finished = await _compute_finished(raw, db_run, weight_kg)
+            await run_points.delete_chunks(db, run_id=db_run.id)
+        if finished is not None:
+            _apply_run_metrics(db_run, finished, set(update_data))
     db.add(db_run)
+
+    new = _run_contribution(db_run)
+    if old != new:
+        await db.flush()
+        await _apply_contribution_change(db, db_run, old, new)
+    if db_run.duration != old_duration:
+        # 코스 도전에 쓴 기록이면 리더보드의 최고 기록도 바뀐 시간으로 다시 계산합니다.
+        attempt = await _get_attempt_owner(db, db_run.id)
+        if attempt is not None:
+            await db.flush()
+            await leaderboard.recompute_entry(db, course_id=attempt.course_id, user_id=attempt.user_id)
     await db.commit()
     await db.refresh(db_run)
     return db_run
 
 
+async def _get_attempt_owner(db: AsyncSession, run_id: uuid.UUID):
+    """
+    기록으로 만든 코스 도전의 (course_id, user_id). 도전에 쓰지 않은 기록이면 None
+    """
+    Attempt = models.CourseAttempt
+    result = await db.execute(select(Attempt.course_id, Attempt.user_id).filter(Attempt.run_id == run_id))
+    return result.first()
+
+
 async def delete_run(db: AsyncSession, db_run: models.Run):
+    """
+    기록을 삭제합니다. 코스 도전에 쓴 기록이면 도전 기록도 지우고 리더보드 항목을 남은 도전으로 다시 계산합니다.
+    """
+    old = _run_contribution(db_run)
+    attempt = await _get_attempt_owner(db, db_run.id)
+    if attempt is not None:
+        # 리더보드 항목은 attempt_id FK(ON DELETE CASCADE)로 함께 지워지고 recompute_entry가 다시 채웁니다.
+        await db.execute(delete(models.CourseAttempt).where(models.CourseAttempt.run_id == db_run.id))
     await db.delete(db_run)
+    if old is not None or attempt is not None:
+        # 삭제가 먼저 반영되어야 last_run_at/최고 기록을 남은 기록으로 다시 계산할 수 있습니다.
+        await db.flush()
+    if old is not None:
+        await _apply_contribution_change(db, db_run, old, None)
+    if attempt is not None:
+        await leaderboard.recompute_entry(db, course_id=attempt.course_id, user_id=attempt.user_id)
     await db.commit()
     return db_run
@@ -0,0 +1,90 @@
+# app/crud/run_points.py
+from sqlalchemy import delete, func, literal, select
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import List, Optional, Tuple
+import uuid
+
+import numpy as np
+
+from app import models
+from app.core.run_metrics import pack_samples, unpack_samples
+
+Chunk = models.RunPointChunk
+
+# crud.run.FINISHED_STATUS (crud.run이 이 모듈을 import하므로 값을 따로 둡니다)
+_FINISHED_STATUS = "finished"
+
+
+class RunNotInProgressError(Exception):
+    """
+    기록이 없거나 이미 완료(finished)되어 샘플 묶음을 더 받을 수 없을 때 발생합니다.
+    """
+
+
+async def append_point_chunk(
+    db: AsyncSession, *, run_id: uuid.UUID, seq: int, samples: np.ndarray
+) -> bool:
+    """
+    샘플 묶음 하나를 추가합니다. 같은 seq가 이미 있으면(재전송) 아무것도 바꾸지 않고 False를 반환합니다.
+    - 기록이 완료되지 않았을 때만 넣습니다. (조건부 INSERT, 완료됐으면 RunNotInProgressError)
+    - 기록 행을 FOR SHARE로 읽으므로, 완료 처리(update_run이 같은 행을 FOR UPDATE로 잠금) 중이면 끝날 때까지
+      기다렸다가 완료된 것을 보고 거절합니다. 완료 때 합쳐진 뒤 도착한 묶음이 남거나 사라지지 않습니다.
+    """
+    in_progress = (
+        select(
+            literal(run_id, models.Run.id.type),
+            literal(seq),
+            literal(len(samples)),
+            literal(pack_samples(samples), Chunk.points.type),
+        )
+        .where(models.Run.id == run_id, models.Run.status != _FINISHED_STATUS)
+        .with_for_update(read=True)
+    )
+    stmt = (
+        insert(Chunk)
+        .from_select(["run_id", "seq", "point_count", "points"], in_progress)
+        .on_conflict_do_nothing(index_elements=[Chunk.run_id, Chunk.seq])
+        .returning(Chunk.seq)
+    )
+    inserted = (await db.execute(stmt)).scalar_one_or_none() is not None
+    if not inserted:
+        # 재전송인지, 완료된 기록이라 거절된 것인지 구분합니다. (드문 경로)
+        status = await db.scalar(select(models.Run.status).where(models.Run.id == run_id))
+    await db.commit()
+    if not inserted and status in (None, _FINISHED_STATUS):
+        raise RunNotInProgressError(run_id)
+    return inserted
+
+
+async def get_chunk_totals(db: AsyncSession, *, run_id: uuid.UUID) -> Tuple[int, int, Optional[int]]:
+    """
+    (묶음 수, 샘플 수, 가장 큰 seq)를 반환합니다. 클라이언트가 어디까지 전송됐는지 확인하는 데 씁니다.
+    """
+    row = (
+        await db.execute(
+            select(func.count(), func.coalesce(func.sum(Chunk.point_count), 0), func.max(Chunk.seq)).where(
+                Chunk.run_id == run_id
+            )
+        )
+    ).one()
+    return int(row[0]), int(row[1]), row[2]
+
+
+async def load_samples(db: AsyncSession, *, run_id: uuid.UUID) -> Optional[np.ndarray]:
+    """
+    저장된 묶음을 seq 순으로 이어 붙인 (N, 4) 샘플 배열을 반환합니다. 묶음이 없으면 None입니다.
+    """
+    blobs: List[bytes] = (
+        await db.execute(select(Chunk.points).where(Chunk.run_id == run_id).order_by(Chunk.seq))
+    ).scalars().all()
+    if not blobs:
+        return None
+    return np.concatenate([unpack_samples(b) for b in blobs])
+
+
+async def delete_chunks(db: AsyncSession, *, run_id: uuid.UUID) -> None:
+    """
+    경로로 합친 뒤 묶음을 지웁니다. 커밋은 호출한 쪽의 트랜잭션에 맡깁니다.
+    """
+    await db.execute(delete(Chunk).where(Chunk.run_id == run_id))
@@ -1,92 +1,308 @@
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, func
-from datetime import datetime, timedelta
-from typing import List, Dict
+from sqlalchemy import Date, cast, delete, func, select, text
+from sqlalchemy.dialects.postgresql import insert
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta
+from typing import Callable, Dict, List, Literal, Optional, Tuple
+from zoneinfo import ZoneInfo
 import uuid
 import calendar
 
 from app import models, schemas
+from app.core.tz import local_midnight_utc, to_naive_utc
 
 # 1. 요일 순서를 정렬하기 위한 헬퍼 딕셔너리
 DAY_ORDER = {"월": 0, "화": 1, "수": 2, "목": 3, "금": 4, "토": 5, "일": 6}
+WEEKDAY_LABELS = list(DAY_ORDER)
 
-async def get_user_stats(db: AsyncSession, user_id: uuid.UUID, period: str) -> schemas.StatsResponse:
-    end_date = datetime.utcnow()
+Bucket = models.UserStatsBucket
+
+# 집계 구간 길이(분). 모든 IANA 시간대 오프셋이 15분의 배수라서 이 단위면 어느 시간대로도 정확히 나뉩니다.
+BUCKET_MINUTES = 15
+
+Granularity = Literal["day", "week", "month", "year"]
+
+# 임의 기간 조회에서 한 번에 돌려주는 막대 수 상한
+MAX_SERIES_BUCKETS = 400
+
+
+def bucket_start_of(ts: datetime) -> datetime:
+    """
+    기록 시각이 속한 집계 구간의 시작(UTC, 15분 단위 내림)을 반환합니다.
+    """
+    ts = to_naive_utc(ts)
+    return ts.replace(minute=ts.minute - ts.minute % BUCKET_MINUTES, second=0, microsecond=0)
+
+
+@dataclass(frozen=True)
+class RunContribution:
+    """
+    완료된 러닝 기록 하나가 구간 집계에 더하는 값
+    """
+    bucket_start: datetime
+    distance: float
+    duration: float
+    elevation_gain: float
+    calories: float
+
+
+async def apply_stats_bucket(
+    db: AsyncSession, *, user_id: uuid.UUID, contribution: RunContribution, sign: int
+) -> None:
+    """
+    구간 집계 행에 기록 하나의 기여분을 더하거나(sign=1) 뺍니다(sign=-1).
+    - INSERT ... ON CONFLICT DO UPDATE(col = col + excluded.col)라서 동시에 갱신되어도 값이 유실되지 않습니다.
+    - 러닝 수가 0이 된 행은 지웁니다.
+    커밋은 호출한 쪽의 트랜잭션에 맡깁니다.
+    """
+    stmt = insert(Bucket).values(
+        user_id=user_id,
+        bucket_start=contribution.bucket_start,
+        run_count=sign,
+        total_distance=sign * contribution.distance,
+        total_duration=sign * contribution.duration,
+        total_elevation_gain=sign * contribution.elevation_gain,
+        total_calories=sign * contribution.calories,
+    )
+    columns = ("run_count", "total_distance", "total_duration", "total_elevation_gain", "total_calories")
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[Bucket.user_id, Bucket.bucket_start],
+        set_={name: getattr(Bucket, name) + getattr(stmt.excluded, name) for name in columns},
+    )
+    await db.execute(stmt)
+
+    if sign < 0:
+        await db.execute(
+            delete(Bucket).where(
+                Bucket.user_id == user_id,
+                Bucket.bucket_start == contribution.bucket_start,
+                Bucket.run_count <= 0,
+            )
+        )
+
+
+# 완료된 러닝 기록으로 구간 집계를 다시 만드는 SQL (마이그레이션 백필/재구축 명령에서 사용)
+REBUILD_STATS_BUCKETS_SQL = """
+    INSERT INTO user_stats_buckets
+        (user_id, bucket_start, run_count, total_distance, total_duration, total_elevation_gain, total_calories)
+    SELECT user_id,
+           date_bin('15 minutes', created_at, TIMESTAMP '2000-01-01'),
+           COUNT(*),
+           COALESCE(SUM(distance), 0),
+           COALESCE(SUM(duration), 0),
+           COALESCE(SUM(total_elevation_gain), 0),
+           COALESCE(SUM(calories_burned), 0)
+    FROM runs
+    WHERE status = 'finished' AND created_at IS NOT NULL {user_filter}
+    GROUP BY 1, 2
+"""
+
+
+async def rebuild_stats_buckets(db: AsyncSession, user_id: Optional[uuid.UUID] = None) -> None:
+    """
+    runs 테이블로부터 구간 집계를 다시 만듭니다. (user_id가 없으면 전체 사용자)
+    """
+    if user_id is None:
+        await db.execute(delete(Bucket))
+        await db.execute(text(REBUILD_STATS_BUCKETS_SQL.format(user_filter="")))
+    else:
+        await db.execute(delete(Bucket).where(Bucket.user_id == user_id))
+        await db.execute(
+            text(REBUILD_STATS_BUCKETS_SQL.format(user_filter="AND user_id = :user_id")),
+            {"user_id": user_id},
+        )
+    await db.commit()
+
+
+@dataclass
+class _Totals:
+    run_count: int = 0
+    distance: float = 0.0
+    duration: float = 0.0
+
+    def add(self, other: "_Totals") -> None:
+        self.run_count += other.run_count
+        self.distance += other.distance
+        self.duration += other.duration
+
+
+# 현지 날짜를 묶는 단위 (date_trunc). week는 월요일부터 시작합니다.
+PeriodUnit = Literal["day", "week", "month", "year"]
+
+
+async def _get_local_period_totals(
+    db: AsyncSession,
+    *,
+    user_id: uuid.UUID,
+    zone: ZoneInfo,
+    start: Optional[date],
+    end: Optional[date],
+    unit: PeriodUnit,
+) -> Dict[date, _Totals]:
+    """
+    시간대 zone 기준 [start, end) 날짜 범위의 구간 집계를 현지 기간(unit)의 시작 날짜별로 합산해 반환합니다.
+    - 현지 날짜 경계를 UTC로 바꿔 (user_id, bucket_start) 기본 키 범위 하나만 읽습니다.
+    - 15분 구간은 현지 날짜 경계를 넘지 않으므로 구간 시작 시각의 현지 날짜로 묶으면 정확합니다.
+    - 묶기는 DB에서 하므로 기간 수만큼의 행만 돌려받습니다. (구간 행을 모두 가져오지 않음)
+    """
+    local_start = func.timezone(zone.key, func.timezone("UTC", Bucket.bucket_start))
+    period = cast(func.date_trunc(unit, local_start), Date).label("period")
+    query = (
+        select(
+            period,
+            func.sum(Bucket.run_count).label("run_count"),
+            func.sum(Bucket.total_distance).label("distance"),
+            func.sum(Bucket.total_duration).label("duration"),
+        )
+        .where(Bucket.user_id == user_id)
+        .group_by(period)
+    )
+    if start is not None:
+        query = query.where(Bucket.bucket_start >= local_midnight_utc(start, zone))
+    if end is not None:
+        query = query.where(Bucket.bucket_start < local_midnight_utc(end, zone))
+    rows = (await db.execute(query)).all()
+    return {row.period: _Totals(int(row.run_count), float(row.distance), float(row.duration)) for row in rows}
+
+
+def _stats_response(
+    totals: _Totals, chart: List[Tuple[str, float]], zone: ZoneInfo
+) -> schemas.StatsResponse:
+    avg_pace = (totals.duration / (totals.distance / 1000)) if totals.distance > 0 else 0.0
+    return schemas.StatsResponse(
+        total_distance_km=totals.distance / 1000,
+        total_runs=totals.run_count,
+        total_duration_seconds=totals.duration,
+        avg_pace_per_km=avg_pace,
+        chart_data=[schemas.BarChartData(label=label, value=value) for label, value in chart],
+        timezone=zone.key,
+    )
+
+
+async def get_user_stats(
+    db: AsyncSession, user_id: uuid.UUID, period: str, zone: ZoneInfo
+) -> schemas.StatsResponse:
+    """
+    이번 주/이번 달/올해/전체 통계를 시간대 zone의 날짜 기준으로 계산합니다.
+    """
+    today = datetime.now(zone).date()
     chart_labels: List[str] = []
-    
+    start_date: Optional[date]
+    end_date: Optional[date]
+    unit: PeriodUnit
+    label_of: Callable[[date], str]
+
     # 2. 기간별로 완전한 X축 라벨 목록을 미리 생성합니다.
     if period == "weekly":
         # 이번 주의 월요일을 시작일로 설정
-        start_date = end_date - timedelta(days=end_date.weekday())
-        start_date = start_date.replace(hour=0, minute=0, second=0, microsecond=0)
-        chart_labels = ["월", "화", "수", "목", "금", "토", "일"]
-        # PostgreSQL의 요일 형식 ('Mon', 'Tue'...)
-        group_by_format = func.to_char(models.Run.created_at, 'Dy')
+        start_date = today - timedelta(days=today.weekday())
+        end_date = start_date + timedelta(days=7)
+        chart_labels = WEEKDAY_LABELS
+        unit = "day"
+        label_of = lambda d: WEEKDAY_LABELS[d.weekday()]
     elif period == "monthly":
-        first_day_of_month = end_date.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
-        start_date = first_day_of_month
-        _, num_days = calendar.monthrange(end_date.year, end_date.month)
+        start_date = today.replace(day=1)
+        _, num_days = calendar.monthrange(today.year, today.month)
+        end_date = start_date + timedelta(days=num_days)
         chart_labels = [f"{i:02d}" for i in range(1, num_days + 1)] # '01', '02', ...
-        group_by_format = func.to_char(models.Run.created_at, 'DD')
+        unit = "day"
+        label_of = lambda d: f"{d.day:02d}"
     elif period == "yearly":
-        first_day_of_year = end_date.replace(month=1, day=1, hour=0, minute=0, second=0, microsecond=0)
-        start_date = first_day_of_year
+        start_date = today.replace(month=1, day=1)
+        end_date = start_date.replace(year=today.year + 1)
         chart_labels = [f"{i:02d}월" for i in range(1, 13)] # '01월', '02월', ...
-        group_by_format = func.to_char(models.Run.created_at, 'MM"월"')
+        unit = "month"
+        label_of = lambda d: f"{d.month:02d}월"
     else: # all
-        start_date = datetime.min
+        start_date = end_date = None
         # '전체' 기간은 연도별로 그룹화합니다.
-        group_by_format = func.to_char(models.Run.created_at, 'YYYY')
-
-    # 기본 통계 쿼리
-    base_query = select(
-        func.coalesce(func.sum(models.Run.distance), 0.0),
-        func.count(models.Run.id),
-        func.coalesce(func.sum(models.Run.duration), 0.0)
-    ).where(
-        models.Run.user_id == user_id,
-        models.Run.status == 'finished', # 완료된 러닝만 통계에 포함
-        models.Run.created_at >= start_date if period != "all" else True
+        unit = "year"
+        label_of = lambda d: f"{d.year:04d}"
+
+    periods = await _get_local_period_totals(
+        db, user_id=user_id, zone=zone, start=start_date, end=end_date, unit=unit
     )
-    total_distance, total_runs, total_duration = (await db.execute(base_query)).first()
-    avg_pace = (total_duration / (total_distance / 1000)) if total_distance > 0 else 0.0
-
-    # 차트 데이터 쿼리
-    chart_query = select(
-        group_by_format.label('label'),
-        func.sum(models.Run.distance / 1000).label('value')
-    ).where(
-        models.Run.user_id == user_id,
-        models.Run.status == 'finished',
-        models.Run.created_at >= start_date if period != "all" else True
-    ).group_by('label').order_by('label')
-    
-    db_results = (await db.execute(chart_query)).all()
-    
-    # 3. DB 결과를 딕셔너리로 변환하여 쉽게 찾을 수 있도록 합니다.
-    day_map = {"Mon": "월", "Tue": "화", "Wed": "수", "Thu": "목", "Fri": "금", "Sat": "토", "Sun": "일"}
+
+    # 3. 라벨별 거리(km)를 합산합니다.
+    totals = _Totals()
     results_map: Dict[str, float] = {}
-    for row in db_results:
-        label = row.label.strip()
-        if period == "weekly" and label in day_map:
-            label = day_map[label]
-        results_map[label] = float(row.value)
+    for period_start, period_totals in periods.items():
+        totals.add(period_totals)
+        label = label_of(period_start)
+        results_map[label] = results_map.get(label, 0.0) + period_totals.distance / 1000
 
     # 4. 미리 생성된 라벨 목록을 기준으로 최종 차트 데이터를 만듭니다.
     if period != "all":
-        chart_data_list = [
-            schemas.BarChartData(label=label, value=results_map.get(label, 0.0))
-            for label in chart_labels
-        ]
-        if period == "weekly":
-            chart_data_list.sort(key=lambda x: DAY_ORDER[x.label])
-    else: # '전체'는 DB 결과 그대로 사용
-        chart_data_list = [schemas.BarChartData(label=label, value=value) for label, value in sorted(results_map.items())]
+        chart = [(label, results_map.get(label, 0.0)) for label in chart_labels]
+    else: # '전체'는 기록이 있는 연도만 사용
+        chart = sorted(results_map.items())
+    return _stats_response(totals, chart, zone)
 
-    return schemas.StatsResponse(
-        total_distance_km=total_distance / 1000,
-        total_runs=total_runs,
-        total_duration_seconds=total_duration,
-        avg_pace_per_km=avg_pace,
-        chart_data=chart_data_list
-    )
\ No newline at end of file
+
+def _period_start(day: date, granularity: Granularity) -> date:
+    if granularity == "week":
+        return day - timedelta(days=day.weekday())
+    if granularity == "month":
+        return day.replace(day=1)
+    if granularity == "year":
+        return day.replace(month=1, day=1)
+    return day
+
+
+def _next_period(start: date, granularity: Granularity) -> date:
+    if granularity == "week":
+        return start + timedelta(days=7)
+    if granularity == "month":
+        return start.replace(year=start.year + start.month // 12, month=start.month % 12 + 1)
+    if granularity == "year":
+        return start.replace(year=start.year + 1)
+    return start + timedelta(days=1)
+
+
+def _period_label(start: date, granularity: Granularity) -> str:
+    # day/week: 'YYYY-MM-DD'(주는 월요일), month: 'YYYY-MM', year: 'YYYY'
+    if granularity == "month":
+        return f"{start.year:04d}-{start.month:02d}"
+    if granularity == "year":
+        return f"{start.year:04d}"
+    return start.isoformat()
+
+
+async def get_user_stats_series(
+    db: AsyncSession,
+    user_id: uuid.UUID,
+    *,
+    date_from: date,
+    date_to: date,
+    granularity: Granularity,
+    zone: ZoneInfo,
+) -> schemas.StatsResponse:
+    """
+    시간대 zone 기준 date_from ~ date_to(포함) 기간의 통계를 granularity 단위 막대로 계산합니다.
+    - 기록이 없는 구간도 0으로 채워 연속된 라벨을 돌려줍니다.
+    - 첫/마지막 막대는 기간에 걸친 날짜만 합산합니다.
+    막대 수가 MAX_SERIES_BUCKETS를 넘거나 기간이 뒤집혀 있으면 ValueError를 발생시킵니다.
+    """
+    if date_to < date_from:
+        raise ValueError("'to' must not be earlier than 'from'")
+
+    periods: List[date] = []
+    start = _period_start(date_from, granularity)
+    while start <= date_to:
+        periods.append(start)
+        if len(periods) > MAX_SERIES_BUCKETS:
+            raise ValueError(f"too many buckets (max {MAX_SERIES_BUCKETS}); use a coarser granularity")
+        start = _next_period(start, granularity)
+
+    by_period = await _get_local_period_totals(
+        db, user_id=user_id, zone=zone, start=date_from, end=date_to + timedelta(days=1), unit=granularity
+    )
+
+    totals = _Totals()
+    distance_by_period: Dict[date, float] = {}
+    for period_start, period_totals in by_period.items():
+        totals.add(period_totals)
+        distance_by_period[period_start] = period_totals.distance / 1000
+
+    chart = [(_period_label(p, granularity), distance_by_period.get(p, 0.0)) for p in periods]
+    return _stats_response(totals, chart, zone)
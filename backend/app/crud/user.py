@@ -1,20 +1,22 @@
+from sqlalchemy import func, update
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
-from sqlalchemy.orm import selectinload
+from sqlalchemy.orm import defer
+from datetime import datetime
 from typing import List, Optional
 import uuid
 from app import models, schemas
-from app.core.security import get_password_hash
+from app.core.security import UNUSABLE_PASSWORD, hash_password
 
 # ----> social_id로 사용자를 찾는 함수 추가 <----
 async def get_user_by_social_id(db: AsyncSession, social_id: str) -> Optional[models.User]:
-    query = select(models.User).options(selectinload(models.User.runs)).filter(models.User.social_id == social_id)
+    query = select(models.User).filter(models.User.social_id == social_id)
     result = await db.execute(query)
     return result.scalars().first()
 
 # ----> 이메일로 사용자를 찾는 함수는 그대로 둡니다 <----
 async def get_user_by_email(db: AsyncSession, email: str) -> Optional[models.User]:
-    query = select(models.User).options(selectinload(models.User.runs)).filter(models.User.email == email)
+    query = select(models.User).filter(models.User.email == email)
     result = await db.execute(query)
     return result.scalars().first()
 
@@ -30,13 +32,12 @@ async def get_or_create_social_user(db: AsyncSession, user_in: schemas.UserSocia
 
     # 2. 없으면 새로운 사용자 생성
     # 이메일은 필수가 아니므로, 카카오 회원번호를 기반으로 고유한 가상 이메일을 생성합니다.
-    # 비밀번호는 소셜 로그인이므로, 강력한 임의의 값으로 채웁니다.
-    random_password = uuid.uuid4().hex
+    # 비밀번호는 소셜 로그인이므로, 비밀번호 로그인이 불가능한 값으로 둡니다. (임의 비밀번호를 해싱하지 않음)
     new_user_data = models.User(
         social_id=user_in.social_id,
         email=f"kakao_{user_in.social_id}@r3.app",
         nickname=user_in.nickname,
-        hashed_password=get_password_hash(random_password)
+        hashed_password=UNUSABLE_PASSWORD
     )
     db.add(new_user_data)
     await db.commit()
@@ -45,7 +46,10 @@ async def get_or_create_social_user(db: AsyncSession, user_in: schemas.UserSocia
 
 # ----> 기존 create_user 함수는 혹시 모르니 그대로 둡니다 <----
 async def create_user(db: AsyncSession, user: schemas.UserCreate) -> models.User:
-    hashed_password = get_password_hash(user.password)
+    """
+    비밀번호 해싱은 password_executor에서 실행합니다. (대기열이 가득 차면 ExecutorSaturatedError)
+    """
+    hashed_password = await hash_password(user.password)
     db_user = models.User(
         email=user.email,
         nickname=user.nickname,
@@ -54,17 +58,30 @@ async def create_user(db: AsyncSession, user: schemas.UserCreate) -> models.User
     db.add(db_user)
     await db.commit()
     await db.refresh(db_user)
-    created_user = await get_user_by_email(db, email=db_user.email)
-    return created_user
+    return db_user
 
 async def get_user_by_id(db: AsyncSession, user_id: uuid.UUID) -> Optional[models.User]:
     """
-    사용자 ID로 사용자를 조회합니다. (runs 관계를 즉시 로딩)
+    사용자 ID로 사용자를 조회합니다. (인증용: users 행 하나만 읽습니다)
+    - 관계(runs 등)는 로딩하지 않고, 인증에 필요 없는 hashed_password도 읽지 않습니다.
     """
-    query = select(models.User).options(selectinload(models.User.runs)).filter(models.User.id == user_id)
+    query = (
+        select(models.User)
+        .options(defer(models.User.hashed_password, raiseload=True))
+        .filter(models.User.id == user_id)
+    )
     result = await db.execute(query)
     return result.scalars().first()
 
+async def update_password_hash(db: AsyncSession, *, user_id: uuid.UUID, hashed_password: str) -> None:
+    """
+    해시 설정이 바뀐 뒤 로그인한 사용자의 비밀번호 해시를 새 해시로 바꿉니다. (login의 verify_password_async 결과)
+    """
+    await db.execute(
+        update(models.User).where(models.User.id == user_id).values(hashed_password=hashed_password)
+    )
+    await db.commit()
+
 async def update_user(db: AsyncSession, *, db_user: models.User, user_in: schemas.UserUpdate) -> models.User:
     """
     사용자 정보를 수정합니다.
@@ -80,4 +97,62 @@ async def update_user(db: AsyncSession, *, db_user: models.User, user_in: schema
     await db.commit()
     await db.refresh(db_user)
     return db_user
-    
\ No newline at end of file
+
+async def apply_run_totals(
+    db: AsyncSession,
+    *,
+    user_id: uuid.UUID,
+    runs_delta: int = 0,
+    distance_delta: float = 0.0,
+    run_at: Optional[datetime] = None,
+    recompute_last_run_at: bool = False,
+) -> None:
+    """
+    사용자의 러닝 집계(total_runs / total_distance / last_run_at)를 증분 갱신합니다.
+    - 단일 UPDATE 문(col = col + delta)이라 동시에 여러 기록이 완료되어도 값이 유실되지 않습니다.
+    - run_at: 새로 집계에 포함된 기록의 시각. 기존 last_run_at보다 늦을 때만 반영합니다.
+    - recompute_last_run_at: 기록이 집계에서 빠졌을 때(삭제 등) 남은 완료 기록으로 last_run_at을 다시 구합니다.
+    커밋은 호출한 쪽의 트랜잭션에 맡깁니다.
+    """
+    values = {
+        "total_runs": models.User.total_runs + runs_delta,
+        "total_distance": models.User.total_distance + distance_delta,
+    }
+    if recompute_last_run_at:
+        values["last_run_at"] = (
+            select(func.max(models.Run.created_at))
+            .where(models.Run.user_id == user_id, models.Run.status == "finished")
+            .scalar_subquery()
+        )
+    elif run_at is not None:
+        # PostgreSQL의 GREATEST는 NULL을 무시하므로 첫 기록이면 run_at이 됩니다.
+        values["last_run_at"] = func.greatest(models.User.last_run_at, run_at)
+    await db.execute(
+        update(models.User)
+        .where(models.User.id == user_id)
+        .values(**values)
+        .execution_options(synchronize_session=False)
+    )
+
+async def rebuild_run_totals(db: AsyncSession, user_id: Optional[uuid.UUID] = None) -> None:
+    """
+    완료된 러닝 기록으로 사용자 집계(total_runs / total_distance / last_run_at)를 다시 계산합니다.
+    (user_id가 없으면 전체 사용자)
+    """
+    finished = models.Run.status == "finished"
+    values = {
+        "total_runs": select(func.count(models.Run.id))
+        .where(models.Run.user_id == models.User.id, finished)
+        .scalar_subquery(),
+        "total_distance": select(func.coalesce(func.sum(models.Run.distance), 0.0))
+        .where(models.Run.user_id == models.User.id, finished)
+        .scalar_subquery(),
+        "last_run_at": select(func.max(models.Run.created_at))
+        .where(models.Run.user_id == models.User.id, finished)
+        .scalar_subquery(),
+    }
+    stmt = update(models.User).values(**values).execution_options(synchronize_session=False)
+    if user_id is not None:
+        stmt = stmt.where(models.User.id == user_id)
+    await db.execute(stmt)
+    await db.commit()
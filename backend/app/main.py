@@ -1,12 +1,26 @@
 # backend/app/main.py
-from pathlib import Path
+import asyncio
+import logging
 
-from fastapi import FastAPI
+from fastapi import FastAPI, Request, status
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.staticfiles import StaticFiles
+from fastapi.responses import JSONResponse
 
 from app.core.config import settings
-from app.api.v1 import users, login, runs, courses, course_attempts, albums
+from app.core.executor import (
+    ExecutorSaturatedError,
+    ExecutorTimeoutError,
+    media_executor,
+    password_executor,
+    route_executor,
+    scoring_executor,
+    thumbnail_executor,
+)
+from app.core.jobs import close_job_queues
+from app.core.leaderboard_index import close_leaderboard_index
+from app.core.live import close_live_broker
+from app.worker import requeue_pending_attempts, run_media_gc, run_worker
+from app.api.v1 import users, login, runs, live, courses, course_attempts, albums, media
 
 app = FastAPI(
     title="R3 Project API",
@@ -21,12 +35,57 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    # 목록 API의 다음 페이지 커서를 브라우저 클라이언트에서도 읽을 수 있도록 노출합니다.
+    expose_headers=["X-Next-Cursor"],
 )
 
-# --- 정적 파일 서빙: 업로드된 이미지(/app/media)를 /media로 노출 ---
-# 디렉토리가 없으면 생성해둡니다(StaticFiles mount 시 오류 방지)
-Path(settings.MEDIA_ROOT).mkdir(parents=True, exist_ok=True)
-app.mount(settings.MEDIA_URL, StaticFiles(directory=settings.MEDIA_ROOT), name="media")
+logger = logging.getLogger(__name__)
+
+# --- CPU 풀 backpressure: 대기열이 가득 차면 429, 시간 초과면 503 (detail은 풀마다, Retry-After 포함) ---
+async def executor_saturated_handler(request: Request, exc: ExecutorSaturatedError) -> JSONResponse:
+    return JSONResponse(
+        status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+        content={"detail": exc.detail},
+        headers={"Retry-After": str(exc.retry_after)},
+    )
+
+async def executor_timeout_handler(request: Request, exc: ExecutorTimeoutError) -> JSONResponse:
+    return JSONResponse(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        content={"detail": exc.detail},
+        headers={"Retry-After": str(exc.retry_after)},
+    )
+
+app.add_exception_handler(ExecutorSaturatedError, executor_saturated_handler)
+app.add_exception_handler(ExecutorTimeoutError, executor_timeout_handler)
+
+# --- 백그라운드 작업: inprocess 큐면 API 프로세스 안에서 컨슈머를 실행합니다 ---
+@app.on_event("startup")
+async def start_background_workers():
+    if settings.JOB_QUEUE_BACKEND != "inprocess":
+        return  # redis 큐는 별도 워커(python -m app.worker)가 처리 (미디어 GC 포함)
+    try:
+        await requeue_pending_attempts()
+    except Exception:
+        logger.exception("failed to requeue pending course attempts")
+    app.state.worker_task = asyncio.create_task(run_worker())
+    if settings.MEDIA_GC_INTERVAL_SECONDS > 0:
+        app.state.media_gc_task = asyncio.create_task(run_media_gc())
+
+@app.on_event("shutdown")
+async def shutdown_background_workers():
+    for name in ("worker_task", "media_gc_task"):
+        task = getattr(app.state, name, None)
+        if task is not None:
+            task.cancel()
+    await close_job_queues()
+    await close_live_broker()
+    await close_leaderboard_index()
+    scoring_executor.shutdown()
+    thumbnail_executor.shutdown()
+    route_executor.shutdown()
+    media_executor.shutdown()
+    password_executor.shutdown()
 
 @app.get("/")
 def read_root():
@@ -36,9 +95,13 @@ def read_root():
 app.include_router(users.router, prefix="/api/v1/users", tags=["users"])
 app.include_router(login.router, prefix="/api/v1", tags=["login"])
 app.include_router(runs.router, prefix="/api/v1/runs", tags=["runs"])
+# 실시간 트래킹 WebSocket: /api/v1/runs/{run_id}/live, /api/v1/runs/{run_id}/live/watch
+app.include_router(live.router, prefix="/api/v1/runs", tags=["live"])
 app.include_router(courses.router, prefix="/api/v1/courses", tags=["courses"])
 app.include_router(course_attempts.router, prefix="/api/v1", tags=["course_attempts"])
 # 앨범 라우터: 파일 내부에서 prefix="/albums"이므로 여기선 "/api/v1"만 추가하면 "/api/v1/albums" 완성
 app.include_router(albums.router, prefix="/api/v1", tags=["albums"])
+# 업로드된 이미지(MEDIA_ROOT)를 MEDIA_URL(/media)로 노출: 캐시 헤더/ETag/Range/권한 확인 (app.api.v1.media)
+app.include_router(media.router, prefix=settings.MEDIA_URL, tags=["media"])
 
 # app.include_router(posts.router, prefix="/api/v1/posts", tags=["posts"])  # (미사용시 주석 유지)
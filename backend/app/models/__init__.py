@@ -1,4 +1,9 @@
+# 관계(relationship) 로딩 정책
+# - 모든 관계는 lazy="raise"입니다. 접근하려면 쿼리에서 selectinload 등 로더 옵션을 명시해야 합니다.
+# - 인증(get_current_user)처럼 모든 요청이 거치는 경로가 연관 테이블을 끌고 오지 않도록 하기 위함입니다.
 from .user import User
-from .run import Run
-from .course import Course, CourseAttempt
+from .run import Run, RunPointChunk
+from .course import Course, CourseAttempt, CourseLeaderboardEntry
+from .stats import UserStatsBucket
+from .media import MediaBlob
 #from .post import Post, Comment
\ No newline at end of file
@@ -1,7 +1,7 @@
 # backend/app/models/album.py
 from uuid import uuid4
 
-from sqlalchemy import Column, String, Text, ForeignKey, TIMESTAMP, text
+from sqlalchemy import Column, String, Text, ForeignKey, TIMESTAMP, inspect, text
 from sqlalchemy.dialects.postgresql import UUID, JSONB
 from sqlalchemy.orm import relationship
 
@@ -16,6 +16,9 @@ class Album(Base):
 
     original_url = Column(Text, nullable=True)
     composed_url = Column(Text, nullable=False)
+    # 위 URL이 콘텐츠 주소 저장소(media_blobs)를 가리키면 그 해시 (참조 수 관리용, 예전 업로드는 NULL)
+    original_blob = Column(String(64), ForeignKey("media_blobs.sha256"), nullable=True, index=True)
+    composed_blob = Column(String(64), ForeignKey("media_blobs.sha256"), nullable=True, index=True)
 
     caption = Column(String(255), nullable=True)
     tags = Column(JSONB, nullable=True)
@@ -23,5 +26,17 @@ class Album(Base):
 
     created_at = Column(TIMESTAMP(timezone=False), nullable=False, server_default=text("now()"))
 
-    user = relationship("User", lazy="selectin")
-    run = relationship("Run", lazy="selectin")
+    user = relationship("User", lazy="raise")
+    run = relationship("Run", lazy="raise")
+    # 목록/조회 응답의 파생본(composed_image)용. crud.album의 조회 함수가 함께 읽어 둡니다.
+    composed_media = relationship("MediaBlob", foreign_keys=[composed_blob], lazy="raise")
+
+    @property
+    def composed_image(self):
+        """
+        합성 이미지의 파생본 정보(MediaBlob). 예전 업로드/파생본 없음/함께 읽지 않은 경우 None
+        """
+        if "composed_media" in inspect(self).unloaded:
+            return None
+        media = self.composed_media
+        return media if media is not None and media.variants is not None else None
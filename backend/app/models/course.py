@@ -1,17 +1,18 @@
 # app/models/course.py
 import uuid
 from typing import TYPE_CHECKING
-from sqlalchemy import Column, String, Boolean, DateTime, Float, ForeignKey, Text, UniqueConstraint, Index
-from sqlalchemy.dialects.postgresql import UUID, JSONB
-from sqlalchemy.orm import relationship
+from sqlalchemy import Column, String, Boolean, DateTime, Float, ForeignKey, LargeBinary, Text, UniqueConstraint, Index, Computed, text
+from sqlalchemy.dialects.postgresql import ARRAY, UUID, JSONB
+from sqlalchemy.orm import deferred, relationship
 from sqlalchemy.sql import func
 from app.db.session import Base
+from app.models.route import RouteMixin
 
 if TYPE_CHECKING:
     from .run import Run
     from .user import User
 
-class Course(Base):
+class Course(RouteMixin, Base):
     __tablename__ = "courses"
 
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
@@ -22,7 +23,9 @@ class Course(Base):
     original_run_id = Column(UUID(as_uuid=True), ForeignKey("runs.id"), nullable=True)
 
     distance = Column(Float, nullable=False)  # meters
-    route = Column(JSONB, nullable=True)      # 초기엔 JSONB 유지(추후 PostGIS로 이관)
+    # route / route_polyline: RouteMixin (encoded polyline bytea, 단순화된 경로)
+    # 단순화 전 원본 경로 (보관용, 응답/계산에는 쓰지 않으므로 명시적으로 요청할 때만 읽습니다)
+    raw_route_polyline = deferred(Column(LargeBinary, nullable=True), raiseload=True)
     rally_points = Column(JSONB, nullable=True)
 
     status = Column(String, default="draft", nullable=False)       # draft/published/archived
@@ -30,20 +33,32 @@ class Course(Base):
 
     created_at = Column(DateTime, server_default=func.now(), nullable=False)
 
+    # 검색용 생성 컬럼 (DB가 name/description으로 계산, 쿼리 조건에만 사용)
+    # - search_text: 소문자 본문 (pg_trgm 유사도 순위/오타 허용 검색)
+    # - search_bigrams: 단어별 2글자 조각 (한글 2음절 검색어도 단어 중간까지 색인으로 찾기 위함)
+    search_text = deferred(
+        Column(Text, Computed("lower(name || ' ' || coalesce(description, ''))", persisted=True)),
+        raiseload=True,
+    )
+    search_bigrams = deferred(
+        Column(ARRAY(Text), Computed("r3_bigrams(name || ' ' || coalesce(description, ''))", persisted=True)),
+        raiseload=True,
+    )
+
     # 관계
-    owner = relationship("User", lazy="selectin")
+    owner = relationship("User", lazy="raise")
     # ✅ 오타 수정: back_populates
     # ✅ Run과의 역방향 관계 이름이 created_course여야 함
     original_run = relationship(
         "Run",
         back_populates="created_course",
-        lazy="selectin",
+        lazy="raise",
     )
 
     attempts = relationship(
         "CourseAttempt",
         back_populates="course",
-        lazy="selectin",
+        lazy="raise",
         cascade="all, delete-orphan",
     )
 
@@ -52,6 +67,28 @@ class Course(Base):
         UniqueConstraint('user_id', 'name', name='uq_courses_user_name'),
         Index('ix_courses_status', 'status'),
         Index('ix_courses_visibility', 'visibility'),
+        # 공간 쿼리용 GiST 인덱스 (RouteMixin)
+        Index('ix_courses_path', 'path', postgresql_using='gist'),
+        Index('ix_courses_start_point', 'start_point', postgresql_using='gist'),
+        Index('ix_courses_bbox', 'bbox', postgresql_using='gist'),
+        # 주변 공개 코스 탐색(GET /courses/nearby)용 부분 인덱스
+        Index(
+            'ix_courses_public_start_point', 'start_point',
+            postgresql_using='gist',
+            postgresql_where=text("status = 'published' AND visibility = 'public'"),
+        ),
+        # 공개 코스 검색(GET /courses/search/)용 부분 GIN 인덱스
+        Index(
+            'ix_courses_public_search_text', 'search_text',
+            postgresql_using='gin',
+            postgresql_ops={'search_text': 'gin_trgm_ops'},
+            postgresql_where=text("status = 'published' AND visibility = 'public'"),
+        ),
+        Index(
+            'ix_courses_public_search_bigrams', 'search_bigrams',
+            postgresql_using='gin',
+            postgresql_where=text("status = 'published' AND visibility = 'public'"),
+        ),
     )
 
 
@@ -67,10 +104,42 @@ class CourseAttempt(Base):
     # 서버가 계산하여 기록(생성 시 필수 X)
     similarity_score = Column(Float, nullable=True)
     is_successful = Column(Boolean, default=False, nullable=False)
+    # 채점 상태: pending(비동기 채점 대기) / scoring(워커가 가져가 채점 중) / scored / failed
+    status = Column(String, default="scored", server_default="scored", nullable=False)
+    # 워커가 pending → scoring으로 가져간 시각 (오래 끝나지 않으면 워커가 죽은 것으로 보고 다시 pending으로 되돌림)
+    claimed_at = Column(DateTime, nullable=True)
 
     attempted_at = Column(DateTime, server_default=func.now(), nullable=False)
 
     # 관계
-    user = relationship("User", lazy="selectin")
-    course = relationship("Course", back_populates="attempts", lazy="selectin")
-    run = relationship("Run", back_populates="course_attempt", lazy="selectin")
+    user = relationship("User", lazy="raise")
+    course = relationship("Course", back_populates="attempts", lazy="raise")
+    run = relationship("Run", back_populates="course_attempt", lazy="raise")
+
+    __table_args__ = (
+        Index("ix_course_attempts_pending", "attempted_at", postgresql_where=text("status = 'pending'")),
+    )
+
+
+class CourseLeaderboardEntry(Base):
+    """
+    코스별 사용자 최고 기록 (사용자당 한 행)
+    - 성공한 도전이 채점될 때 더 빠른 기록이면 갱신됩니다. (crud.leaderboard)
+    - 순위: (best_duration, achieved_at, user_id) 오름차순. 순위/구간 조회는 이 테이블의 사본인
+      정렬 집합(app.core.leaderboard_index)으로 O(log n)에 합니다.
+    """
+    __tablename__ = "course_leaderboard"
+
+    course_id = Column(UUID(as_uuid=True), ForeignKey("courses.id", ondelete="CASCADE"), primary_key=True)
+    user_id = Column(UUID(as_uuid=True), ForeignKey("users.id", ondelete="CASCADE"), primary_key=True)
+    attempt_id = Column(UUID(as_uuid=True), ForeignKey("course_attempts.id", ondelete="CASCADE"), nullable=False)
+    run_id = Column(UUID(as_uuid=True), nullable=False)
+
+    best_duration = Column(Float, nullable=False)  # 초(s) 단위
+    similarity_score = Column(Float, nullable=True)
+    achieved_at = Column(DateTime, nullable=False)
+
+    __table_args__ = (
+        # 순위 인덱스(app.core.leaderboard_index)를 채울 때 코스 범위를 인덱스만으로 읽습니다.
+        Index("ix_course_leaderboard_rank", "course_id", "best_duration", "achieved_at", "user_id"),
+    )
@@ -0,0 +1,36 @@
+# app/models/media.py
+from sqlalchemy import BigInteger, Column, DateTime, Index, Integer, String, Text, text
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.sql import func
+
+from app.db.session import Base
+
+
+class MediaBlob(Base):
+    """
+    콘텐츠 주소(SHA-256) 미디어 저장소의 객체 하나
+    - 같은 바이트는 한 번만 저장되고, 이를 가리키는 앨범 행 수를 ref_count로 셉니다. (crud.media)
+    - ref_count가 0이 되면 행과 저장소 객체를 함께 지웁니다. (업로드 후 아직 참조되지 않은 객체도 0)
+      앨범이 CASCADE로 지워져 어긋난 값은 주기 GC가 앨범에서 다시 세어 맞춥니다.
+    - 이미지면 업로드할 때 목록용 파생본과 자리표시를 만들어 둡니다. (app.core.images, 실패/비이미지는 NULL)
+    """
+    __tablename__ = "media_blobs"
+
+    sha256 = Column(String(64), primary_key=True)
+    storage_key = Column(Text, nullable=False)      # app.core.storage.blob_key()
+    content_type = Column(String(100), nullable=True)
+    size = Column(BigInteger, nullable=False)       # 바이트
+    ref_count = Column(Integer, nullable=False, default=0, server_default="0")
+    created_at = Column(DateTime, server_default=func.now(), nullable=False)  # 마지막 업로드 시각 (같은 해시를 다시 올리면 갱신)
+
+    # 이미지 파생본: 원본 크기(EXIF 회전 반영), 자리표시 data URI,
+    # variants = [{"format", "width", "height", "size", "key"}, ...] (큰 폭부터)
+    width = Column(Integer, nullable=True)
+    height = Column(Integer, nullable=True)
+    placeholder = Column(Text, nullable=True)
+    variants = Column(JSONB, nullable=True)
+
+    __table_args__ = (
+        # 참조되지 않은 채 남은 업로드를 정리(gc_unreferenced_blobs)할 때 씁니다.
+        Index("ix_media_blobs_unreferenced", "created_at", postgresql_where=text("ref_count = 0")),
+    )
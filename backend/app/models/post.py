@@ -36,10 +36,10 @@ class Post(Base):
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
 
     # 관계 설정
-    author = relationship("User")
-    images = relationship("PostImage", back_populates="post", cascade="all, delete-orphan")
-    comments = relationship("Comment", back_populates="post", cascade="all, delete-orphan")
-    reactions = relationship("Reaction", back_populates="post", cascade="all, delete-orphan")
+    author = relationship("User", lazy="raise")
+    images = relationship("PostImage", back_populates="post", cascade="all, delete-orphan", lazy="raise")
+    comments = relationship("Comment", back_populates="post", cascade="all, delete-orphan", lazy="raise")
+    reactions = relationship("Reaction", back_populates="post", cascade="all, delete-orphan", lazy="raise")
 
 
 class Comment(Base):
@@ -54,8 +54,8 @@ class Comment(Base):
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
 
     # 관계 설정
-    author = relationship("User")
-    post = relationship("Post", back_populates="comments")
+    author = relationship("User", lazy="raise")
+    post = relationship("Post", back_populates="comments", lazy="raise")
 
 
 # Enum: 반응 종류를 미리 정의하여 데이터 일관성 확보
@@ -76,8 +76,8 @@ class Reaction(Base):
     )
 
     # 관계 설정
-    user = relationship("User")
-    post = relationship("Post", back_populates="reactions")
+    user = relationship("User", lazy="raise")
+    post = relationship("Post", back_populates="reactions", lazy="raise")
 
 
 class PostImage(Base):
@@ -90,7 +90,7 @@ class PostImage(Base):
     height = Column(Integer, nullable=True)
     order = Column(Integer, default=0, nullable=False)
 
-    post = relationship("Post", back_populates="images")
+    post = relationship("Post", back_populates="images", lazy="raise")
 
 
 class Report(Base):
@@ -107,5 +107,5 @@ class Report(Base):
         UniqueConstraint("post_id", "reporter_id", name="user_post_report_uc"),
     )
 
-    reporter = relationship("User")
-    post = relationship("Post")
\ No newline at end of file
+    reporter = relationship("User", lazy="raise")
+    post = relationship("Post", lazy="raise")
\ No newline at end of file
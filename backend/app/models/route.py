@@ -0,0 +1,98 @@
+# app/models/route.py
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+from geoalchemy2 import Geography, Geometry
+from sqlalchemy import Column, LargeBinary, cast, func
+from sqlalchemy.orm import declared_attr, deferred, validates
+
+from app.core import polyline
+
+SRID_WGS84 = 4326
+
+# 경로 단계(detail)별 최대 점 수와 저장 컬럼
+# - thumb: 목록/그리드 썸네일 (수백 바이트)
+# - map: 지도 화면 기본 확대 수준
+# - full: 저장된 경로 그대로
+ROUTE_THUMB_POINTS = 32
+ROUTE_MAP_POINTS = 256
+ROUTE_LEVEL_COLUMNS = {"thumb": "route_thumb", "map": "route_map", "full": "route_polyline"}
+
+
+class RouteMixin:
+    """
+    GPS 경로를 encoded polyline(정밀도 1e-6) 바이트로 저장하는 컬럼과 접근자를 제공합니다.
+    - route_polyline: 실제 저장 컬럼 (bytea, 점당 약 4바이트)
+    - route: 기존 [{"lat", "lng"}, ...] 형식. 읽을 때마다 디코딩하므로 점이 필요한 곳에서만 접근합니다.
+    - route_array: 계산용 (N, 2) [lat, lng] 배열
+    - route_thumb / route_map: 점 수를 줄인 경로 단계 (목록/지도 응답용)
+    - path / start_point / bbox: 공간 쿼리용 PostGIS 컬럼 (GiST 인덱스)
+    route_polyline을 쓰면 path만 바로 갱신되고 나머지는 비워집니다. crud가 커밋 전에
+    app.core.route_levels.apply_route_levels로 다시 채웁니다. (긴 경로는 executor에서)
+    """
+
+    route_polyline = Column(LargeBinary, nullable=True)
+    route_thumb = Column(LargeBinary, nullable=True)
+    route_map = Column(LargeBinary, nullable=True)
+
+    # 공간 컬럼은 쿼리 조건에만 쓰고 ORM 객체로는 읽지 않습니다. (긴 경로의 WKB를 매번 가져오지 않도록)
+    @declared_attr
+    def path(cls):
+        return deferred(
+            Column(Geography("LINESTRING", srid=SRID_WGS84, spatial_index=False), nullable=True),
+            raiseload=True,
+        )
+
+    @declared_attr
+    def start_point(cls):
+        return deferred(
+            Column(Geography("POINT", srid=SRID_WGS84, spatial_index=False), nullable=True),
+            raiseload=True,
+        )
+
+    @declared_attr
+    def bbox(cls):
+        # 지도 영역 조회(&&)는 위경도 평면에서 충분하므로 geometry로 둡니다.
+        return deferred(
+            Column(Geometry("POLYGON", srid=SRID_WGS84, spatial_index=False), nullable=True),
+            raiseload=True,
+        )
+
+    @validates("route_polyline")
+    def _validate_route_polyline(self, key: str, value: Any) -> Optional[bytes]:
+        # 클라이언트가 보낸 문자열 polyline도 그대로 받을 수 있도록 bytes로 맞춥니다.
+        if isinstance(value, str):
+            value = value.encode("ascii")
+        self._set_route_geometry(value)
+        return value
+
+    def _set_route_geometry(self, encoded: Optional[bytes]) -> None:
+        # 경로를 디코딩하지 않습니다. 선은 DB에서 polyline을 바로 해석해 만들고, (긴 WKT 문자열을 파이썬에서 만들지 않음)
+        # 점 수를 줄인 단계와 시작점/영역은 CPU 작업이라 비워 두면 crud가 apply_route_levels로 채웁니다.
+        encoded = bytes(encoded) if encoded else b""
+        self.route_thumb = self.route_map = None
+        self.start_point = self.bbox = None
+        self.path = (
+            cast(
+                func.ST_LineFromEncodedPolyline(encoded.decode("ascii"), polyline.ROUTE_POLYLINE_PRECISION),
+                Geography("LINESTRING", srid=SRID_WGS84),
+            )
+            if polyline.count_points(encoded) >= 2
+            else None
+        )
+
+    @property
+    def route(self) -> Optional[List[Dict[str, float]]]:
+        if self.route_polyline is None:
+            return None
+        return polyline.decode_points(self.route_polyline)
+
+    @route.setter
+    def route(self, points: Optional[List[Dict[str, Any]]]) -> None:
+        self.route_polyline = None if points is None else polyline.encode_points(points)
+
+    @property
+    def route_array(self) -> np.ndarray:
+        if self.route_polyline is None:
+            return np.empty((0, 2), dtype=np.float64)
+        return polyline.decode(self.route_polyline)
@@ -1,15 +1,24 @@
 import uuid
-from sqlalchemy import Column, String, Boolean, DateTime, Float, ForeignKey, Integer, Text
+from sqlalchemy import Column, String, Boolean, DateTime, Float, ForeignKey, Index, Integer, LargeBinary, Text, text
 from sqlalchemy.dialects.postgresql import UUID, JSONB
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
 from app.db.session import Base
+from app.models.route import RouteMixin
 
-class Run(Base):
+class Run(RouteMixin, Base):
     """
     러닝 기록을 저장하는 'runs' 테이블의 SQLAlchemy 모델입니다.
     """
     __tablename__ = "runs"
+    __table_args__ = (
+        # 사용자별 목록 조회(keyset 페이지네이션: created_at DESC, id DESC)용 인덱스
+        Index("ix_runs_user_id_created_at", "user_id", text("created_at DESC"), text("id DESC")),
+        # 공간 쿼리용 GiST 인덱스 (RouteMixin)
+        Index("ix_runs_path", "path", postgresql_using="gist"),
+        Index("ix_runs_start_point", "start_point", postgresql_using="gist"),
+        Index("ix_runs_bbox", "bbox", postgresql_using="gist"),
+    )
 
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     user_id = Column(UUID(as_uuid=True), ForeignKey("users.id"), nullable=False)
@@ -17,8 +26,9 @@ class Run(Base):
     notes = Column(Text, nullable=True)
     distance = Column(Float, nullable=False) # 미터(m) 단위
     duration = Column(Float, nullable=False) # 초(s) 단위
-    
-    route = Column(JSONB, nullable=True)
+    moving_time = Column(Float, nullable=True) # 멈춘 시간을 뺀 초(s), 원시 GPS 샘플로 서버가 계산
+
+    # route / route_polyline: RouteMixin (encoded polyline bytea)
     created_at = Column(DateTime, default=func.now())
     end_at = Column(DateTime, nullable=True)
     # ----> 아래 새로운 컬럼들을 추가합니다. <----
@@ -38,14 +48,14 @@ class Run(Base):
     is_course_candidate = Column(Boolean, default=False, nullable=False)
 
     # 유저 관계
-    owner = relationship("User", back_populates="runs", lazy="selectin")
+    owner = relationship("User", back_populates="runs", lazy="raise")
 
     # ✅ 코스 생성 원본 런(1:1)
     created_course = relationship(
         "Course",
         back_populates="original_run",
         uselist=False,
-        lazy="selectin",
+        lazy="raise",
     )
 
     # ✅ 코스 도전(1:1) – 한 Run은 하나의 CourseAttempt와만 매핑
@@ -53,5 +63,22 @@ class Run(Base):
         "CourseAttempt",
         back_populates="run",
         uselist=False,
-        lazy="selectin",
-    )
\ No newline at end of file
+        lazy="raise",
+    )
+
+
+class RunPointChunk(Base):
+    """
+    진행 중인 러닝의 원시 GPS 샘플 묶음 (POST /runs/{id}/points 한 번 = 한 행)
+    - 기존 경로를 다시 쓰지 않고 새 행만 추가하므로 업로드 비용이 묶음 크기에 비례합니다.
+    - (run_id, seq) 기본 키로 같은 묶음의 재전송을 무시합니다.
+    - 완료(finished) 시 하나의 경로(route_polyline)와 지표로 합쳐지고 삭제됩니다. (crud.run_points)
+    """
+    __tablename__ = "run_point_chunks"
+
+    run_id = Column(UUID(as_uuid=True), ForeignKey("runs.id", ondelete="CASCADE"), primary_key=True)
+    seq = Column(Integer, primary_key=True)
+    point_count = Column(Integer, nullable=False)
+    # [t, lat, lng, alt] float64 리틀엔디언 배열 (app.core.run_metrics.pack_samples)
+    points = Column(LargeBinary, nullable=False)
+    created_at = Column(DateTime, server_default=func.now(), nullable=False)
@@ -0,0 +1,24 @@
+# app/models/stats.py
+from sqlalchemy import Column, DateTime, Float, ForeignKey, Integer
+from sqlalchemy.dialects.postgresql import UUID
+from app.db.session import Base
+
+
+class UserStatsBucket(Base):
+    """
+    사용자별 15분(UTC) 구간 러닝 집계를 저장하는 'user_stats_buckets' 테이블입니다.
+    완료(finished)된 러닝 기록만 포함하며, crud.run에서 기록이 바뀔 때 증분 갱신됩니다.
+    모든 IANA 시간대의 UTC 오프셋은 15분의 배수이므로, 어떤 시간대의 날짜/주/월/연 경계로도
+    구간을 쪼개지 않고 그대로 묶을 수 있습니다. (시간대별 재스캔 없이 조회 시점에 버킷팅)
+    기록이 있는 구간만 행이 생깁니다.
+    """
+    __tablename__ = "user_stats_buckets"
+
+    user_id = Column(UUID(as_uuid=True), ForeignKey("users.id", ondelete="CASCADE"), primary_key=True)
+    bucket_start = Column(DateTime, primary_key=True)  # UTC(naive), 15분 단위로 내림
+
+    run_count = Column(Integer, default=0, nullable=False)
+    total_distance = Column(Float, default=0.0, nullable=False)        # 미터(m) 단위
+    total_duration = Column(Float, default=0.0, nullable=False)        # 초(s) 단위
+    total_elevation_gain = Column(Float, default=0.0, nullable=False)  # 미터(m) 단위
+    total_calories = Column(Float, default=0.0, nullable=False)
@@ -1,9 +1,10 @@
 import uuid
-from sqlalchemy import Column, String, Boolean, DateTime, Float, ForeignKey
+from sqlalchemy import Column, String, Boolean, DateTime, Float, ForeignKey, Integer
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
 from app.db.session import Base
+from app.core.tz import DEFAULT_TIMEZONE
 
 class User(Base):
     """
@@ -18,7 +19,7 @@ class User(Base):
 
     # ----> 2. 아래 관계 설정을 추가합니다. <----
     # 이 사용자가 작성한 모든 러닝 기록에 접근할 수 있습니다.
-    runs = relationship("Run", back_populates="owner", lazy="selectin")
+    runs = relationship("Run", back_populates="owner", lazy="raise")
     # 기본 키(Primary Key)로 UUID를 사용합니다.
     # UUID는 추측이 불가능하여 id를 통한 직접적인 객체 접근(예: /users/1)을 방지해 보안에 유리합니다.
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
@@ -31,4 +32,12 @@ class User(Base):
     is_active = Column(Boolean(), default=True)
 
     # default=func.now()는 데이터베이스 서버의 현재 시간을 기본값으로 사용하도록 합니다.
-    created_at = Column(DateTime, default=func.now())
\ No newline at end of file
+    created_at = Column(DateTime, default=func.now())
+
+    # 완료(finished)된 러닝 기록 집계 (프로필 응답용, crud.run에서 증분 갱신)
+    total_runs = Column(Integer, default=0, server_default="0", nullable=False)
+    total_distance = Column(Float, default=0.0, server_default="0", nullable=False) # 미터(m) 단위
+    last_run_at = Column(DateTime, nullable=True)
+
+    # 통계의 날짜/주/월 경계를 나눌 IANA 시간대 (예: 'Asia/Seoul')
+    timezone = Column(String, default=DEFAULT_TIMEZONE, server_default=DEFAULT_TIMEZONE, nullable=False)
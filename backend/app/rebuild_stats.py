@@ -0,0 +1,39 @@
+# app/rebuild_stats.py
+"""
+사용자 러닝 집계 재구축 명령
+
+완료된 러닝 기록(runs)으로부터 15분 구간 집계(user_stats_buckets)와 사용자 합계(users.total_*)를 다시 만듭니다.
+증분 갱신이 어긋났다고 의심될 때나 대량 데이터 보정 후에 실행합니다.
+    python -m app.rebuild_stats
+    python -m app.rebuild_stats --user-id <UUID>
+"""
+import argparse
+import asyncio
+import logging
+import uuid
+from typing import Optional
+
+from app import crud
+from app.db.session import SessionLocal
+
+logger = logging.getLogger(__name__)
+
+
+async def rebuild(user_id: Optional[uuid.UUID] = None) -> None:
+    async with SessionLocal() as db:
+        await crud.stats.rebuild_stats_buckets(db, user_id=user_id)
+        await crud.user.rebuild_run_totals(db, user_id=user_id)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--user-id", type=uuid.UUID, default=None, help="이 사용자만 재구축 (기본: 전체)")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    asyncio.run(rebuild(args.user_id))
+    logger.info("run stats rebuilt for %s", args.user_id or "all users")
+
+
+if __name__ == "__main__":
+    main()
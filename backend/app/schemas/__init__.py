@@ -1,6 +1,6 @@
 # app/schemas/__init__.py
 from .token import Token, TokenData, TokenPayload
-from .run import Run, RunCreate, RunBase, RunUpdate
+from .run import Run, RunCreate, RunBase, RunUpdate, RunSummary, RunSample, RunPointBatch, RunPointBatchResult
 from .user import User, UserCreate, UserBase, UserSocialLogin, UserUpdate
 from .stats import StatsResponse, BarChartData
 
@@ -10,5 +10,8 @@ from .course import (
     CourseUpdate,
     CourseAttempt,
     CourseAttemptCreate,
+    CourseAttemptJob,
+    CourseSummary,
+    LeaderboardEntry,
     CourseCreateFromRun,
 )
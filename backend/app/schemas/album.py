@@ -1,9 +1,11 @@
 # backend/app/schemas/album.py
-from typing import Any, Optional
+from typing import Any, List, Optional
 from uuid import UUID
 from datetime import datetime
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, model_validator
+
+from app.core.storage import get_media_storage
 
 class AlbumBase(BaseModel):
     run_id: Optional[UUID] = None
@@ -20,6 +22,36 @@ class AlbumUpdate(BaseModel):
     tags: Optional[Any] = None
     visibility: Optional[str] = None
 
+class ImageVariantOut(BaseModel):
+    """
+    파생본 하나 (srcset/<picture>의 source용)
+    """
+    format: str  # avif / webp
+    width: int
+    height: int
+    size: int    # 바이트
+    url: str
+
+    @model_validator(mode="before")
+    @classmethod
+    def _key_to_url(cls, data: Any) -> Any:
+        # media_blobs.variants에는 저장소 키만 있으므로 응답할 때 URL로 바꿉니다. (CDN 등 설정 변경 반영)
+        if isinstance(data, dict) and "url" not in data and "key" in data:
+            data = {**data, "url": get_media_storage().url(data["key"])}
+        return data
+
+class AlbumImageOut(BaseModel):
+    """
+    합성 이미지의 목록용 정보: 원본 크기(칸 비율), 자리표시 data URI, 폭별 파생본 (큰 폭부터)
+    """
+    width: Optional[int] = None
+    height: Optional[int] = None
+    placeholder: Optional[str] = None
+    variants: List[ImageVariantOut] = []
+
+    class Config:
+        from_attributes = True
+
 class AlbumOut(BaseModel):
     id: UUID
     user_id: UUID
@@ -30,6 +62,8 @@ class AlbumOut(BaseModel):
     tags: Optional[Any]
     visibility: str
     created_at: datetime
+    # 목록 화면은 원본 대신 이 파생본을 씁니다. 예전 업로드이거나 파생본을 만들지 못했으면 None
+    composed_image: Optional[AlbumImageOut] = None
 
     class Config:
         from_attributes = True  # Pydantic v2
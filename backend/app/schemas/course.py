@@ -1,9 +1,11 @@
 # app/schemas/course.py
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, field_validator
 from typing import Optional, List, Any
 import uuid
 from datetime import datetime
 
+from .route import response_polyline, validate_polyline
+
 # ── Course ───────────────────────────────────────────────────────────
 class CourseBase(BaseModel):
     name: str
@@ -21,20 +23,48 @@ class CourseUpdate(BaseModel):
     description: Optional[str] = None
     distance: Optional[float] = None
     route: Optional[List[Any]] = None
+    route_polyline: Optional[str] = None  # route 대신 encoded polyline 문자열
     rally_points: Optional[List[Any]] = None
     status: Optional[str] = None        # draft/published/archived
     visibility: Optional[str] = None    # private/public/unlisted
+
+    _check_route_polyline = field_validator("route_polyline")(validate_polyline)
     
 class Course(CourseBase):
     id: uuid.UUID
     user_id: uuid.UUID
     distance: float
     route: Optional[List[Any]] = None
+    route_polyline: Optional[str] = None  # ?route_format=polyline 요청 시에만 채워집니다.
     rally_points: Optional[List[Any]] = None
     status: str
     visibility: str
     created_at: datetime
 
+    _route_polyline = field_validator("route_polyline", mode="before")(response_polyline)
+
+    class Config:
+        from_attributes = True
+
+class CourseSummary(CourseBase):
+    """
+    탐색/목록용 코스 요약 (경로는 ?detail=thumb|map 요청 시에만 해당 단계로 채워집니다)
+    """
+    id: uuid.UUID
+    user_id: uuid.UUID
+    distance: float
+    status: str
+    visibility: str
+    created_at: datetime
+    start_lat: Optional[float] = None
+    start_lng: Optional[float] = None
+    distance_m: Optional[float] = None  # 요청 위치에서 시작점까지 거리(m), 주변 검색에서만 채워집니다.
+    score: Optional[float] = None       # 검색 관련도, 검색 결과에서만 채워집니다.
+    route: Optional[List[Any]] = None
+    route_polyline: Optional[str] = None
+
+    _route_polyline = field_validator("route_polyline", mode="before")(response_polyline)
+
     class Config:
         from_attributes = True
 
@@ -52,11 +82,32 @@ class CourseAttempt(CourseAttemptBase):
     id: uuid.UUID
     user_id: uuid.UUID
     course_id: uuid.UUID
+    run_id: Optional[uuid.UUID] = None
+    status: Optional[str] = None        # pending/scoring/scored/failed
     attempted_at: datetime
 
     class Config:
         from_attributes = True
 
+class CourseAttemptJob(BaseModel):
+    # 비동기 제출(202) 응답: job_id(= 도전 기록 ID)로 status_url을 폴링합니다.
+    job_id: uuid.UUID
+    status: str
+    status_url: str
+
+class LeaderboardEntry(BaseModel):
+    """
+    코스 리더보드 항목 (사용자별 최고 기록)
+    """
+    rank: int
+    user_id: uuid.UUID
+    nickname: Optional[str] = None
+    attempt_id: uuid.UUID
+    run_id: uuid.UUID
+    best_duration: float                # 초(s) 단위
+    similarity_score: Optional[float] = None
+    achieved_at: datetime
+
 # ✅ 추가: 러닝 기록으로부터 코스를 만드는 전용 입력 폼
 # - distance/route는 서버가 run_id로부터 계산하므로 여기엔 없음
 # - 이름/설명/공개범위 + 정규화 옵션 정도만 받으면 충분
@@ -66,5 +117,5 @@ class CourseCreateFromRun(BaseModel):
     visibility: Optional[str] = Field("private", description="private/public/unlisted")
     # 선택적 파이프라인 옵션(서비스 코드에서 사용 안 하면 무시해도 됨)
     simplify: Optional[bool] = Field(True, description="경로 단순화(RDP) 적용 여부")
-    simplify_tolerance_m: Optional[float] = Field(5.0, description="RDP 허용 오차(m)")
+    simplify_tolerance_m: Optional[float] = Field(5.0, ge=0, le=50, description="RDP 허용 오차(m)")
     generate_rally_points: Optional[bool] = Field(False, description="랠리 포인트 자동 생성 여부")
\ No newline at end of file
@@ -0,0 +1,60 @@
+# app/schemas/route.py
+from typing import Any, Literal, Optional
+
+from app.core import polyline
+from app.models.route import ROUTE_LEVEL_COLUMNS
+
+# 응답의 경로 표현
+# - json: route = [{"lat", "lng"}, ...] (기본값, 기존 클라이언트 호환)
+# - polyline: route_polyline = encoded polyline 문자열(정밀도 1e-6), route = null
+RouteFormat = Literal["json", "polyline"]
+
+# 응답 경로의 상세 단계 (app.models.route.ROUTE_LEVEL_COLUMNS)
+# - thumb: 약 32점 (목록/그리드 썸네일), map: 약 256점 (지도 화면), full: 저장된 경로 전체 (기본값)
+RouteDetail = Literal["thumb", "map", "full"]
+# 목록 응답은 경로를 기본으로 빼고, 요청할 때만 작은 단계를 붙입니다.
+ListRouteDetail = Literal["thumb", "map"]
+
+
+def response_polyline(value: Any) -> Optional[str]:
+    """
+    응답 스키마의 route_polyline 값을 정리합니다.
+    ORM 객체를 그대로 검증하면 저장 바이트(bytes)가 들어오는데, 이는 요청되지 않은 것이므로 버립니다.
+    RouteFormatView가 polyline 형식으로 요청된 경우에만 문자열을 넘겨줍니다.
+    """
+    return value if isinstance(value, str) else None
+
+
+def validate_polyline(value: Optional[str]) -> Optional[str]:
+    """
+    입력으로 받은 polyline 문자열이 디코딩 가능한지 확인합니다.
+    """
+    if value is not None:
+        polyline.decode(value)
+    return value
+
+
+class RouteFormatView:
+    """
+    ORM 객체(RouteMixin) 또는 조회 결과 행을 감싸 응답 스키마가 요청한 형식/단계의 경로만 읽도록 합니다.
+    polyline 형식이면 저장된 바이트를 그대로 문자열로 내보내고 디코딩하지 않습니다.
+    행(Row)을 감쌀 때는 요청한 단계의 컬럼(route_thumb 등)을 함께 조회해야 합니다.
+    """
+
+    def __init__(self, obj: Any, route_format: RouteFormat, detail: RouteDetail = "full") -> None:
+        self._obj = obj
+        self._route_format = route_format
+        self._column = ROUTE_LEVEL_COLUMNS[detail]
+
+    def __getattr__(self, name: str) -> Any:
+        if name == "route":
+            encoded = getattr(self._obj, self._column)
+            if self._route_format != "json" or encoded is None:
+                return None
+            return polyline.decode_points(encoded)
+        if name == "route_polyline":
+            encoded = getattr(self._obj, self._column)
+            if self._route_format != "polyline" or encoded is None:
+                return None
+            return bytes(encoded).decode("ascii")
+        return getattr(self._obj, name)
@@ -1,10 +1,46 @@
 # app/schemas/run.py
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, field_validator
 from pydantic import ConfigDict
 from datetime import datetime
 import uuid
 from typing import List, Optional, Any
 
+from .route import response_polyline, validate_polyline
+
+class RunSample(BaseModel):
+    """
+    원시 GPS 샘플 하나 (서버 지표 계산용)
+    """
+    t: float                      # 초 단위 시각 (러닝 시작 기준 또는 epoch, 단조 증가)
+    lat: float = Field(ge=-90, le=90)
+    lng: float = Field(ge=-180, le=180)
+    alt: Optional[float] = None   # 고도(m)
+
+
+# POST /runs/{id}/points 한 번에 받는 최대 샘플 수 (1Hz 기준 약 16분)
+MAX_POINTS_PER_BATCH = 1000
+
+
+class RunPointBatch(BaseModel):
+    """
+    진행 중 러닝의 샘플 묶음 업로드
+    seq는 러닝마다 0부터 증가하는 묶음 번호이며, 같은 seq를 다시 보내면 무시됩니다. (재시도 안전)
+    """
+    seq: int = Field(ge=0)
+    points: List[RunSample] = Field(min_length=1, max_length=MAX_POINTS_PER_BATCH)
+
+
+class RunPointBatchResult(BaseModel):
+    """
+    묶음 업로드 결과
+    """
+    seq: int
+    duplicate: bool       # 이미 받은 seq라서 저장하지 않았으면 true
+    chunk_count: int      # 지금까지 저장된 묶음 수
+    point_count: int      # 지금까지 저장된 샘플 수
+    last_seq: Optional[int] = None
+
+
 class RunBase(BaseModel):
     """
     Run 스키마의 공통 속성
@@ -20,6 +56,7 @@ class RunBase(BaseModel):
     avg_heart_rate: Optional[int] = None
     avg_cadence: Optional[int] = None
     total_elevation_gain: Optional[float] = None
+    moving_time: Optional[float] = None # 초(s) 단위, 서버 계산
     splits: Optional[List[Any]] = None
     # 내부 필드는 snake_case로, 외부 JSON은 chartData로
     chart_data: Optional[List[Any]] = Field(default=None, alias="chartData")
@@ -48,6 +85,8 @@ class RunUpdate(BaseModel):
     distance: Optional[float] = None
     duration: Optional[float] = None
     route: Optional[List[Any]] = None
+    # route 대신 encoded polyline(정밀도 1e-6) 문자열로 보낼 수도 있습니다.
+    route_polyline: Optional[str] = None
     calories_burned: Optional[float] = None
     avg_pace: Optional[float] = None
     avg_heart_rate: Optional[int] = None
@@ -59,9 +98,13 @@ class RunUpdate(BaseModel):
     is_edited: Optional[bool] = None
     is_course_candidate: Optional[bool] = Field(default=None, alias="isCourseCandidate")
     chart_data: Optional[List[Any]] = Field(default=None, alias="chartData")
+    # 완료(finished) 시 함께 보내면 서버가 거리/시간/페이스/splits/chart_data 등을 다시 계산해 저장합니다.
+    samples: Optional[List[RunSample]] = None
 
     model_config = ConfigDict(populate_by_name=True, from_attributes=True)
 
+    _check_route_polyline = field_validator("route_polyline")(validate_polyline)
+
 
 class Run(RunBase):
     """
@@ -74,5 +117,36 @@ class Run(RunBase):
     status: Optional[str] = None
     is_edited: bool
     is_course_candidate: bool = Field(default=False, alias="isCourseCandidate")
+    # ?route_format=polyline 요청 시에만 채워집니다. (이때 route는 null)
+    route_polyline: Optional[str] = None
+
+    model_config = ConfigDict(populate_by_name=True, from_attributes=True)
+
+    _route_polyline = field_validator("route_polyline", mode="before")(response_polyline)
+
+
+class RunSummary(BaseModel):
+    """
+    목록 화면용 요약 스키마 (splits/chart_data 제외)
+    route / route_polyline은 ?detail=thumb|map 요청 시에만 해당 단계의 경로로 채워집니다.
+    """
+    id: uuid.UUID
+    user_id: uuid.UUID
+    title: Optional[str] = None
+    distance: float
+    duration: float
+    calories_burned: Optional[float] = None
+    avg_pace: Optional[float] = None
+    total_elevation_gain: Optional[float] = None
+    moving_time: Optional[float] = None
+    created_at: datetime
+    end_at: Optional[datetime] = None
+    status: Optional[str] = None
+    is_edited: bool
+    is_course_candidate: bool = Field(default=False, alias="isCourseCandidate")
+    route: Optional[List[Any]] = None
+    route_polyline: Optional[str] = None
 
     model_config = ConfigDict(populate_by_name=True, from_attributes=True)
+
+    _route_polyline = field_validator("route_polyline", mode="before")(response_polyline)
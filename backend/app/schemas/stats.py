@@ -1,9 +1,9 @@
 from pydantic import BaseModel
-from typing import List
+from typing import List, Optional
 
 # 막대 차트의 각 막대를 표현하는 스키마
 class BarChartData(BaseModel):
-    label: str  # x축 라벨 (예: '월', '01일')
+    label: str  # x축 라벨 (예: '월', '01일', '2026-10-13')
     value: float # y축 값 (예: 총 거리)
 
 # 최종 통계 응답 스키마
@@ -12,4 +12,5 @@ class StatsResponse(BaseModel):
     total_runs: int
     avg_pace_per_km: float # 초/km 단위
     total_duration_seconds: float
-    chart_data: List[BarChartData]
\ No newline at end of file
+    chart_data: List[BarChartData]
+    timezone: Optional[str] = None # 날짜 경계 계산에 사용한 IANA 시간대
\ No newline at end of file
@@ -1,8 +1,9 @@
-from pydantic import BaseModel, EmailStr
+from pydantic import BaseModel, EmailStr, field_validator
 from datetime import datetime
 import uuid
-from typing import List, Optional
-from .run import Run 
+from typing import Optional
+
+from app.core.tz import DEFAULT_TIMEZONE, validate_timezone
 
 class UserBase(BaseModel):
     """
@@ -24,11 +25,15 @@ class UserCreate(UserBase):
 class User(UserBase):
     """
     API 응답으로 사용자 정보를 반환할 때 사용할 스키마입니다.
+    러닝 기록 목록은 포함하지 않습니다. (GET /runs/ 페이지네이션으로 조회)
     """
     id: uuid.UUID
     is_active: bool
     created_at: datetime
-    runs: List[Run] = []
+    total_runs: int = 0
+    total_distance: float = 0.0
+    last_run_at: Optional[datetime] = None
+    timezone: str = DEFAULT_TIMEZONE
 
     class Config:
         from_attributes = True
@@ -46,6 +51,10 @@ class UserUpdate(BaseModel):
     nickname: Optional[str] = None
     height: Optional[float] = None
     weight: Optional[float] = None
+    # 통계 날짜 경계에 쓸 IANA 시간대 (예: 'Asia/Seoul')
+    timezone: Optional[str] = None
+
+    _check_timezone = field_validator("timezone")(validate_timezone)
     # 향후 비밀번호 변경 등을 추가 가능
     # password: Optional[str] = None
     
\ No newline at end of file
@@ -0,0 +1,114 @@
+# app/worker.py
+"""
+코스 도전 비동기 채점 워커 (+ 참조되지 않은 미디어 객체 주기 정리)
+
+- JOB_QUEUE_BACKEND=inprocess: API 프로세스가 시작될 때 컨슈머 태스크를 함께 띄웁니다. (main.py)
+- JOB_QUEUE_BACKEND=redis: 별도 프로세스로 실행합니다.
+    python -m app.worker
+"""
+import asyncio
+import logging
+import uuid
+from datetime import timedelta
+
+from app import crud, models
+from app.core.config import settings
+from app.core.executor import ExecutorSaturatedError, scoring_executor
+from app.core.jobs import get_job_queue
+from app.core.scoring import score_attempt
+from app.db.session import SessionLocal
+
+logger = logging.getLogger(__name__)
+
+COURSE_ATTEMPT_QUEUE = "course_attempts"
+
+
+async def score_pending_attempt(job_id: str) -> None:
+    """
+    pending 상태의 도전 기록 하나를 채점하여 점수/성공 여부를 채웁니다.
+    먼저 pending → scoring으로 가져가므로, 같은 ID가 큐에 중복으로 있어도 한 번만 채점합니다.
+    """
+    async with SessionLocal() as db:
+        if not await crud.course_attempt.claim_pending_attempt(db=db, id=uuid.UUID(job_id)):
+            return  # 다른 워커가 가져갔거나, 이미 처리되었거나 삭제된 작업
+        attempt = await db.get(models.CourseAttempt, uuid.UUID(job_id))
+        if attempt is None:
+            return
+
+        course = await crud.course.get_course_by_id_for_attempt(db=db, id=attempt.course_id)
+        run = await crud.run.get_run(db=db, id=attempt.run_id, user_id=attempt.user_id)
+        if course is None or run is None:
+            await crud.course_attempt.mark_attempt_failed(db=db, db_attempt=attempt)
+            return
+
+        while True:
+            try:
+                score = await score_attempt(course, run)
+                break
+            except ExecutorSaturatedError as e:
+                # 백그라운드 작업은 거절하지 않고, 풀에 여유가 생길 때까지 기다렸다가 다시 시도합니다.
+                await asyncio.sleep(e.retry_after)
+            except Exception:
+                logger.exception("scoring failed for course attempt %s", job_id)
+                await crud.course_attempt.mark_attempt_failed(db=db, db_attempt=attempt)
+                return
+
+        await crud.course_attempt.set_attempt_score(db=db, db_attempt=attempt, score=score)
+
+
+async def requeue_pending_attempts() -> int:
+    """
+    큐에서 사라진(프로세스 재시작 등) pending 도전 기록을 다시 큐에 넣습니다.
+    채점 중 워커가 죽어 scoring에 남은 기록도 JOB_CLAIM_TIMEOUT_SECONDS가 지나면 pending으로 되돌려 함께 넣습니다.
+    (이미 큐에 있는 ID가 다시 들어가도 claim_pending_attempt가 한 번만 채점하게 합니다)
+    """
+    queue = get_job_queue(COURSE_ATTEMPT_QUEUE)
+    async with SessionLocal() as db:
+        await crud.course_attempt.release_stale_claims(
+            db=db, older_than=timedelta(seconds=settings.JOB_CLAIM_TIMEOUT_SECONDS)
+        )
+        attempt_ids = await crud.course_attempt.get_pending_attempt_ids(db=db)
+    for attempt_id in attempt_ids:
+        await queue.enqueue(str(attempt_id))
+    return len(attempt_ids)
+
+
+async def run_worker() -> None:
+    queue = get_job_queue(COURSE_ATTEMPT_QUEUE)
+    await queue.run_consumers(score_pending_attempt, concurrency=settings.JOB_WORKERS)
+
+
+async def run_media_gc() -> None:
+    """
+    MEDIA_GC_INTERVAL_SECONDS마다 참조되지 않은 미디어 객체를 정리합니다. (crud.media.gc_unreferenced_blobs)
+    행을 SKIP LOCKED로 가져가므로 여러 프로세스에서 함께 돌아도 같은 객체를 두 번 지우지 않습니다.
+    """
+    while True:
+        try:
+            async with SessionLocal() as db:
+                keys = await crud.media.gc_unreferenced_blobs(db)
+            if keys:
+                logger.info("media gc removed %d unreferenced objects", len(keys))
+        except Exception:
+            logger.exception("media gc failed")
+        await asyncio.sleep(settings.MEDIA_GC_INTERVAL_SECONDS)
+
+
+async def main() -> None:
+    logging.basicConfig(level=logging.INFO)
+    if settings.JOB_QUEUE_BACKEND == "inprocess":
+        logger.warning("JOB_QUEUE_BACKEND=inprocess: jobs are consumed inside the API process.")
+        return
+    requeued = await requeue_pending_attempts()
+    logger.info("course attempt worker started (%d pending attempts requeued)", requeued)
+    try:
+        if settings.MEDIA_GC_INTERVAL_SECONDS > 0:
+            await asyncio.gather(run_worker(), run_media_gc())
+        else:
+            await run_worker()
+    finally:
+        scoring_executor.shutdown()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,169 @@
+# backend/benchmarks/album_grid.py
+"""
+앨범 그리드(목록 화면) 전송량/첫 화면 시간 벤치마크
+
+실행 (backend 디렉토리에서):
+    python -m benchmarks.album_grid
+    python -m benchmarks.album_grid --count 50 --tile-px 390 --bandwidth-mbps 5 --rtt-ms 80 --workers 4
+
+합성 앨범 이미지(1080x1350 PNG, 사진 같은 배경 + 경로 선) count개를 만든 뒤
+1) media_executor로 파생본을 만들며 업로드 쪽 인코딩 처리량을 재고,
+2) 그리드 한 화면(count칸)을 원본 PNG / WebP / AVIF 파생본으로 그릴 때를 비교합니다.
+   - bytes/tile: 칸 하나에 내려받는 바이트 (파생본은 tile-px 이상인 가장 작은 폭)
+   - decode: 칸 이미지 하나를 디코딩하는 시간 (Pillow, 기기 성능 차이는 반영하지 않음)
+   - first paint: 목록 JSON을 받은 시점. 자리표시가 JSON에 들어 있어 모든 칸이 이때 그려짐 (원본만 쓰면 빈 칸)
+   - all tiles: 모든 칸 이미지를 받아 디코딩한 시점
+   시간은 bandwidth-mbps/rtt-ms/connections로 모델링한 추정치입니다. (요청당 RTT 1번, 연결 수만큼 병렬)
+"""
+import argparse
+import asyncio
+import json
+import tempfile
+import time
+from io import BytesIO
+from pathlib import Path
+from typing import Dict, List
+
+import numpy as np
+from PIL import Image
+
+from app.core import polyline
+from app.core.config import settings
+from app.core.executor import media_executor
+from app.core.images import ImageDerivatives, build_derivatives, supported_formats
+from app.core.simplify import simplify_levels
+from app.core.thumbnails import render_route_image
+from app.models.route import ROUTE_MAP_POINTS
+from benchmarks.similarity import synthetic_route
+
+IMAGE_SIZE = (1080, 1350)
+
+
+def synthetic_album_image(rng: np.random.Generator) -> bytes:
+    """
+    사진처럼 부드러운 배경(저주파 색 + 약한 노이즈) 위에 경로 선을 얹은 합성 이미지 PNG
+    """
+    width, height = IMAGE_SIZE
+    coarse = rng.integers(0, 256, (6, 5, 3), dtype=np.uint8)
+    background = np.asarray(Image.fromarray(coarse).resize((width, height), Image.Resampling.BICUBIC), dtype=np.float32)
+    background += rng.normal(0, 6, background.shape)
+    image = Image.fromarray(background.clip(0, 255).astype(np.uint8)).convert("RGBA")
+
+    route = polyline.encode(simplify_levels(synthetic_route(2_000, rng), (ROUTE_MAP_POINTS,))[0])
+    overlay = Image.open(BytesIO(render_route_image(route, width, "png"))).convert("RGBA")
+    image.alpha_composite(overlay, (0, (height - width) // 2))
+    out = BytesIO()
+    image.convert("RGB").save(out, format="PNG")
+    return out.getvalue()
+
+
+def pick_variant(derived: ImageDerivatives, fmt: str, tile_px: int):
+    # 클라이언트의 srcset 선택과 같게: tile_px 이상인 가장 작은 폭, 없으면 가장 큰 것
+    candidates = sorted((v for v in derived.variants if v.format == fmt), key=lambda v: v.width)
+    return next((v for v in candidates if v.width >= tile_px), candidates[-1])
+
+
+def decode_ms(data: bytes) -> float:
+    started = time.perf_counter()
+    with Image.open(BytesIO(data)) as image:
+        image.load()
+    return (time.perf_counter() - started) * 1000
+
+
+def list_json_bytes(derived: List[ImageDerivatives], with_variants: bool) -> int:
+    # AlbumOut 목록 응답 크기 근사 (파생본/자리표시 필드 포함 여부)
+    items = []
+    for i, d in enumerate(derived):
+        item: Dict[str, object] = {
+            "id": f"{i:032x}", "composed_url": f"/media/blobs/00/00/{i:064x}.png", "caption": "morning run",
+        }
+        if with_variants:
+            item["composed_image"] = {
+                "width": d.width, "height": d.height, "placeholder": d.placeholder,
+                "variants": [
+                    {"format": v.format, "width": v.width, "height": v.height, "size": v.size,
+                     "url": f"/media/derived/00/00/{i:064x}/w{v.width}.{v.format}"}
+                    for v in d.variants
+                ],
+            }
+        items.append(item)
+    return len(json.dumps(items).encode())
+
+
+def transfer_seconds(sizes: List[int], args: argparse.Namespace) -> float:
+    """
+    sizes 바이트의 요청들을 connections개 연결로 나눠 받는 시간 (대역폭은 공유, 요청당 RTT 1번)
+    """
+    rounds = -(-len(sizes) // args.connections)
+    return rounds * args.rtt_ms / 1000 + sum(sizes) * 8 / (args.bandwidth_mbps * 1_000_000)
+
+
+async def encode_all(sources: List[Path], out_root: Path, formats: List[str], concurrency: int) -> List[ImageDerivatives]:
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def one(i: int, source: Path) -> ImageDerivatives:
+        async with semaphore:
+            return await media_executor.run(
+                build_derivatives, str(source), str(out_root / str(i)), list(settings.IMAGE_VARIANT_WIDTHS), formats
+            )
+
+    return await asyncio.gather(*(one(i, source) for i, source in enumerate(sources)))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--count", type=int, default=50, help="그리드 칸 수")
+    parser.add_argument("--tile-px", type=int, default=390, help="칸 한 변의 실제 픽셀 수 (3열 x 3배 밀도 화면)")
+    parser.add_argument("--bandwidth-mbps", type=float, default=10.0)
+    parser.add_argument("--rtt-ms", type=float, default=60.0)
+    parser.add_argument("--connections", type=int, default=6)
+    parser.add_argument("--workers", type=int, default=settings.IMAGE_WORKERS)
+    parser.add_argument("--kind", choices=("thread", "process"), default=settings.IMAGE_EXECUTOR)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    formats = supported_formats(settings.IMAGE_VARIANT_FORMATS)
+    rng = np.random.default_rng(args.seed)
+    # 풀은 처음 사용할 때 만들어지므로 그 전에 설정을 바꿉니다.
+    media_executor.kind = args.kind
+    media_executor.max_workers = args.workers
+    media_executor.max_pending = max(media_executor.max_pending, args.workers * 2)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp)
+        sources = []
+        for i in range(args.count):
+            path = root / f"{i}.png"
+            path.write_bytes(synthetic_album_image(rng))
+            sources.append(path)
+
+        started = time.perf_counter()
+        try:
+            derived = asyncio.run(encode_all(sources, root / "derived", formats, args.workers * 2))
+        finally:
+            media_executor.shutdown()
+        elapsed = time.perf_counter() - started
+        print(
+            f"encode: {args.count} images x {len(settings.IMAGE_VARIANT_WIDTHS)} widths x {formats}"
+            f" in {elapsed:.2f}s ({args.count / elapsed:.1f} images/s, {args.workers} {args.kind} workers)"
+        )
+        print(f"placeholder: {np.mean([len(d.placeholder) for d in derived]):.0f} bytes/tile (inline in JSON)\n")
+
+        print(f"{'tiles':<14}{'KiB/tile':>10}{'decode ms':>11}{'list KiB':>10}{'first paint':>13}{'all tiles':>11}")
+        rows = [("original png", [p.read_bytes() for p in sources], False)]
+        for fmt in formats:
+            tiles = [Path(pick_variant(d, fmt, args.tile_px).path).read_bytes() for d in derived]
+            rows.append((f"{fmt} w>={args.tile_px}", tiles, True))
+        for label, tiles, with_variants in rows:
+            json_bytes = list_json_bytes(derived, with_variants)
+            first_paint = transfer_seconds([json_bytes], args)
+            decode = float(np.mean([decode_ms(t) for t in tiles]))
+            all_tiles = first_paint + transfer_seconds([len(t) for t in tiles], args) + decode * len(tiles) / 1000 / args.connections
+            print(
+                f"{label:<14}{np.mean([len(t) for t in tiles]) / 1024:>10.1f}{decode:>11.2f}"
+                f"{json_bytes / 1024:>10.1f}{first_paint * 1000:>11.0f}ms{all_tiles:>10.2f}s"
+            )
+
+
+if __name__ == "__main__":
+    main()
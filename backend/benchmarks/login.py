@@ -0,0 +1,115 @@
+# backend/benchmarks/login.py
+"""
+로그인(bcrypt 비밀번호 확인) 동시 부하 벤치마크
+
+실행 (backend 디렉토리에서):
+    python -m benchmarks.login
+    python -m benchmarks.login --count 64 --concurrency 32 --workers 4 --kind process --rounds 12
+
+같은 이벤트 루프에서 로그인 count개를 concurrency개씩 동시에 처리하면서, 옆에서 10ms마다 깨어나는
+heartbeat 작업(다른 요청 처리를 대신함)이 얼마나 늦게 깨어나는지 함께 잽니다.
+- inline: 예전처럼 이벤트 루프에서 바로 bcrypt 확인 (확인하는 동안 다른 요청이 모두 멈춤)
+- executor: app.core.security.verify_password_async (password_executor, 대기열 상한을 넘으면 429로 셈)
+"""
+import argparse
+import asyncio
+import time
+from typing import Awaitable, Callable, List
+
+import numpy as np
+from passlib.context import CryptContext
+
+from app.core import security
+from app.core.config import settings
+from app.core.executor import ExecutorSaturatedError, password_executor
+
+HEARTBEAT_INTERVAL = 0.01
+
+
+async def heartbeat(stop: asyncio.Event, lags: List[float]) -> None:
+    """
+    HEARTBEAT_INTERVAL마다 깨어나 예정보다 늦은 시간(ms)을 기록합니다. (이벤트 루프가 막힌 정도)
+    """
+    loop = asyncio.get_running_loop()
+    while not stop.is_set():
+        expected = loop.time() + HEARTBEAT_INTERVAL
+        await asyncio.sleep(HEARTBEAT_INTERVAL)
+        lags.append(max(0.0, loop.time() - expected) * 1000)
+
+
+async def run_logins(
+    login: Callable[[], Awaitable[bool]], count: int, concurrency: int
+) -> tuple[float, np.ndarray, np.ndarray, int]:
+    """
+    (전체 초, 로그인별 지연 ms, heartbeat 지연 ms, 거절 수)를 반환합니다.
+    """
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies: List[float] = []
+    lags: List[float] = []
+    rejected = 0
+
+    async def one() -> None:
+        nonlocal rejected
+        async with semaphore:
+            started = time.perf_counter()
+            try:
+                assert await login()
+            except ExecutorSaturatedError:
+                rejected += 1
+                return
+            latencies.append((time.perf_counter() - started) * 1000)
+
+    stop = asyncio.Event()
+    beat = asyncio.create_task(heartbeat(stop, lags))
+    started = time.perf_counter()
+    await asyncio.gather(*(one() for _ in range(count)))
+    elapsed = time.perf_counter() - started
+    stop.set()
+    await beat
+    return elapsed, np.array(latencies or [0.0]), np.array(lags or [0.0]), rejected
+
+
+async def bench(args: argparse.Namespace, context: CryptContext, hashed: str) -> None:
+    async def inline() -> bool:
+        return context.verify(args.password, hashed)
+
+    async def pooled() -> bool:
+        verified, _ = await security.verify_password_async(args.password, hashed)
+        return verified
+
+    print(f"{'mode':<10}{'logins/s':>10}{'p50 (ms)':>10}{'p99 (ms)':>10}{'loop lag max':>14}{'rejected':>10}")
+    for mode, login in (("inline", inline), ("executor", pooled)):
+        elapsed, latencies, lags, rejected = await run_logins(login, args.count, args.concurrency)
+        print(
+            f"{mode:<10}{(args.count - rejected) / elapsed:>10.1f}"
+            f"{np.percentile(latencies, 50):>10.0f}{np.percentile(latencies, 99):>10.0f}"
+            f"{lags.max():>12.0f}ms{rejected:>10}"
+        )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--count", type=int, default=32)
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--workers", type=int, default=settings.PASSWORD_HASH_WORKERS)
+    parser.add_argument("--kind", choices=("thread", "process"), default=settings.PASSWORD_HASH_EXECUTOR)
+    parser.add_argument("--max-pending", type=int, default=settings.PASSWORD_HASH_MAX_PENDING)
+    parser.add_argument("--rounds", type=int, default=settings.PASSWORD_BCRYPT_ROUNDS, help="bcrypt rounds (작업량)")
+    parser.add_argument("--password", default="correct horse battery staple")
+    args = parser.parse_args()
+
+    # 풀은 처음 사용할 때 만들어지므로 그 전에 설정을 바꿉니다.
+    password_executor.kind = args.kind
+    password_executor.max_workers = args.workers
+    password_executor.max_pending = args.max_pending
+    context = CryptContext(schemes=["bcrypt"], deprecated="auto", bcrypt__rounds=args.rounds)
+    # 워커(프로세스 포함)는 security.pwd_context로 확인하므로 같은 rounds의 해시를 씁니다.
+    hashed = context.hash(args.password)
+    try:
+        asyncio.run(bench(args, context, hashed))
+    finally:
+        password_executor.shutdown()
+
+
+if __name__ == "__main__":
+    main()
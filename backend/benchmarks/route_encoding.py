@@ -0,0 +1,72 @@
+# backend/benchmarks/route_encoding.py
+"""
+경로 저장 형식(JSONB 점 배열 vs encoded polyline) 크기/지연 시간 벤치마크
+
+실행 (backend 디렉토리에서):
+    python -m benchmarks.route_encoding
+    python -m benchmarks.route_encoding --sizes 1000 10000 50000 --repeat 20
+
+점 개수별로 다음을 비교합니다.
+- bytes/pt: JSON 직렬화 크기와 polyline 바이트 크기 (점당)
+- encode: json.dumps 대비 polyline.encode_points
+- decode: json.loads 대비 polyline.decode_points(dict 리스트) / polyline.decode(배열)
+- validate: 응답 스키마의 route(List[Any]) 검증 대비 route_polyline(str) 검증
+"""
+import argparse
+import json
+import time
+from typing import Any, Callable, List, Optional
+
+import numpy as np
+from pydantic import TypeAdapter
+
+from app.core import polyline
+from benchmarks.similarity import synthetic_route, to_points
+
+
+def p50_ms(fn: Callable[[], Any], repeat: int) -> float:
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - started) * 1000)
+    return float(np.percentile(samples, 50))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1_000, 10_000, 50_000])
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(args.seed)
+    points_adapter = TypeAdapter(Optional[List[Any]])
+    text_adapter = TypeAdapter(Optional[str])
+
+    print(
+        f"{'points':>8}{'json B/pt':>11}{'poly B/pt':>11}"
+        f"{'json enc':>10}{'poly enc':>10}{'json dec':>10}{'poly dec':>10}{'poly arr':>10}"
+        f"{'json val':>10}{'poly val':>10}   (ms, p50)"
+    )
+    for size in args.sizes:
+        # 저장 정밀도(1e-6)로 반올림해 두 형식이 같은 좌표를 담도록 합니다.
+        points = to_points(np.round(synthetic_route(size, rng), 6))
+        as_json = json.dumps(points)
+        encoded = polyline.encode_points(points)
+        as_text = encoded.decode("ascii")
+
+        print(
+            f"{size:>8}{len(as_json) / size:>11.1f}{len(encoded) / size:>11.1f}"
+            f"{p50_ms(lambda: json.dumps(points), args.repeat):>10.2f}"
+            f"{p50_ms(lambda: polyline.encode_points(points), args.repeat):>10.2f}"
+            f"{p50_ms(lambda: json.loads(as_json), args.repeat):>10.2f}"
+            f"{p50_ms(lambda: polyline.decode_points(encoded), args.repeat):>10.2f}"
+            f"{p50_ms(lambda: polyline.decode(encoded), args.repeat):>10.2f}"
+            f"{p50_ms(lambda: points_adapter.validate_python(points), args.repeat):>10.2f}"
+            f"{p50_ms(lambda: text_adapter.validate_python(as_text), args.repeat):>10.2f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+# backend/benchmarks/similarity.py
+"""
+경로 유사도 엔진 벤치마크
+
+실행 (backend 디렉토리에서):
+    python -m benchmarks.similarity
+    python -m benchmarks.similarity --sizes 1000 10000 50000 --repeat 20 --naive-max 2000
+
+코스 경로와 사용자 경로(코스 + GPS 노이즈)를 같은 점 개수로 합성하여
+엔진별 p50/p99 지연 시간을 출력합니다. naive 엔진은 O(N·M)이므로 --naive-max 이하 크기에서만 측정합니다.
+"""
+import argparse
+import time
+from typing import Dict, List
+
+import numpy as np
+
+from app.core.geo import LocalProjection
+from app.core.similarity import calculate_similarity_score
+
+
+def synthetic_route(n: int, rng: np.random.Generator, step_m: float = 3.0) -> np.ndarray:
+    """
+    서울 근처에서 방향이 천천히 바뀌는 랜덤 워크 경로([lat, lng] 배열)를 만듭니다.
+    """
+    heading = np.cumsum(rng.normal(0.0, 0.15, n))
+    xy = np.cumsum(np.c_[np.cos(heading), np.sin(heading)] * step_m, axis=0)
+    return LocalProjection(37.5665, 126.9780).inverse(xy)
+
+
+def to_points(latlng: np.ndarray) -> List[Dict[str, float]]:
+    return [{"lat": float(lat), "lng": float(lng)} for lat, lng in latlng]
+
+
+def measure(engine: str, course: list, attempt: list, repeat: int) -> np.ndarray:
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        calculate_similarity_score(course, attempt, engine=engine)
+        samples.append((time.perf_counter() - started) * 1000)
+    return np.array(samples)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1_000, 10_000, 50_000])
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--naive-max", type=int, default=2_000)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(args.seed)
+    print(f"{'engine':<11}{'points':>8}{'p50 (ms)':>12}{'p99 (ms)':>12}{'score':>8}")
+    for size in args.sizes:
+        course_arr = synthetic_route(size, rng)
+        # 약 5m 표준편차의 GPS 노이즈를 더한 사용자 경로
+        attempt_arr = course_arr + rng.normal(0.0, 5.0 / 111_000, course_arr.shape)
+        course, attempt = to_points(course_arr), to_points(attempt_arr)
+
+        for engine in ("vectorized", "naive"):
+            if engine == "naive" and size > args.naive_max:
+                print(f"{engine:<11}{size:>8}{'skipped':>12}{'':>12}")
+                continue
+            repeat = args.repeat if engine == "vectorized" else max(1, min(args.repeat, 3))
+            samples = measure(engine, course, attempt, repeat)
+            score = calculate_similarity_score(course, attempt, engine=engine)
+            print(
+                f"{engine:<11}{size:>8}"
+                f"{np.percentile(samples, 50):>12.2f}{np.percentile(samples, 99):>12.2f}{score:>8.3f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,110 @@
+# backend/benchmarks/thumbnails.py
+"""
+경로 썸네일 렌더링/캐시 처리량 벤치마크
+
+실행 (backend 디렉토리에서):
+    python -m benchmarks.thumbnails
+    python -m benchmarks.thumbnails --count 500 --concurrency 32 --workers 4 --kind process --formats png webp
+
+임시 MEDIA_ROOT에서 합성 경로 count개(저장되는 지도 단계, 최대 256점)의 썸네일을 concurrency개씩 동시에 요청합니다.
+- cold: 캐시가 비어 있어 thumbnail_executor에서 그리고 저장하는 경우
+- warm: 캐시 파일이 있어 확인 후 읽기만 하는 경우 (FileResponse가 보내는 것과 같은 바이트)
+- 304: If-None-Match가 맞아 ETag만 계산하는 경우
+"""
+import argparse
+import asyncio
+import tempfile
+import time
+from typing import Awaitable, Callable, List
+
+import numpy as np
+
+from app.core import polyline
+from app.core.config import settings
+from app.core.executor import thumbnail_executor
+from app.core.simplify import simplify_levels
+from app.core.thumbnails import get_route_thumbnail, thumbnail_etag
+from app.models.route import ROUTE_MAP_POINTS
+from benchmarks.similarity import synthetic_route
+
+
+async def run_all(
+    jobs: List[Callable[[], Awaitable[None]]], concurrency: int
+) -> tuple[float, np.ndarray]:
+    """
+    jobs를 동시에 최대 concurrency개씩 실행하고 (전체 초, 요청별 지연 ms 배열)을 반환합니다.
+    """
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies: List[float] = []
+
+    async def one(job: Callable[[], Awaitable[None]]) -> None:
+        async with semaphore:
+            started = time.perf_counter()
+            await job()
+            latencies.append((time.perf_counter() - started) * 1000)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(one(job) for job in jobs))
+    return time.perf_counter() - started, np.array(latencies)
+
+
+def report(label: str, fmt: str, count: int, elapsed: float, latencies: np.ndarray) -> None:
+    print(
+        f"{label:<6}{fmt:>6}{count / elapsed:>12.0f}"
+        f"{np.percentile(latencies, 50):>11.2f}{np.percentile(latencies, 99):>11.2f}"
+    )
+
+
+async def bench(args: argparse.Namespace) -> None:
+    rng = np.random.default_rng(args.seed)
+    routes = [
+        polyline.encode(simplify_levels(synthetic_route(args.points, rng), (ROUTE_MAP_POINTS,))[0])
+        for _ in range(args.count)
+    ]
+    size = settings.THUMBNAIL_SIZE
+
+    print(f"{'cache':<6}{'fmt':>6}{'thumbs/s':>12}{'p50 (ms)':>11}{'p99 (ms)':>11}")
+    for fmt in args.formats:
+        def render(i: int) -> Callable[[], Awaitable[None]]:
+            async def job() -> None:
+                path, _ = await get_route_thumbnail("runs", i, routes[i], size=size, fmt=fmt)
+                # 캐시 파일을 읽는 비용도 포함합니다. (실제 응답은 스레드풀에서 같은 파일을 보냄)
+                await asyncio.to_thread(path.read_bytes)
+            return job
+
+        for label in ("cold", "warm"):
+            elapsed, latencies = await run_all([render(i) for i in range(args.count)], args.concurrency)
+            report(label, fmt, args.count, elapsed, latencies)
+
+        async def not_modified(route: bytes = routes[0]) -> None:
+            thumbnail_etag(route, size, fmt)
+
+        elapsed, latencies = await run_all([not_modified] * args.count, args.concurrency)
+        report("304", fmt, args.count, elapsed, latencies)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--count", type=int, default=200)
+    parser.add_argument("--points", type=int, default=10_000, help="원본 경로 점 수 (지도 단계로 줄인 뒤 그림)")
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--workers", type=int, default=settings.THUMBNAIL_WORKERS)
+    parser.add_argument("--kind", choices=("thread", "process"), default=settings.THUMBNAIL_EXECUTOR)
+    parser.add_argument("--formats", nargs="+", choices=("png", "webp"), default=["png", "webp"])
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    # 풀은 처음 사용할 때 만들어지므로 그 전에 설정을 바꿉니다.
+    thumbnail_executor.kind = args.kind
+    thumbnail_executor.max_workers = args.workers
+    thumbnail_executor.max_pending = max(thumbnail_executor.max_pending, args.concurrency)
+    with tempfile.TemporaryDirectory() as media_root:
+        settings.MEDIA_ROOT = media_root
+        try:
+            asyncio.run(bench(args))
+        finally:
+            thumbnail_executor.shutdown()
+
+
+if __name__ == "__main__":
+    main()
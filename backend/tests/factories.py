@@ -0,0 +1,44 @@
+# backend/tests/factories.py
+"""
+테스트 데이터용 모델 생성 함수 (세션에 추가/커밋은 호출한 쪽에서)
+"""
+import uuid
+from datetime import datetime, timedelta
+from typing import Dict
+
+import numpy as np
+
+from app import models
+from app.core import polyline
+from app.core.rally_points import generate_rally_points
+from app.core.security import UNUSABLE_PASSWORD, create_access_token
+
+# 서울 시청 근처 약 490m 직선 경로
+ROUTE = polyline.encode(np.array([[37.5665 + i * 1e-4, 126.9780 + i * 1e-4] for i in range(50)]))
+
+
+def auth_headers(user: models.User) -> Dict[str, str]:
+    return {"Authorization": f"Bearer {create_access_token({'sub': str(user.id)})}"}
+
+
+def new_user() -> models.User:
+    # id를 미리 정해 flush 전에도 다른 행의 FK로 쓸 수 있게 합니다.
+    tag = uuid.uuid4().hex[:12]
+    return models.User(id=uuid.uuid4(), email=f"{tag}@example.com", nickname=tag, hashed_password=UNUSABLE_PASSWORD)
+
+
+def new_course(owner: models.User, **fields) -> models.Course:
+    # 경로에서 나오는 값(단순화 전 원본, 랠리 포인트)까지 코스 생성 API와 같이 채웁니다. (fields로 덮어씀)
+    values = dict(
+        id=uuid.uuid4(), name=f"course {uuid.uuid4().hex[:6]}", user_id=owner.id, distance=490.0,
+        route_polyline=ROUTE, raw_route_polyline=ROUTE, rally_points=generate_rally_points(ROUTE),
+    )
+    values.update(fields)
+    return models.Course(**values)
+
+
+def new_run(user: models.User, i: int = 0) -> models.Run:
+    return models.Run(
+        user_id=user.id, distance=490.0, duration=180.0 + i, route_polyline=ROUTE,
+        created_at=datetime(2024, 1, 1) + timedelta(minutes=i),
+    )
@@ -0,0 +1,61 @@
+# backend/tests/test_courses.py
+"""
+코스 수정(PATCH) 시 경로에서 나온 값(랠리 포인트, 단순화 전 원본) 갱신
+"""
+import numpy as np
+import pytest
+from sqlalchemy import select
+from sqlalchemy.orm import undefer
+
+from app import models
+from app.core import polyline
+from app.core.rally_points import generate_rally_points
+from tests.factories import ROUTE, auth_headers, new_course, new_user
+
+# ROUTE와 겹치지 않는 약 1.1km 경로 (부산)
+NEW_ROUTE = polyline.encode(np.array([[35.1796 + i * 1e-4, 129.0756] for i in range(100)]))
+
+
+@pytest.fixture
+def course(run_db):
+    async def seed(db):
+        owner = new_user()
+        db_course = new_course(owner)
+        db.add_all([owner, db_course])
+        await db.commit()
+        return owner, db_course
+
+    return run_db(seed)
+
+
+def stored(run_db, course_id):
+    async def read(db):
+        return await db.scalar(
+            select(models.Course).options(undefer(models.Course.raw_route_polyline)).filter(models.Course.id == course_id)
+        )
+
+    return run_db(read)
+
+
+def test_route_change_regenerates_rally_points(client, run_db, course):
+    owner, db_course = course
+    response = client.patch(
+        f"/api/v1/courses/{db_course.id}", json={"route_polyline": NEW_ROUTE.decode()}, headers=auth_headers(owner)
+    )
+    assert response.status_code == 200, response.text
+
+    start = response.json()["rally_points"][0]
+    assert (start["lat"], start["lng"]) == pytest.approx((35.1796, 129.0756))
+    updated = stored(run_db, db_course.id)
+    assert updated.rally_points == generate_rally_points(NEW_ROUTE)
+    assert updated.raw_route_polyline is None
+
+
+def test_other_fields_keep_route_data(client, run_db, course):
+    owner, db_course = course
+    response = client.patch(f"/api/v1/courses/{db_course.id}", json={"name": "renamed"}, headers=auth_headers(owner))
+    assert response.status_code == 200, response.text
+
+    updated = stored(run_db, db_course.id)
+    assert updated.rally_points == db_course.rally_points
+    assert updated.raw_route_polyline == ROUTE
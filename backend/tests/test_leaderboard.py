@@ -0,0 +1,129 @@
+# backend/tests/test_leaderboard.py
+"""
+기록 삭제/수정 후 리더보드 최고 기록 재계산 (crud.leaderboard.recompute_entry), 순위 인덱스
+"""
+import asyncio
+import uuid
+from datetime import datetime
+
+import pytest
+from sqlalchemy import select
+
+from app import models
+from app.core.leaderboard_index import InProcessLeaderboardIndex
+from app.crud import leaderboard
+from tests.factories import auth_headers, new_course, new_run, new_user
+
+
+@pytest.fixture
+def two_attempts(run_db):
+    """
+    한 사용자가 한 코스를 두 번 성공했습니다. (200초가 최고, 260초가 그다음)
+    """
+    async def seed(db):
+        runner = new_user()
+        course = new_course(runner)
+        fast, slow = new_run(runner), new_run(runner)
+        fast.duration, slow.duration = 200.0, 260.0
+        db.add_all([runner, course, fast, slow])
+        await db.flush()
+        for run in (fast, slow):
+            db.add(models.CourseAttempt(
+                user_id=runner.id, course_id=course.id, run_id=run.id,
+                similarity_score=0.9, is_successful=True, status="scored", attempted_at=datetime(2024, 1, 1),
+            ))
+            await db.flush()
+        await leaderboard.recompute_entry(db, course_id=course.id, user_id=runner.id)
+        await db.commit()
+        return runner, course, fast, slow
+
+    return run_db(seed)
+
+
+def best_duration(run_db, course_id, user_id):
+    async def read(db):
+        Entry = models.CourseLeaderboardEntry
+        return await db.scalar(
+            select(Entry.best_duration).filter(Entry.course_id == course_id, Entry.user_id == user_id)
+        )
+
+    return run_db(read)
+
+
+def test_deleting_best_run_falls_back_to_next_best(client, run_db, two_attempts):
+    runner, course, fast, slow = two_attempts
+    assert best_duration(run_db, course.id, runner.id) == 200.0
+
+    response = client.delete(f"/api/v1/runs/{fast.id}", headers=auth_headers(runner))
+    assert response.status_code == 200, response.text
+    assert best_duration(run_db, course.id, runner.id) == 260.0
+
+    response = client.delete(f"/api/v1/runs/{slow.id}", headers=auth_headers(runner))
+    assert response.status_code == 200, response.text
+    assert best_duration(run_db, course.id, runner.id) is None
+
+
+def test_editing_duration_recomputes_best(client, run_db, two_attempts):
+    runner, course, fast, slow = two_attempts
+
+    # 최고 기록이 느려지면 다른 도전이 최고 기록이 됩니다.
+    response = client.patch(f"/api/v1/runs/{fast.id}", json={"duration": 300.0}, headers=auth_headers(runner))
+    assert response.status_code == 200, response.text
+    assert best_duration(run_db, course.id, runner.id) == 260.0
+
+    response = client.patch(f"/api/v1/runs/{slow.id}", json={"duration": 150.0}, headers=auth_headers(runner))
+    assert response.status_code == 200, response.text
+    assert best_duration(run_db, course.id, runner.id) == 150.0
+
+
+def test_in_process_index_orders_ties_by_achieved_at_then_user():
+    index = InProcessLeaderboardIndex()
+    course = uuid.uuid4()
+    a, b, c, d = sorted(uuid.uuid4() for _ in range(4))
+
+    async def main():
+        await index.upsert(course, (100.0, datetime(2024, 1, 1), a))  # 채워지기 전에는 무시
+        await index.load(course, [
+            (200.0, datetime(2024, 1, 2), a), (200.0, datetime(2024, 1, 1), d),
+            (200.0, datetime(2024, 1, 1), c), (150.0, datetime(2024, 1, 3), b),
+        ])
+        before = await index.page(course, 0, 10)
+        await index.upsert(course, (100.0, datetime(2024, 1, 4), a))
+        await index.remove(course, b)
+        return before, await index.page(course, 1, 2), await index.rank(course, a), await index.rank(course, b)
+
+    assert asyncio.run(main()) == ([b, c, d, a], [c, d], 0, None)
+
+
+def test_around_me_follows_recomputed_entry(client, run_db, two_attempts):
+    runner, course, fast, slow = two_attempts
+
+    async def add_rival(db):
+        rival = new_user()
+        db.add(rival)
+        await db.flush()
+        run = new_run(rival)
+        run.duration = 230.0
+        db.add(run)
+        await db.flush()
+        db.add(models.CourseAttempt(
+            user_id=rival.id, course_id=course.id, run_id=run.id,
+            similarity_score=0.9, is_successful=True, status="scored", attempted_at=datetime(2024, 1, 1),
+        ))
+        await db.flush()
+        await leaderboard.recompute_entry(db, course_id=course.id, user_id=rival.id)
+        await db.commit()
+
+    run_db(add_rival)
+    headers = auth_headers(runner)
+
+    def my_rank():
+        response = client.get(f"/api/v1/courses/{course.id}/ranking", params={"around_me": "true"}, headers=headers)
+        assert response.status_code == 200, response.text
+        return next(row["rank"] for row in response.json() if row["user_id"] == str(runner.id))
+
+    assert my_rank() == 1
+    # 최고 기록(200초)을 지우면 260초가 되어 230초인 상대 뒤로 갑니다. (인덱스도 함께 갱신)
+    response = client.delete(f"/api/v1/runs/{fast.id}", headers=headers)
+    assert response.status_code == 200, response.text
+    assert my_rank() == 2
@@ -0,0 +1,69 @@
+# backend/tests/test_live.py
+"""
+실시간 트래킹: 인메모리 브로커의 마지막 메시지 보관 한도, 완료된 기록으로의 샘플 전송 거절
+"""
+import asyncio
+
+import pytest
+from starlette.websockets import WebSocketDisconnect
+
+from app.core.live import MESSAGE_STATUS, InProcessLiveBroker, get_live_broker, run_channel
+from tests.factories import auth_headers, new_run, new_user
+
+POINT = {"lat": 37.5665, "lng": 126.978, "t": 1700000000.0}
+
+
+def test_in_process_last_is_bounded_by_channel_count():
+    async def main():
+        broker = InProcessLiveBroker(buffer_size=4, max_channels=2)
+        for channel in ("a", "b", "c"):
+            await broker.publish(channel, {"channel": channel})
+        return [await broker.last(channel) for channel in ("a", "b", "c")]
+
+    assert asyncio.run(main()) == [None, {"channel": "b"}, {"channel": "c"}]
+
+
+def test_in_process_last_expires(monkeypatch):
+    async def main():
+        broker = InProcessLiveBroker(buffer_size=4, max_channels=10)
+        monkeypatch.setattr(broker, "LAST_TTL_SECONDS", -1)
+        await broker.publish("a", {"channel": "a"})
+        return await broker.last("a"), len(broker._last)
+
+    assert asyncio.run(main()) == (None, 0)
+
+
+@pytest.fixture
+def running(run_db):
+    async def seed(db):
+        runner = new_user()
+        run = new_run(runner)
+        run.status = "running"
+        db.add_all([runner, run])
+        await db.commit()
+        return runner, run
+
+    return run_db(seed)
+
+
+def test_stream_rejects_binary_frames_and_closes_once_finished(client, running):
+    runner, run = running
+    headers = auth_headers(runner)
+    with client.websocket_connect(f"/api/v1/runs/{run.id}/live", headers=headers) as ws:
+        ws.send_bytes(b"\x00\x01")
+        assert ws.receive_json()["type"] == "error"
+
+        ws.send_json({"seq": 0, "points": [POINT]})
+        assert ws.receive_json()["duplicate"] is False
+
+        response = client.patch(f"/api/v1/runs/{run.id}", json={"status": "finished"}, headers=headers)
+        assert response.status_code == 200, response.text
+
+        ws.send_json({"seq": 1, "points": [POINT]})
+        with pytest.raises(WebSocketDisconnect) as closed:
+            ws.receive_json()
+        assert closed.value.code == 1008
+
+    # 완료 뒤에는 연결 종료 상태를 다시 남기지 않습니다.
+    last = asyncio.run(get_live_broker().last(run_channel(run.id)))
+    assert last is None or last.get("type") != MESSAGE_STATUS
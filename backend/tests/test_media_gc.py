@@ -0,0 +1,75 @@
+# backend/tests/test_media_gc.py
+"""
+사용자 삭제(앨범 CASCADE) 뒤 미디어 객체 참조 수 보정과 정리 (crud.media.gc_unreferenced_blobs)
+"""
+import uuid
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import delete, select
+
+from app import models
+from app.crud import media
+from app.models.album import Album
+from tests.factories import new_user
+
+
+def blob(sha256: str, ref_count: int, created_at: datetime = datetime(2024, 1, 1)) -> models.MediaBlob:
+    return models.MediaBlob(
+        sha256=sha256, storage_key=f"blobs/{sha256}.png", content_type="image/png", size=10,
+        ref_count=ref_count, created_at=created_at,
+    )
+
+
+def album(owner: models.User, sha256: str) -> Album:
+    return Album(id=uuid.uuid4(), user_id=owner.id, composed_url=f"/media/blobs/{sha256}.png", composed_blob=sha256)
+
+
+@pytest.fixture
+def shared_blobs(run_db):
+    """
+    only는 삭제될 사용자의 앨범만, shared는 두 사용자의 앨범이 함께 참조합니다.
+    """
+    only, shared = uuid.uuid4().hex + "0" * 32, uuid.uuid4().hex + "1" * 32
+
+    async def seed(db):
+        leaving, staying = new_user(), new_user()
+        db.add_all([leaving, staying, blob(only, 1), blob(shared, 2)])
+        await db.flush()
+        db.add_all([album(leaving, only), album(leaving, shared), album(staying, shared)])
+        await db.commit()
+        return leaving
+
+    return run_db(seed), only, shared
+
+
+def test_gc_recounts_refs_after_user_cascade(run_db, shared_blobs):
+    leaving, only, shared = shared_blobs
+
+    async def delete_user_and_gc(db):
+        # API를 거치지 않은 사용자 삭제: 앨범은 FK CASCADE로 지워지고 ref_count는 그대로 남습니다.
+        await db.execute(delete(models.User).where(models.User.id == leaving.id))
+        await db.commit()
+        keys = await media.gc_unreferenced_blobs(db, older_than=timedelta(0))
+        counts = dict((await db.execute(
+            select(models.MediaBlob.sha256, models.MediaBlob.ref_count).where(models.MediaBlob.sha256.in_([only, shared]))
+        )).all())
+        return keys, counts
+
+    keys, counts = run_db(delete_user_and_gc)
+    assert keys == [f"blobs/{only}.png"]
+    assert counts == {shared: 1}
+
+
+def test_gc_keeps_recent_uploads(run_db):
+    # 다시 올린 객체는 created_at이 업로드 시각으로 당겨져 유예 기간 동안 남습니다. (crud.media.store_upload)
+    old, recent = uuid.uuid4().hex + "2" * 32, uuid.uuid4().hex + "3" * 32
+
+    async def seed_and_gc(db):
+        db.add_all([blob(old, 0), blob(recent, 0, datetime.utcnow())])
+        await db.commit()
+        await media.gc_unreferenced_blobs(db)
+        kept = await db.execute(select(models.MediaBlob.sha256).where(models.MediaBlob.sha256.in_([old, recent])))
+        return set(kept.scalars())
+
+    assert run_db(seed_and_gc) == {recent}
@@ -0,0 +1,76 @@
+# backend/tests/test_media_upload.py
+"""
+업로드 본문을 스풀 없이 한 번에 받아 저장 (app.core.media.receive_upload): Content-Length 선확인, 받는 중 상한, 정리
+"""
+import asyncio
+import hashlib
+import os
+
+import pytest
+from starlette.requests import Request
+
+from app.core.media import MULTIPART_OVERHEAD_BYTES, UPLOAD_CHUNK_SIZE, UploadFormError, UploadTooLargeError, receive_upload
+
+BOUNDARY = "r3-test-boundary"
+
+
+def multipart_body(parts) -> bytes:
+    body = b""
+    for name, filename, content in parts:
+        disposition = f'form-data; name="{name}"' + (f'; filename="{filename}"' if filename else "")
+        body += f"--{BOUNDARY}\r\nContent-Disposition: {disposition}\r\n".encode()
+        if filename:
+            body += b"Content-Type: image/png\r\n"
+        body += b"\r\n" + content + b"\r\n"
+    return body + f"--{BOUNDARY}--\r\n".encode()
+
+
+def upload_request(body: bytes, *, chunk: int = 8192, content_length: bool = True) -> Request:
+    headers = [(b"content-type", f"multipart/form-data; boundary={BOUNDARY}".encode())]
+    if content_length:
+        headers.append((b"content-length", str(len(body)).encode()))
+    chunks = [body[i:i + chunk] for i in range(0, len(body), chunk)] or [b""]
+
+    async def receive():
+        data = chunks.pop(0)
+        return {"type": "http.request", "body": data, "more_body": bool(chunks)}
+
+    return Request({"type": "http", "method": "POST", "headers": headers}, receive)
+
+
+def test_streams_file_field_in_one_pass(tmp_path):
+    content = os.urandom(UPLOAD_CHUNK_SIZE * 2 + 123)
+    body = multipart_body([("caption", None, b"hello"), ("file", "a.png", content), ("extra", "b.png", b"x" * 10)])
+    target = tmp_path / "out.png"
+
+    stored = asyncio.run(receive_upload(upload_request(body), target, max_bytes=len(content)))
+    assert target.read_bytes() == content
+    assert (stored.size, stored.sha256) == (len(content), hashlib.sha256(content).hexdigest())
+    assert (stored.filename, stored.content_type) == ("a.png", "image/png")
+    assert os.listdir(tmp_path) == ["out.png"]
+
+
+def test_rejects_by_content_length_before_reading(tmp_path):
+    body = multipart_body([("file", "a.png", b"x" * (MULTIPART_OVERHEAD_BYTES + 2048))])
+
+    async def receive():
+        pytest.fail("body must not be read")
+
+    request = upload_request(body)
+    request = Request(request.scope, receive)
+    with pytest.raises(UploadTooLargeError):
+        asyncio.run(receive_upload(request, tmp_path / "out.png", max_bytes=1024))
+
+
+def test_stops_mid_stream_without_content_length(tmp_path):
+    body = multipart_body([("file", "a.png", b"x" * (UPLOAD_CHUNK_SIZE * 4))])
+    with pytest.raises(UploadTooLargeError):
+        asyncio.run(receive_upload(upload_request(body, content_length=False), tmp_path / "out.png", max_bytes=1024))
+    assert os.listdir(tmp_path) == []
+
+
+def test_missing_file_field(tmp_path):
+    body = multipart_body([("caption", None, b"hello")])
+    with pytest.raises(UploadFormError):
+        asyncio.run(receive_upload(upload_request(body), tmp_path / "out.png"))
+    assert os.listdir(tmp_path) == []
@@ -0,0 +1,237 @@
+# backend/tests/test_query_counts.py
+"""
+목록/조회 API가 보내는 SQL 문장 수 회귀 테스트 (N+1 방지)
+
+모든 관계가 lazy="raise"라 빠뜨린 로더 옵션은 500으로 드러나고,
+여기서는 행 수가 늘어도 문장 수가 그대로인지, 인증 경로가 users 행 하나만 읽는지 확인합니다.
+"""
+import re
+import uuid
+from typing import List
+
+import pytest
+
+from app import models
+from app.models.album import Album
+from tests.factories import auth_headers, new_course, new_run, new_user
+
+MANY = 10
+
+
+def tables_in(statement: str) -> List[str]:
+    # 문장의 FROM/JOIN 대상 테이블 이름
+    return re.findall(r"(?:FROM|JOIN)\s+(\w+)", statement)
+
+
+@pytest.fixture
+def user(run_db) -> models.User:
+    async def seed(db):
+        db_user = new_user()
+        db.add(db_user)
+        await db.commit()
+        return db_user
+
+    return run_db(seed)
+
+
+@pytest.fixture
+def seed_runs(run_db, user):
+    def seed(n: int) -> List[models.Run]:
+        async def add(db):
+            rows = [new_run(user, i) for i in range(n)]
+            db.add_all(rows)
+            await db.commit()
+            return rows
+
+        return run_db(add)
+
+    return seed
+
+
+@pytest.fixture
+def seed_courses(run_db, user):
+    def seed(n: int) -> List[models.Course]:
+        async def add(db):
+            rows = [
+                new_course(user, name=f"course {i} {uuid.uuid4().hex[:6]}")
+                for i in range(n)
+            ]
+            db.add_all(rows)
+            await db.commit()
+            return rows
+
+        return run_db(add)
+
+    return seed
+
+
+@pytest.fixture
+def seed_ranking(run_db, user):
+    """
+    코스 하나에 n명의 성공한 도전과 리더보드 항목을 만듭니다.
+    """
+    def seed(n: int) -> models.Course:
+        async def add(db):
+            course = new_course(user)
+            db.add(course)
+            for i in range(n):
+                runner = new_user()
+                run = new_run(runner, i)
+                db.add_all([runner, run])
+                await db.flush()
+                attempt = models.CourseAttempt(
+                    user_id=runner.id, course_id=course.id, run_id=run.id,
+                    similarity_score=0.9, is_successful=True, status="scored",
+                )
+                db.add(attempt)
+                await db.flush()
+                db.add(models.CourseLeaderboardEntry(
+                    course_id=course.id, user_id=runner.id, attempt_id=attempt.id, run_id=run.id,
+                    best_duration=run.duration, similarity_score=0.9, achieved_at=run.created_at,
+                ))
+            await db.commit()
+            return course
+
+        return run_db(add)
+
+    return seed
+
+
+@pytest.fixture
+def seed_albums(run_db, user):
+    def seed(n: int) -> List[Album]:
+        async def add(db):
+            rows = []
+            for i in range(n):
+                sha = uuid.uuid4().hex * 2
+                key = f"blobs/{sha[:2]}/{sha[2:4]}/{sha}.png"
+                db.add(models.MediaBlob(
+                    sha256=sha, storage_key=key, content_type="image/png", size=1024, ref_count=1,
+                    width=1080, height=1350, placeholder="data:image/webp;base64,AA==",
+                    variants=[{"format": "webp", "width": 320, "height": 400, "size": 512, "key": f"derived/{sha}/w320.webp"}],
+                ))
+                rows.append(Album(user_id=user.id, composed_url=f"/media/{key}", composed_blob=sha, caption=f"album {i}"))
+            await db.flush()
+            db.add_all(rows)
+            await db.commit()
+            return rows
+
+        return run_db(add)
+
+    return seed
+
+
+def test_auth_reads_one_users_row_without_password(client, queries, user):
+    with queries.count() as statements:
+        response = client.get("/api/v1/users/me", headers=auth_headers(user))
+
+    assert response.status_code == 200, response.text
+    assert len(statements) == 1, statements
+    assert tables_in(statements[0]) == ["users"]
+    # 인증은 hashed_password를 읽지 않습니다. (defer(raiseload=True))
+    assert "hashed_password" not in statements[0]
+
+
+@pytest.mark.parametrize("params", [{}, {"detail": "thumb"}, {"detail": "map", "route_format": "polyline"}])
+def test_run_list_is_constant(client, queries, user, seed_runs, params):
+    seed_runs(1)
+    with queries.count() as one:
+        response = client.get("/api/v1/runs/", params=params, headers=auth_headers(user))
+    assert response.status_code == 200, response.text
+
+    seed_runs(MANY)
+    with queries.count() as many:
+        response = client.get("/api/v1/runs/", params=params, headers=auth_headers(user))
+    assert response.status_code == 200, response.text
+    assert len(response.json()) == MANY + 1
+
+    # 인증 1 + 목록 1
+    assert len(one) == len(many) == 2, many
+
+
+@pytest.mark.parametrize("params", [{}, {"detail": "thumb"}, {"route_format": "polyline"}])
+def test_run_detail(client, queries, user, seed_runs, params):
+    (run,) = seed_runs(1)
+    with queries.count() as statements:
+        response = client.get(f"/api/v1/runs/{run.id}", params=params, headers=auth_headers(user))
+
+    assert response.status_code == 200, response.text
+    assert len(statements) == 2, statements
+
+
+@pytest.mark.parametrize("params", [{}, {"detail": "thumb"}])
+def test_course_list_is_constant(client, queries, user, seed_courses, params):
+    seed_courses(1)
+    with queries.count() as one:
+        response = client.get("/api/v1/courses/", params=params, headers=auth_headers(user))
+    assert response.status_code == 200, response.text
+
+    seed_courses(MANY)
+    with queries.count() as many:
+        response = client.get("/api/v1/courses/", params=params, headers=auth_headers(user))
+    assert response.status_code == 200, response.text
+    assert len(response.json()) == MANY + 1
+
+    assert len(one) == len(many) == 2, many
+    # 보관용 원본 경로/검색 컬럼/공간 컬럼은 목록에서 읽지 않습니다. (deferred)
+    for column in ("raw_route_polyline", "search_bigrams", "start_point"):
+        assert column not in many[-1]
+
+
+def test_course_detail(client, queries, user, seed_courses):
+    (course,) = seed_courses(1)
+    with queries.count() as statements:
+        response = client.get(f"/api/v1/courses/{course.id}", headers=auth_headers(user))
+
+    assert response.status_code == 200, response.text
+    assert len(statements) == 2, statements
+
+
+def test_course_ranking_is_constant(client, queries, seed_ranking):
+    small, large = seed_ranking(1), seed_ranking(MANY)
+    # 코스별 첫 조회는 순위 인덱스를 테이블에서 한 번 채웁니다. (app.core.leaderboard_index)
+    for course in (small, large):
+        with queries.count() as first:
+            client.get(f"/api/v1/courses/{course.id}/ranking")
+        assert len(first) == 2, first
+
+    with queries.count() as one:
+        response = client.get(f"/api/v1/courses/{small.id}/ranking")
+    assert response.status_code == 200, response.text
+
+    with queries.count() as many:
+        response = client.get(f"/api/v1/courses/{large.id}/ranking")
+    assert response.status_code == 200, response.text
+    assert len(response.json()) == MANY
+
+    # 닉네임은 users를 join해 한 번에 읽습니다.
+    assert len(one) == len(many) == 1, many
+
+
+def test_album_list_is_constant(client, queries, user, seed_albums):
+    seed_albums(1)
+    with queries.count() as one:
+        response = client.get("/api/v1/albums/", headers=auth_headers(user))
+    assert response.status_code == 200, response.text
+
+    seed_albums(MANY)
+    with queries.count() as many:
+        response = client.get("/api/v1/albums/", headers=auth_headers(user))
+    assert response.status_code == 200, response.text
+    body = response.json()
+    assert len(body) == MANY + 1
+    assert all(item["composed_image"] is not None for item in body)
+
+    # 인증 1 + 앨범 1 + 파생본 정보(selectinload, 앨범 수와 무관하게 1)
+    assert len(one) == len(many) == 3, many
+    assert tables_in(many[-1]) == ["media_blobs"]
+
+
+def test_album_detail(client, queries, user, seed_albums):
+    (album,) = seed_albums(1)
+    with queries.count() as statements:
+        response = client.get(f"/api/v1/albums/{album.id}", headers=auth_headers(user))
+
+    assert response.status_code == 200, response.text
+    assert response.json()["composed_image"]["variants"]
+    assert len(statements) == 3, statements
@@ -0,0 +1,31 @@
+# backend/tests/test_rally_points.py
+"""
+랠리 포인트 사전 검증은 기록의 샘플 점이 아니라 샘플 사이 선분까지의 거리로 판단합니다. (core.rally_points)
+"""
+import numpy as np
+
+from app.core.rally_points import check_rally_points
+
+# 위도 1e-4도 ≈ 11m
+RALLY = [
+    {"order": 0, "type": "start", "lat": 37.5, "lng": 127.0},
+    {"order": 1, "type": "checkpoint", "lat": 37.50495, "lng": 127.0},
+    {"order": 2, "type": "finish", "lat": 37.509, "lng": 127.0},
+]
+
+
+def test_sparse_samples_pass_between_points():
+    # 약 100m 간격 샘플: 가운데 포인트는 두 샘플 사이(각각 약 50m)를 지납니다.
+    run = np.array([[37.5 + i * 9e-4, 127.0] for i in range(11)])
+    check = check_rally_points(RALLY, run)
+    assert (check.passed, check.missed) == (3, [])
+
+
+def test_order_and_offset_are_checked():
+    # 역주행은 도착점 이후에 출발점을 찾으므로 통과하지 못합니다.
+    reverse = np.array([[37.509 - i * 9e-4, 127.0] for i in range(11)])
+    assert check_rally_points(RALLY, reverse).missed == [1, 2]
+    # 경로와 나란히 약 44m 떨어져 달리면 모두 놓칩니다.
+    offset = np.array([[37.5 + i * 9e-4, 127.0005] for i in range(11)])
+    assert check_rally_points(RALLY, offset).passed == 0
+    assert check_rally_points(RALLY, offset[:1]).passed == 0
@@ -0,0 +1,114 @@
+# backend/tests/test_route_levels.py
+"""
+경로 단계(route_thumb/route_map)와 시작점/영역은 ORM validator가 아니라 crud에서 만듭니다. (긴 경로는 route_executor)
+"""
+import numpy as np
+import pytest
+
+from app import models
+from app.core import polyline, route_levels
+from app.core.executor import route_executor
+from app.models.route import ROUTE_MAP_POINTS, ROUTE_THUMB_POINTS
+from tests.factories import auth_headers, new_course, new_user
+
+
+def zigzag(n: int) -> bytes:
+    i = np.arange(n)
+    return polyline.encode(np.stack([37.5 + i * 1e-4, 127.0 + (i % 7) * 3e-4], axis=1))
+
+
+def test_validator_does_not_build_levels(monkeypatch):
+    monkeypatch.setattr(polyline, "decode", pytest.fail)
+    run = models.Run(route_polyline=zigzag(5_000))
+    assert run.path is not None
+    assert run.route_thumb is None and run.route_map is None and run.start_point is None and run.bbox is None
+    assert models.Run(route_polyline=zigzag(1)).path is None
+
+
+def test_build_route_levels():
+    thumb, map_level, start, bbox = route_levels.build_route_levels(zigzag(5_000))
+    assert len(polyline.decode(thumb)) <= ROUTE_THUMB_POINTS
+    assert len(polyline.decode(map_level)) <= ROUTE_MAP_POINTS
+    assert start == pytest.approx((37.5, 127.0))
+    assert bbox == pytest.approx((37.5, 127.0, 37.5 + 4_999e-4, 127.0 + 6 * 3e-4))
+    assert route_levels.build_route_levels(b"") is None
+
+
+@pytest.fixture
+def course(run_db):
+    async def seed(db):
+        owner = new_user()
+        db_course = new_course(owner)
+        db.add_all([owner, db_course])
+        await db.commit()
+        return owner, db_course
+
+    return run_db(seed)
+
+
+@pytest.mark.parametrize("points", [100, 5_000])  # 바로 계산 / executor
+def test_route_patch_rebuilds_levels(client, course, points):
+    owner, db_course = course
+    encoded = zigzag(points)
+    assert (len(encoded) > route_levels.INLINE_MAX_BYTES) == (points > 1_000)
+
+    response = client.patch(
+        f"/api/v1/courses/{db_course.id}", json={"route_polyline": encoded.decode()}, headers=auth_headers(owner)
+    )
+    assert response.status_code == 200, response.text
+
+    response = client.get(f"/api/v1/courses/{db_course.id}", params={"detail": "map"}, headers=auth_headers(owner))
+    assert response.status_code == 200, response.text
+    route = response.json()["route"]
+    assert 2 <= len(route) <= min(points, ROUTE_MAP_POINTS)
+    assert route[0] == pytest.approx({"lat": 37.5, "lng": 127.0})
+
+
+def test_saturated_pool_returns_429(client, course, monkeypatch):
+    # 풀 예외는 main의 핸들러가 풀마다 정한 detail과 Retry-After로 바꿉니다.
+    owner, db_course = course
+    monkeypatch.setattr(route_executor, "max_pending", 0)
+    response = client.patch(
+        f"/api/v1/courses/{db_course.id}", json={"route_polyline": zigzag(5_000).decode()}, headers=auth_headers(owner)
+    )
+    assert response.status_code == 429
+    assert response.json() == {"detail": route_executor.saturated_detail}
+    assert response.headers["Retry-After"] == str(route_executor.retry_after_seconds)
+
+
+@pytest.mark.parametrize("source", ["samples", "chunks"])
+@pytest.mark.parametrize("count", [100, 2_000])  # 바로 계산 / executor
+def test_finish_builds_metrics_and_levels_together(client, run_db, count, source):
+    async def seed(db):
+        owner = new_user()
+        db.add(owner)
+        await db.flush()
+        run = models.Run(user_id=owner.id, distance=0.0, duration=0.0, status="running")
+        db.add(run)
+        await db.commit()
+        return owner, run
+
+    owner, run = run_db(seed)
+    assert (count > route_levels.INLINE_MAX_SAMPLES) == (count > 1_000)
+    samples = [{"t": float(i), "lat": 37.5 + i * 3e-5, "lng": 127.0} for i in range(count)]
+    body = {"status": "finished"}
+    if source == "samples":
+        body["samples"] = samples
+    else:
+        for seq, start in enumerate(range(0, count, 500)):
+            response = client.post(
+                f"/api/v1/runs/{run.id}/points", json={"seq": seq, "points": samples[start:start + 500]},
+                headers=auth_headers(owner),
+            )
+            assert response.status_code == 200, response.text
+
+    response = client.patch(f"/api/v1/runs/{run.id}", json=body, headers=auth_headers(owner))
+    assert response.status_code == 200, response.text
+    assert response.json()["distance"] == pytest.approx((count - 1) * 3.336, rel=1e-2)
+
+    async def read(db):
+        return await db.get(models.Run, run.id)
+
+    stored = run_db(read)
+    assert len(polyline.decode(stored.route_thumb)) <= ROUTE_THUMB_POINTS
+    assert polyline.decode(stored.route_map)[0].tolist() == pytest.approx([37.5, 127.0])
@@ -0,0 +1,71 @@
+# backend/tests/test_stats.py
+"""
+15분 구간 집계를 사용자 시간대의 기간별로 묶는 통계 (crud.stats, 묶기는 DB에서)
+"""
+from datetime import date, datetime
+
+import pytest
+
+from app import models
+from app.crud import stats
+from app.core.tz import get_zone
+from tests.factories import auth_headers, new_user
+
+# UTC 기준 구간 시작: 서울(+9)에서는 3/31 23:45, 4/1 00:30 / 로스앤젤레스(-7)에서는 둘 다 3/31
+BUCKETS = [
+    (datetime(2023, 12, 31, 16, 0), 1, 3000.0),   # 서울 2024-01-01, LA 2023-12-31
+    (datetime(2024, 3, 31, 14, 45), 1, 5000.0),
+    (datetime(2024, 3, 31, 15, 30), 2, 10000.0),
+]
+
+
+@pytest.fixture
+def runner(run_db):
+    async def seed(db):
+        user = new_user()
+        db.add(user)
+        await db.flush()
+        db.add_all([
+            models.UserStatsBucket(
+                user_id=user.id, bucket_start=start, run_count=count,
+                total_distance=distance, total_duration=distance / 3, total_elevation_gain=0, total_calories=0,
+            )
+            for start, count, distance in BUCKETS
+        ])
+        await db.commit()
+        return user
+
+    return run_db(seed)
+
+
+@pytest.mark.parametrize("zone, expected", [
+    ("Asia/Seoul", {date(2024, 1, 1): 3000.0, date(2024, 3, 1): 5000.0, date(2024, 4, 1): 10000.0}),
+    ("America/Los_Angeles", {date(2023, 12, 1): 3000.0, date(2024, 3, 1): 15000.0}),
+])
+def test_groups_by_local_month_in_sql(run_db, runner, zone, expected):
+    async def read(db):
+        return await stats._get_local_period_totals(
+            db, user_id=runner.id, zone=get_zone(zone), start=None, end=None, unit="month"
+        )
+
+    periods = run_db(read)
+    assert {start: totals.distance for start, totals in periods.items()} == expected
+
+
+def test_series_and_all_time(client, runner):
+    headers = auth_headers(runner)
+    response = client.get(
+        "/api/v1/users/me/stats/series",
+        params={"from": "2024-03-25", "to": "2024-04-07", "granularity": "week", "tz": "Asia/Seoul"},
+        headers=headers,
+    )
+    assert response.status_code == 200, response.text
+    body = response.json()
+    assert [(bar["label"], bar["value"]) for bar in body["chart_data"]] == [("2024-03-25", 5.0), ("2024-04-01", 10.0)]
+    assert body["total_runs"] == 3
+
+    response = client.get("/api/v1/users/me/stats", params={"period": "all", "tz": "America/Los_Angeles"}, headers=headers)
+    assert response.status_code == 200, response.text
+    body = response.json()
+    assert [(bar["label"], bar["value"]) for bar in body["chart_data"]] == [("2023", 3.0), ("2024", 15.0)]
+    assert body["total_runs"] == 4